@@ -0,0 +1,2 @@
+-- Lookup of already-ingested items by external id (e.g. HackerNews item ids)
+CREATE INDEX IF NOT EXISTS idx_doc_source_uid ON doc (source, source_uid);
@@ -0,0 +1,24 @@
+-- Title search (/api/search, hybrid lexical retriever): trigram GIN index + keyset pagination.
+-- ILIKE '%q%' can use the trigram index for queries of 3+ characters. pg_trgm only indexes
+-- CJK characters when the database LC_CTYPE is not C (e.g. ja_JP.UTF-8 / C.UTF-8).
+DO $$
+BEGIN
+  PERFORM 1 FROM pg_extension WHERE extname='pg_trgm';
+  IF NOT FOUND THEN
+    BEGIN
+      EXECUTE 'CREATE EXTENSION pg_trgm';
+    EXCEPTION WHEN OTHERS THEN
+      RAISE NOTICE 'pg_trgm not available; title search keeps scanning (%)', SQLERRM;
+    END;
+  END IF;
+  IF EXISTS (SELECT 1 FROM pg_extension WHERE extname='pg_trgm') THEN
+    EXECUTE 'CREATE INDEX IF NOT EXISTS idx_doc_title_trgm ON doc USING gin (title_raw gin_trgm_ops)';
+  END IF;
+  -- Japanese option: PGroonga (bigram tokenizer) also answers 1-2 character queries such as 日銀
+  IF EXISTS (SELECT 1 FROM pg_extension WHERE extname='pgroonga') THEN
+    EXECUTE 'CREATE INDEX IF NOT EXISTS idx_doc_title_pgroonga ON doc USING pgroonga (title_raw)';
+  END IF;
+END$$;
+
+-- Keyset pagination order for title search and recency listings: (published_at, doc_id) DESC
+CREATE INDEX IF NOT EXISTS idx_doc_published_doc_id ON doc (published_at DESC, doc_id DESC);
@@ -0,0 +1,10 @@
+-- Embedding cache: one vector per (embedding space, sha256 of normalized chunk text).
+-- Byte-identical chunks (syndication, title-only chunks) are encoded once per space.
+CREATE TABLE IF NOT EXISTS embed_cache (
+  embedding_space TEXT NOT NULL,
+  text_sha256     BYTEA NOT NULL,
+  dim             INT NOT NULL,
+  emb             vector NOT NULL,
+  created_at      TIMESTAMPTZ DEFAULT now(),
+  PRIMARY KEY (embedding_space, text_sha256)
+);
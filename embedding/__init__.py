@@ -0,0 +1 @@
+"""Embedding package."""
@@ -0,0 +1,157 @@
+"""
+Pluggable embedding backends.
+
+Every backend has the SentenceTransformer call shape used across the repo,
+
+    backend.encode(texts, normalize_embeddings=True) -> np.ndarray (n, dim) float32
+
+so mcp_news/server.py, scripts/embed_chunks.py and the embedding pool can
+switch implementation without touching call sites. Selected with
+EMBEDDING_BACKEND:
+
+    sentence-transformers  (default) PyTorch reference model
+    onnx                   ONNX Runtime, fp32
+    onnx-int8              ONNX Runtime, dynamically quantized int8 weights
+
+The ONNX backends need onnxruntime and transformers (tokenizer). The model
+is exported once with optimum (``optimum-cli export onnx``) into
+EMBEDDING_ONNX_DIR (default tmp/onnx/<model>); a directory that already
+holds model.onnx is used as is, so hosts without torch can run from a copy.
+Pooling follows the model card: mean pooling for e5, CLS for bge.
+"""
+from __future__ import annotations
+
+import os
+import re
+from typing import List, Optional
+
+import numpy as np
+
+from .models import MODEL_NAME
+
+BACKENDS = ("sentence-transformers", "onnx", "onnx-int8")
+
+
+def backend_name() -> str:
+    return (os.environ.get("EMBEDDING_BACKEND") or "sentence-transformers").strip().lower()
+
+
+def _l2_normalize(x: np.ndarray) -> np.ndarray:
+    n = np.linalg.norm(x, axis=1, keepdims=True)
+    return x / np.maximum(n, 1e-12)
+
+
+def pool_hidden(hidden: np.ndarray, mask: np.ndarray, pooling: str = "mean") -> np.ndarray:
+    """(batch, seq, dim) token states -> (batch, dim) sentence vectors."""
+    if pooling == "cls":
+        return hidden[:, 0]
+    m = mask[..., None].astype(hidden.dtype)
+    return (hidden * m).sum(axis=1) / np.maximum(m.sum(axis=1), 1e-9)
+
+
+def default_pooling(model_name: str) -> str:
+    return "cls" if "bge" in model_name.lower() else "mean"
+
+
+class SentenceTransformerBackend:
+    """Reference backend: sentence_transformers.SentenceTransformer."""
+
+    name = "sentence-transformers"
+
+    def __init__(self, model_name: str = MODEL_NAME):
+        from sentence_transformers import SentenceTransformer
+
+        self.model_name = model_name
+        self.model = SentenceTransformer(model_name)
+        self.dim = int(self.model.get_sentence_embedding_dimension())
+
+    def encode(self, texts: List[str], normalize_embeddings: bool = True, **kw) -> np.ndarray:
+        out = self.model.encode(list(texts), normalize_embeddings=normalize_embeddings, **kw)
+        return np.asarray(out, dtype=np.float32)
+
+
+class OnnxBackend:
+    """ONNX Runtime backend (optionally with dynamic int8 quantization)."""
+
+    def __init__(
+        self,
+        model_name: str = MODEL_NAME,
+        *,
+        quantize: bool = False,
+        model_dir: Optional[str] = None,
+        pooling: Optional[str] = None,
+        max_length: int = 512,
+        threads: Optional[int] = None,
+    ):
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+
+        self.name = "onnx-int8" if quantize else "onnx"
+        self.model_name = model_name
+        self.pooling = pooling or default_pooling(model_name)
+        self.max_length = int(max_length)
+        self.model_dir = model_dir or onnx_dir(model_name)
+        path = ensure_onnx(model_name, self.model_dir, quantize=quantize)
+        # optimum saves the tokenizer next to the exported model
+        has_tok = os.path.exists(os.path.join(self.model_dir, "tokenizer.json"))
+        self.tokenizer = AutoTokenizer.from_pretrained(self.model_dir if has_tok else model_name)
+        opts = ort.SessionOptions()
+        opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads:
+            opts.intra_op_num_threads = int(threads)
+        self.session = ort.InferenceSession(path, opts, providers=["CPUExecutionProvider"])
+        self.input_names = {i.name for i in self.session.get_inputs()}
+        self.dim = int(self.encode(["dimension probe"]).shape[1])
+
+    def encode(self, texts: List[str], normalize_embeddings: bool = True, batch_size: int = 32, **kw) -> np.ndarray:
+        outs = []
+        texts = list(texts)
+        for i in range(0, len(texts), batch_size):
+            enc = self.tokenizer(
+                texts[i : i + batch_size], padding=True, truncation=True, max_length=self.max_length, return_tensors="np"
+            )
+            feed = {k: v.astype(np.int64) for k, v in enc.items() if k in self.input_names}
+            if "token_type_ids" in self.input_names and "token_type_ids" not in feed:
+                feed["token_type_ids"] = np.zeros_like(feed["input_ids"])
+            hidden = self.session.run(None, feed)[0]
+            outs.append(pool_hidden(hidden, enc["attention_mask"], self.pooling))
+        out = np.concatenate(outs).astype(np.float32) if outs else np.zeros((0, 0), dtype=np.float32)
+        return _l2_normalize(out) if normalize_embeddings and len(out) else out
+
+
+def onnx_dir(model_name: str) -> str:
+    base = os.environ.get("EMBEDDING_ONNX_DIR") or os.path.join("tmp", "onnx")
+    return os.path.join(base, re.sub(r"[^A-Za-z0-9_.-]+", "__", model_name))
+
+
+def ensure_onnx(model_name: str, model_dir: str, *, quantize: bool = False) -> str:
+    """Path of model.onnx (or model.int8.onnx) in ``model_dir``, exporting/quantizing on first use."""
+    fp32 = os.path.join(model_dir, "model.onnx")
+    if not os.path.exists(fp32):
+        try:
+            from optimum.exporters.onnx import main_export
+        except ImportError as ex:
+            raise RuntimeError(
+                f"{fp32} not found and optimum is not installed; export with "
+                f"`optimum-cli export onnx --model {model_name} --task feature-extraction {model_dir}`"
+            ) from ex
+        main_export(model_name, output=model_dir, task="feature-extraction")
+    if not quantize:
+        return fp32
+    int8 = os.path.join(model_dir, "model.int8.onnx")
+    if not os.path.exists(int8):
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        quantize_dynamic(fp32, int8, weight_type=QuantType.QInt8)
+    return int8
+
+
+def load_backend(name: Optional[str] = None, model_name: Optional[str] = None, **kw):
+    """Build the backend selected by ``name`` (default: EMBEDDING_BACKEND)."""
+    name = (name or backend_name()).strip().lower()
+    model_name = model_name or MODEL_NAME
+    if name in ("sentence-transformers", "st", "torch"):
+        return SentenceTransformerBackend(model_name)
+    if name in ("onnx", "onnx-int8"):
+        return OnnxBackend(model_name, quantize=name == "onnx-int8", **kw)
+    raise ValueError(f"unknown EMBEDDING_BACKEND {name!r} (expected one of {', '.join(BACKENDS)})")
@@ -0,0 +1,70 @@
+"""
+Length-bucketed dynamic batching for the embedding worker.
+
+Transformer encoders pad every text in a batch to the longest one, so a
+single body chunk in a batch of headlines multiplies the work of the whole
+batch. plan_batches() sorts a window of pending chunks by (estimated) token
+length and cuts it into batches whose padded size
+
+    len(batch) * longest text in batch
+
+stays under a token budget: headlines go out in large batches, long chunks
+in small ones. Each batch keeps its own (chunk_id, text) rows, so ids and
+vectors are paired again when the batch is written.
+"""
+from __future__ import annotations
+
+import math
+import re
+from typing import Callable, List, Sequence, Tuple, TypeVar
+
+Row = TypeVar("Row", bound=Tuple)
+
+# Same token notion as ingest.bodies.chunk_text: words, or single CJK/other chars
+_TOKEN_RE = re.compile("[A-Za-z0-9\u00c0-\u024f\u0400-\u04ff]+(?:['\u2019][A-Za-z]+)?|\\S")
+
+# Subword tokenizers split words further; ~1.3 pieces per word is typical for e5/bge
+WORD_PIECES = 1.3
+
+
+def approx_tokens(text: str, max_tokens: int = 512) -> int:
+    """Cheap estimate of the model's token count (incl. special tokens), capped at ``max_tokens``."""
+    chars = words = 0
+    for m in _TOKEN_RE.finditer(text):
+        if m.end() - m.start() == 1:
+            chars += 1
+        else:
+            words += 1
+    return min(max_tokens, chars + math.ceil(words * WORD_PIECES) + 2)
+
+
+def padded_tokens(lengths: Sequence[int]) -> int:
+    return len(lengths) * max(lengths) if lengths else 0
+
+
+def plan_batches(
+    rows: Sequence[Row],
+    *,
+    token_budget: int = 8192,
+    max_batch: int = 256,
+    max_tokens: int = 512,
+    length: Callable[[str], int] = approx_tokens,
+) -> List[List[Row]]:
+    """Split (chunk_id, text, ...) rows into length-sorted batches under ``token_budget``.
+
+    A text longer than the whole budget still goes out, alone in its batch.
+    """
+    if not rows:
+        return []
+    lens = [min(max_tokens, max(1, length(r[1]))) for r in rows]
+    order = sorted(range(len(rows)), key=lambda i: lens[i])
+    batches: List[List[Row]] = []
+    cur: List[Row] = []
+    for i in order:
+        # Ascending order: the newcomer is the longest text of the batch
+        if cur and (len(cur) >= max_batch or (len(cur) + 1) * lens[i] > token_budget):
+            batches.append(cur)
+            cur = []
+        cur.append(rows[i])
+    batches.append(cur)
+    return batches
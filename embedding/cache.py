@@ -0,0 +1,71 @@
+"""
+Content-hash embedding cache.
+
+Syndicated articles and title-only chunks produce many byte-identical chunk
+texts across sources. embed_cache (db/migrations/2026-10-18_embed_cache.sql)
+keeps one vector per (embedding_space, sha256 of the normalized text):
+
+- before encoding, the worker looks a window of pending chunks up and copies
+  cached vectors straight into chunk_vec (copy_cached);
+- identical texts inside the window are encoded once (dedupe_rows);
+- every vector the worker encodes is added to the cache together with its
+  chunk_vec row (vec_writer.write_vectors(..., keys=...)).
+
+Hits and misses go to embed_cache_requests_total / embed_cache_hit_ratio.
+"""
+from __future__ import annotations
+
+import hashlib
+import re
+import unicodedata
+from typing import Dict, List, Sequence, Set, Tuple
+
+_WS = re.compile(r"\s+")
+
+_COPY_CACHED = """
+WITH hit AS (
+  SELECT u.chunk_id, c.dim, c.emb
+  FROM unnest(%s::bigint[], %s::bytea[]) AS u(chunk_id, text_sha256)
+  JOIN embed_cache c ON c.embedding_space = %s AND c.text_sha256 = u.text_sha256
+), ins AS (
+  INSERT INTO chunk_vec (chunk_id, embedding_space, dim, emb)
+  SELECT h.chunk_id, %s, h.dim, h.emb
+  FROM hit h JOIN chunk ch ON ch.chunk_id = h.chunk_id
+  ON CONFLICT (chunk_id, embedding_space) DO NOTHING
+)
+SELECT chunk_id FROM hit
+"""
+
+
+def normalize_text(text: str) -> str:
+    """NFKC + collapsed whitespace; case is kept (the models are case-sensitive)."""
+    return _WS.sub(" ", unicodedata.normalize("NFKC", text or "")).strip()
+
+
+def text_key(text: str) -> bytes:
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).digest()
+
+
+def copy_cached(conn, space: str, ids: Sequence[int], keys: Sequence[bytes]) -> Set[int]:
+    """Copy cached vectors for ``ids`` into chunk_vec and commit; returns the chunk_ids that hit."""
+    if not ids:
+        return set()
+    with conn.cursor() as cur:
+        cur.execute(_COPY_CACHED, (list(ids), list(keys), space, space))
+        hits = {r[0] for r in cur.fetchall()}
+    conn.commit()
+    return hits
+
+
+def dedupe_rows(rows: Sequence[Tuple], keys: Sequence[bytes]) -> List[Tuple[int, str, bytes, List[int]]]:
+    """Collapse rows with the same text key into (chunk_id, text, key, duplicate chunk_ids)."""
+    first: Dict[bytes, int] = {}
+    out: List[Tuple[int, str, bytes, List[int]]] = []
+    for r, k in zip(rows, keys):
+        ix = first.get(k)
+        if ix is None:
+            first[k] = len(out)
+            out.append((r[0], r[1], k, []))
+        else:
+            out[ix][3].append(r[0])
+    return out
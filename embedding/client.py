@@ -0,0 +1,75 @@
+"""
+Client for the local embedding service (embedding/service.py).
+
+EMBEDDING_SERVICE_URL selects the endpoint:
+
+    unix:/run/mcp-news/embed.sock    Unix socket (preferred on a single host)
+    http://127.0.0.1:3012            loopback TCP
+
+EmbeddingClient has the backend call shape
+``encode(texts, normalize_embeddings=True) -> np.ndarray``, so it drops into
+QueryEmbeddingCache.encode and anywhere a local backend was used.
+"""
+from __future__ import annotations
+
+import os
+from typing import List, Optional
+
+import numpy as np
+
+from .service import unpack_vectors
+
+
+def service_url() -> Optional[str]:
+    return (os.environ.get("EMBEDDING_SERVICE_URL") or "").strip() or None
+
+
+class EmbeddingClient:
+    """Blocking HTTP client; ``client`` may be any httpx.Client-compatible object (tests)."""
+
+    name = "service"
+
+    def __init__(self, url: str, *, timeout: float = 10.0, client=None):
+        self.url = url
+        if client is None:
+            import httpx
+
+            if url.startswith("unix:"):
+                path = url[len("unix:"):]
+                if path.startswith("//"):
+                    path = path[2:]
+                client = httpx.Client(
+                    transport=httpx.HTTPTransport(uds=path), base_url="http://embed-service", timeout=timeout
+                )
+            else:
+                client = httpx.Client(base_url=url.rstrip("/"), timeout=timeout)
+        self._client = client
+        self._model_key: Optional[str] = None
+
+    @property
+    def model_key(self) -> str:
+        """``<model>|<backend>`` the service encodes with (asked once via /healthz)."""
+        if self._model_key is None:
+            h = self.health()
+            self._model_key = f"{h.get('model') or 'service'}|{h.get('backend') or ''}"
+        return self._model_key
+
+    def encode(self, texts: List[str], normalize_embeddings: bool = True, **kw) -> np.ndarray:
+        # The service always returns unit vectors; every caller asks for them.
+        r = self._client.post("/embed", json={"texts": list(texts)})
+        r.raise_for_status()
+        return unpack_vectors(r.json())
+
+    def health(self) -> dict:
+        r = self._client.get("/healthz")
+        r.raise_for_status()
+        return r.json()
+
+    def close(self) -> None:
+        self._client.close()
+
+
+def service_client(url: Optional[str] = None, **kw) -> Optional[EmbeddingClient]:
+    """EmbeddingClient for ``url`` (default: EMBEDDING_SERVICE_URL), or None when unset."""
+    url = url or service_url()
+    return EmbeddingClient(url, **kw) if url else None
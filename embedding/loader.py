@@ -0,0 +1,72 @@
+"""
+Background loading for the query-embedding model.
+
+Importing torch and loading a transformer takes seconds to tens of seconds,
+which used to happen at import time of mcp_news/server.py and blocked the
+stdio server (and everything importing it) until the model was up.
+BackgroundLoader runs the factory once on a daemon thread; callers ask for
+the model with a bounded wait and get None until it is ready, so they can
+serve a fallback instead of blocking.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Callable, Optional
+
+
+class BackgroundLoader:
+    """Build ``factory()`` once on a background thread (started on first ``start``/``get``)."""
+
+    def __init__(self, factory: Callable[[], Any], *, name: str = "model", on_done: Optional[Callable[["BackgroundLoader"], None]] = None):
+        self.factory = factory
+        self.name = name
+        self.on_done = on_done
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+        self.load_s: Optional[float] = None
+        self._done = threading.Event()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    @property
+    def ready(self) -> bool:
+        """Loaded successfully and produced a model (a factory may legitimately return None)."""
+        return self._done.is_set() and self.value is not None
+
+    def start(self) -> "BackgroundLoader":
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._load, name=f"load-{self.name}", daemon=True)
+                self._thread.start()
+        return self
+
+    def get(self, timeout: float = 0.0) -> Any:
+        """The model, waiting at most ``timeout`` seconds; None while loading or if loading failed."""
+        self.start()
+        if timeout and timeout > 0:
+            self._done.wait(timeout)
+        return self.value if self._done.is_set() else None
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        self.start()
+        return self._done.wait(timeout)
+
+    def _load(self) -> None:
+        t0 = time.perf_counter()
+        try:
+            self.value = self.factory()
+        except BaseException as ex:  # keep serving the fallback; the error is kept for diagnostics
+            self.error = ex
+        finally:
+            self.load_s = time.perf_counter() - t0
+            self._done.set()
+            if self.on_done is not None:
+                try:
+                    self.on_done(self)
+                except Exception:
+                    pass
@@ -0,0 +1,70 @@
+"""
+Encoder factories.
+
+An encoder is any callable ``encode(texts) -> np.ndarray (n, dim)``. The
+factories here are plain top-level functions/classes so they can be pickled
+into worker processes (see pool.EmbedPool), where each worker builds its own
+encoder once.
+"""
+from __future__ import annotations
+
+import functools
+import os
+import zlib
+from typing import Callable, List, Optional
+
+import numpy as np
+
+Encoder = Callable[[List[str]], np.ndarray]
+
+MODEL_NAME = os.environ.get("EMBEDDING_MODEL", "intfloat/multilingual-e5-base")
+
+
+def backend_encoder(backend: Optional[str] = None, name: str = MODEL_NAME, normalize: bool = True) -> Encoder:
+    """Encoder from the backend selected by ``backend`` / EMBEDDING_BACKEND (see backends.py)."""
+    from .backends import load_backend
+
+    model = load_backend(backend, name)
+    return functools.partial(model.encode, normalize_embeddings=normalize)
+
+
+def sentence_transformer_encoder(name: str = MODEL_NAME, normalize: bool = True) -> Encoder:
+    """SentenceTransformer ``name`` wrapped as an Encoder (float32 output)."""
+    from sentence_transformers import SentenceTransformer
+
+    model = SentenceTransformer(name)
+
+    def encode(texts: List[str]) -> np.ndarray:
+        return np.asarray(model.encode(texts, normalize_embeddings=normalize), dtype=np.float32)
+
+    return encode
+
+
+class HashingEncoder:
+    """Deterministic model-free encoder (hashed token features).
+
+    Cost grows with text length like a real model's, which makes it useful
+    for tests and for benchmarking the plumbing on hosts without a model.
+    """
+
+    def __init__(self, dim: int = 768, rounds: int = 1):
+        self.dim = int(dim)
+        self.rounds = max(1, int(rounds))
+
+    def __call__(self, texts: List[str]) -> np.ndarray:
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for i, t in enumerate(texts):
+            for tok in t.split() or [""]:
+                h = zlib.crc32(tok.encode("utf-8"))
+                v = np.random.default_rng(h).standard_normal(self.dim).astype(np.float32)
+                for _ in range(self.rounds - 1):
+                    v = np.tanh(v)
+                out[i] += v
+            n = np.linalg.norm(out[i])
+            if n > 0:
+                out[i] /= n
+        return out
+
+
+def hashing_encoder(dim: int = 768, rounds: int = 1) -> Encoder:
+    return HashingEncoder(dim, rounds)
@@ -0,0 +1,198 @@
+"""
+Multi-process CPU embedding pool.
+
+One SentenceTransformer process leaves most cores of a CPU-only host idle.
+EmbedPool starts N worker processes that each build the encoder once (via a
+picklable factory, see models.py) with their BLAS/torch thread count pinned
+(and, where possible, their CPU affinity), then fans each batch out to them:
+
+    texts --sort by length, split into N contiguous buckets--> workers
+    workers --vectors into their shared-memory slot--> parent reassembles
+        rows in the original order
+
+Only the (small) text lists go through the worker pipes; vectors come back
+through a per-worker multiprocessing.shared_memory block, so the parent never
+unpickles large arrays. EmbedPool.encode has the Encoder signature, so it
+drops into the pipelined worker unchanged and the single writer thread there
+still collects all results.
+"""
+from __future__ import annotations
+
+import os
+from multiprocessing import get_context
+from multiprocessing import shared_memory
+from typing import Any, Callable, List, Optional, Sequence
+
+import numpy as np
+
+_THREAD_VARS = ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS", "TOKENIZERS_PARALLELISM")
+
+
+def _pin(threads: int, cpus: Optional[Sequence[int]]) -> None:
+    for var in _THREAD_VARS:
+        os.environ[var] = "false" if var == "TOKENIZERS_PARALLELISM" else str(threads)
+    if cpus and hasattr(os, "sched_setaffinity"):
+        try:
+            os.sched_setaffinity(0, set(cpus))
+        except OSError:
+            pass
+    try:
+        import torch  # type: ignore
+
+        torch.set_num_threads(threads)
+    except Exception:
+        pass
+
+
+def _worker_main(conn, factory: Callable[[], Any], threads: int, cpus: Optional[Sequence[int]]) -> None:
+    _pin(threads, cpus)
+    try:
+        encode = factory()
+        dim = int(np.asarray(encode(["dimension probe"])).shape[1])
+    except BaseException as ex:
+        conn.send(("error", f"{type(ex).__name__}: {ex}"))
+        return
+    conn.send(("ready", dim))
+    shm = None
+    try:
+        while True:
+            msg = conn.recv()
+            if msg is None:
+                break
+            texts, shm_name = msg
+            try:
+                if shm is None or shm.name != shm_name:
+                    if shm is not None:
+                        shm.close()
+                    shm = shared_memory.SharedMemory(name=shm_name)
+                vecs = np.asarray(encode(texts), dtype=np.float32)
+                out = np.ndarray((len(texts), dim), dtype=np.float32, buffer=shm.buf)
+                out[:] = vecs
+                del out
+                conn.send(("done", len(texts)))
+            except Exception as ex:
+                conn.send(("error", f"{type(ex).__name__}: {ex}"))
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        if shm is not None:
+            shm.close()
+
+
+class _Worker:
+    def __init__(self, ctx, factory, threads: int, cpus: Optional[Sequence[int]]):
+        self.conn, child = ctx.Pipe()
+        self.proc = ctx.Process(target=_worker_main, args=(child, factory, threads, cpus), daemon=True)
+        self.proc.start()
+        child.close()
+        self.shm: Optional[shared_memory.SharedMemory] = None
+        self.rows = 0
+
+    def recv(self):
+        try:
+            kind, value = self.conn.recv()
+        except EOFError:
+            raise RuntimeError(f"embedding worker {self.proc.pid} died (exit code {self.proc.exitcode})")
+        if kind == "error":
+            raise RuntimeError(f"embedding worker {self.proc.pid}: {value}")
+        return value
+
+    def submit(self, texts: List[str], dim: int) -> None:
+        if self.shm is None or self.rows < len(texts):
+            self._release()
+            self.rows = max(len(texts), 2 * self.rows, 64)
+            self.shm = shared_memory.SharedMemory(create=True, size=self.rows * dim * 4)
+        self.conn.send((texts, self.shm.name))
+
+    def result(self, n: int, dim: int) -> np.ndarray:
+        done = self.recv()
+        if done != n or self.shm is None:
+            raise RuntimeError(f"embedding worker {self.proc.pid}: expected {n} vectors, got {done}")
+        return np.ndarray((n, dim), dtype=np.float32, buffer=self.shm.buf)
+
+    def _release(self) -> None:
+        if self.shm is not None:
+            self.shm.close()
+            self.shm.unlink()
+            self.shm = None
+
+    def close(self, timeout: float = 10.0) -> None:
+        try:
+            self.conn.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        self.proc.join(timeout)
+        if self.proc.is_alive():
+            self.proc.terminate()
+            self.proc.join(timeout)
+        self.conn.close()
+        self._release()
+
+
+class EmbedPool:
+    """N encoder processes behind one ``encode(texts)`` call.
+
+    ``factory()`` runs once in each worker and returns the Encoder;
+    ``threads`` is the per-worker thread count (default: cores // workers).
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], Any],
+        workers: int,
+        *,
+        threads: Optional[int] = None,
+        pin_cpus: bool = True,
+        start_method: str = "spawn",
+    ):
+        cores = os.cpu_count() or 1
+        self.n = max(1, int(workers))
+        self.threads = max(1, int(threads or cores // self.n))
+        ctx = get_context(start_method)
+        self.workers: List[_Worker] = []
+        try:
+            for i in range(self.n):
+                cpus = None
+                if pin_cpus and (i + 1) * self.threads <= cores:
+                    cpus = list(range(i * self.threads, (i + 1) * self.threads))
+                self.workers.append(_Worker(ctx, factory, self.threads, cpus))
+            dims = {w.recv() for w in self.workers}
+        except BaseException:
+            self.close()
+            raise
+        if len(dims) != 1:
+            self.close()
+            raise RuntimeError(f"embedding workers disagree on dimension: {sorted(dims)}")
+        self.dim = dims.pop()
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        out = np.empty((len(texts), self.dim), dtype=np.float32)
+        if not texts:
+            return out
+        # Similar lengths in each worker's bucket keep padding low
+        order = np.argsort(np.fromiter((len(t) for t in texts), dtype=np.int64, count=len(texts)), kind="stable")
+        parts = [p for p in np.array_split(order, min(self.n, len(texts))) if len(p)]
+        for w, idx in zip(self.workers, parts):
+            w.submit([texts[i] for i in idx], self.dim)
+        errors = []
+        for w, idx in zip(self.workers, parts):
+            try:
+                out[idx] = w.result(len(idx), self.dim)
+            except RuntimeError as ex:
+                errors.append(ex)
+        if errors:
+            raise errors[0]
+        return out
+
+    __call__ = encode
+
+    def close(self) -> None:
+        for w in self.workers:
+            w.close()
+        self.workers = []
+
+    def __enter__(self) -> "EmbedPool":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,95 @@
+"""
+Bounded LRU (optionally with a TTL) for query embeddings.
+
+Agent clients repeat and paginate the same searches, and each call used to
+run the model again. QueryEmbeddingCache keys vectors by (model, normalized
+query text) so a repeated query skips inference entirely. The model part is
+model_key(): model name plus backend, since the same text gives the same
+vector whatever embedding space the caller searches. The normalized text is
+also what gets encoded, so equal keys always mean equal model input.
+
+Misses record the encode time in embed_latency_seconds; hits and misses
+are counted in query_embed_cache_total.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Optional, Tuple
+
+import numpy as np
+
+from mcp_news.metrics import observe_embed_latency, record_query_embed_cache
+
+from .cache import normalize_text
+
+
+def model_key(model: Any) -> str:
+    """Identity of the vectors ``model`` produces: ``<model name>|<backend>``.
+
+    Objects may provide their own ``model_key`` (the embedding service client does).
+    """
+    key = getattr(model, "model_key", None)
+    if key:
+        return str(key)
+    return f"{getattr(model, 'model_name', None) or type(model).__name__}|{getattr(model, 'name', '')}"
+
+
+class QueryEmbeddingCache:
+    """Thread-safe LRU of query vectors; ``ttl`` seconds (None/0: no expiry)."""
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None, clock: Callable[[], float] = time.monotonic):
+        self.maxsize = max(0, int(maxsize))
+        self.ttl = float(ttl) if ttl else None
+        self.clock = clock
+        self._items: "OrderedDict[Tuple[str, str], Tuple[float, np.ndarray]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, key: Tuple[str, str]) -> Optional[np.ndarray]:
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            stored, vec = item
+            if self.ttl is not None and self.clock() - stored > self.ttl:
+                del self._items[key]
+                return None
+            self._items.move_to_end(key)
+            return vec
+
+    def put(self, key: Tuple[str, str], vec: np.ndarray) -> None:
+        if self.maxsize == 0:
+            return
+        with self._lock:
+            self._items[key] = (self.clock(), vec)
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+    def encode(self, model: Any, query: str) -> np.ndarray:
+        """Vector of ``query`` under ``model``; runs ``model.encode`` only on a miss."""
+        text = normalize_text(query)
+        key = (model_key(model), text)
+        vec = self.get(key)
+        if vec is not None:
+            self.hits += 1
+            record_query_embed_cache(True)
+            return vec
+        self.misses += 1
+        record_query_embed_cache(False)
+        t0 = time.perf_counter()
+        vec = np.asarray(model.encode([text], normalize_embeddings=True)[0], dtype=np.float32)
+        observe_embed_latency(time.perf_counter() - t0)
+        vec.setflags(write=False)
+        self.put(key, vec)
+        return vec
@@ -0,0 +1,123 @@
+"""
+Pending-chunk scanner with a persistent per-space cursor.
+
+Finding work used to be an anti-join over all of chunk and chunk_vec per
+batch, which slows down as chunk_vec grows. The scanner instead keeps a
+high-water chunk_id per embedding_space (embed_cursor.json under
+INGEST_STATE_DIR) and pages forward from it:
+
+    chunk_id > after ORDER BY chunk_id LIMIT n     (PK range scan, plus one
+                                                    chunk_vec PK probe per row)
+
+so each batch costs the same whatever the corpus size. The mark advances
+only once a batch's vectors are committed.
+
+Chunk ids are not committed in order (concurrent ingest transactions) and a
+failed run can leave holes, so each run restarts ``lookback`` ids below the
+mark, and every ``sweep_interval`` seconds a run starts from 0 instead (the
+reconciliation sweep) to pick up anything older still without a vector.
+"""
+from __future__ import annotations
+
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ingest.state import load_json, save_json, state_path
+
+PENDING_SQL = """
+SELECT c.chunk_id, c.text_raw
+FROM chunk c
+WHERE c.chunk_id > %s
+  AND NOT EXISTS (
+    SELECT 1 FROM chunk_vec v WHERE v.chunk_id = c.chunk_id AND v.embedding_space = %s
+  )
+ORDER BY c.chunk_id ASC
+LIMIT %s
+"""
+
+
+def fetch_pending(conn, space: str, limit: int, after: int = 0) -> List[Tuple[int, str]]:
+    """Chunks without a vector in ``space`` with chunk_id > ``after``, oldest first."""
+    rows = conn.execute(PENDING_SQL, (after, space, limit)).fetchall()
+    conn.commit()
+    return rows
+
+
+class EmbedCursor:
+    """High-water chunk_id and last sweep time per embedding_space, persisted as JSON."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or state_path("embed_cursor.json")
+        data = load_json(self.path, {})
+        self._spaces: Dict[str, Dict[str, Any]] = data if isinstance(data, dict) else {}
+        self._dirty = False
+
+    def get(self, space: str) -> int:
+        return int(self._spaces.get(space, {}).get("after", 0))
+
+    def advance(self, space: str, chunk_id: int) -> None:
+        if chunk_id > self.get(space):
+            self._spaces.setdefault(space, {})["after"] = int(chunk_id)
+            self._dirty = True
+
+    def swept_at(self, space: str) -> float:
+        return float(self._spaces.get(space, {}).get("swept_at", 0.0))
+
+    def mark_swept(self, space: str, when: float) -> None:
+        self._spaces.setdefault(space, {})["swept_at"] = float(when)
+        self._dirty = True
+
+    def save(self) -> None:
+        if self._dirty:
+            save_json(self.path, self._spaces)
+            self._dirty = False
+
+
+class PendingScanner:
+    """Keyset pager over chunks still missing a vector in ``space``.
+
+    Without a cursor it scans from chunk_id 0 and remembers nothing.
+    ``sweep=True``/``False`` forces or suppresses the reconciliation sweep.
+    """
+
+    def __init__(
+        self,
+        space: str,
+        *,
+        cursor: Optional[EmbedCursor] = None,
+        lookback: int = 10_000,
+        sweep_interval: float = 24 * 3600.0,
+        sweep: Optional[bool] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.space = space
+        self.cursor = cursor
+        self.clock = clock
+        self.started = clock()
+        if cursor is None:
+            self.sweeping = True
+        elif sweep is None:
+            self.sweeping = self.started - cursor.swept_at(space) >= sweep_interval
+        else:
+            self.sweeping = bool(sweep)
+        self.after = 0 if self.sweeping else max(0, cursor.get(space) - max(0, int(lookback)))
+
+    def fetch(self, conn, limit: int) -> List[Tuple[int, str]]:
+        """Next batch of pending chunks; advances the in-memory position."""
+        rows = fetch_pending(conn, self.space, limit, self.after)
+        if rows:
+            self.after = rows[-1][0]
+        return rows
+
+    def written(self, upto: int) -> None:
+        """Everything pending up to chunk_id ``upto`` has been committed."""
+        if self.cursor is not None:
+            self.cursor.advance(self.space, upto)
+            self.cursor.save()
+
+    def finish(self) -> None:
+        """Call after a run that drained the backlog without errors."""
+        if self.cursor is not None:
+            if self.sweeping:
+                self.cursor.mark_swept(self.space, self.started)
+            self.cursor.save()
@@ -0,0 +1,181 @@
+"""
+Local query-embedding service with micro-batching.
+
+One process per host loads the model (see backends.py) and serves
+
+    POST /embed    {"texts": [...]} -> {"n": n, "dim": d, "data": base64 float32 (n, d)}
+    GET  /healthz  model / backend / batching counters
+    GET  /metrics  Prometheus text
+
+on a Unix socket or a loopback port (scripts/embed_service.py). Requests
+that arrive within ``max_wait_ms`` of each other are coalesced by
+MicroBatcher into one ``encode`` call of up to ``max_batch`` texts, so
+concurrent searches from the web app and the MCP server share inference
+passes. Vectors are always L2-normalized (every search path uses cosine).
+
+Clients use embedding.client.EmbeddingClient, which has the backend call
+shape ``encode(texts, normalize_embeddings=True)``.
+"""
+from __future__ import annotations
+
+import asyncio
+import base64
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, Optional, Tuple
+
+import numpy as np
+
+from mcp_news.metrics import CONTENT_TYPE_LATEST, get_metrics_content, observe_embed_service_batch
+
+Encoder = Callable[[List[str]], np.ndarray]
+
+
+class MicroBatcher:
+    """Coalesce concurrent ``submit`` calls into batched ``encode`` calls.
+
+    The first pending request opens a window of ``max_wait_ms``; everything
+    queued before it closes (or until ``max_batch`` texts) runs as one pass
+    on a single inference thread, so the model never runs concurrently.
+    """
+
+    def __init__(self, encode: Encoder, *, max_batch: int = 32, max_wait_ms: float = 5.0):
+        self.encode = encode
+        self.max_batch = max(1, int(max_batch))
+        self.max_wait = max(0.0, float(max_wait_ms)) / 1000.0
+        self.batches = 0
+        self.texts = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    async def start(self) -> None:
+        if self._task is not None:
+            return
+        self._queue = asyncio.Queue()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="embed")
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._executor.shutdown(wait=True)
+        self._executor = None
+
+    async def submit(self, texts: List[str]) -> np.ndarray:
+        """Vectors (len(texts), dim) for ``texts``, encoded together with concurrent callers."""
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+        if self._task is None:
+            await self.start()
+        fut = asyncio.get_running_loop().create_future()
+        await self._queue.put((list(texts), fut))
+        return await fut
+
+    async def _collect(self) -> List[Tuple[List[str], asyncio.Future]]:
+        loop = asyncio.get_running_loop()
+        items = [await self._queue.get()]
+        n = len(items[0][0])
+        deadline = loop.time() + self.max_wait
+        while n < self.max_batch:
+            if self._queue.empty():
+                left = deadline - loop.time()
+                if left <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), left)
+                except asyncio.TimeoutError:
+                    break
+            else:
+                item = self._queue.get_nowait()
+            items.append(item)
+            n += len(item[0])
+        return items
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            items = await self._collect()
+            texts = [t for batch, _ in items for t in batch]
+            try:
+                vecs = await loop.run_in_executor(self._executor, self.encode, texts)
+                vecs = np.asarray(vecs, dtype=np.float32)
+            except Exception as ex:
+                for _, fut in items:
+                    if not fut.done():
+                        fut.set_exception(ex)
+                continue
+            self.batches += 1
+            self.texts += len(texts)
+            observe_embed_service_batch(len(texts))
+            i = 0
+            for batch, fut in items:
+                if not fut.done():  # caller may have gone away
+                    fut.set_result(vecs[i : i + len(batch)])
+                i += len(batch)
+
+
+def pack_vectors(vecs: np.ndarray) -> dict:
+    vecs = np.ascontiguousarray(vecs, dtype="<f4")
+    n, dim = vecs.shape if vecs.ndim == 2 else (0, 0)
+    return {"n": int(n), "dim": int(dim), "data": base64.b64encode(vecs.tobytes()).decode("ascii")}
+
+
+def unpack_vectors(payload: dict) -> np.ndarray:
+    raw = base64.b64decode(payload.get("data") or b"")
+    return np.frombuffer(raw, dtype="<f4").astype(np.float32).reshape(int(payload["n"]), int(payload["dim"]))
+
+
+def create_app(model: Any, *, max_batch: int = 32, max_wait_ms: float = 5.0, max_texts: int = 256):
+    """FastAPI app serving ``model`` (anything with ``encode(texts, normalize_embeddings=...)``)."""
+    from contextlib import asynccontextmanager
+
+    from fastapi import Body, FastAPI, HTTPException
+    from fastapi.responses import PlainTextResponse
+
+    def encode(texts: List[str]) -> np.ndarray:
+        return model.encode(texts, normalize_embeddings=True)
+
+    batcher = MicroBatcher(encode, max_batch=max_batch, max_wait_ms=max_wait_ms)
+
+    @asynccontextmanager
+    async def lifespan(app):
+        await batcher.start()
+        try:
+            yield
+        finally:
+            await batcher.stop()
+
+    app = FastAPI(title="MCP News – embedding service", lifespan=lifespan)
+    app.state.batcher = batcher
+
+    @app.post("/embed")
+    async def embed(payload: dict = Body(...)):
+        texts = payload.get("texts")
+        if not isinstance(texts, list) or not all(isinstance(t, str) for t in texts):
+            raise HTTPException(status_code=422, detail="texts must be a list of strings")
+        if len(texts) > max_texts:
+            raise HTTPException(status_code=413, detail=f"at most {max_texts} texts per request")
+        return pack_vectors(await batcher.submit(texts))
+
+    @app.get("/healthz")
+    def healthz():
+        return {
+            "ok": True,
+            "model": getattr(model, "model_name", None),
+            "backend": getattr(model, "name", type(model).__name__),
+            "dim": getattr(model, "dim", None),
+            "batches": batcher.batches,
+            "texts": batcher.texts,
+        }
+
+    @app.get("/metrics")
+    def metrics():
+        return PlainTextResponse(get_metrics_content(), media_type=CONTENT_TYPE_LATEST)
+
+    return app
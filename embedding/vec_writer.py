@@ -0,0 +1,116 @@
+"""
+Bulk chunk_vec writer.
+
+A batch of embeddings is streamed into a temp table with binary COPY, then
+a single INSERT ... SELECT moves it into chunk_vec with ON CONFLICT DO
+NOTHING (and skips chunks deleted in the meantime). That is a constant
+three round trips per batch instead of one per chunk.
+
+The COPY payload is built directly from the (n, dim) NumPy array: every
+row of a batch has the same binary layout
+
+    int16 nfields=2 | int32 8 | int64 chunk_id | int32 4+4*dim | int16 dim | int16 0 | float4[dim]
+
+(pgvector's binary vector format), so the whole batch is one structured
+array filled with vectorized assignments - no per-row Python objects. With
+``keys`` (sha256 text keys, see cache.py) a third fixed-size bytea field is
+appended and the batch is added to embed_cache as well.
+"""
+from __future__ import annotations
+
+import struct
+from typing import Optional, Sequence
+
+import numpy as np
+
+STAGE_TABLE = "_vec_stage"
+
+_CREATE_STAGE = f"""
+CREATE TEMP TABLE IF NOT EXISTS {STAGE_TABLE} (
+  chunk_id    BIGINT,
+  emb         vector,
+  text_sha256 BYTEA
+) ON COMMIT DELETE ROWS
+"""
+
+_MOVE = f"""
+INSERT INTO chunk_vec (chunk_id, embedding_space, dim, emb)
+SELECT DISTINCT ON (s.chunk_id) s.chunk_id, %s, %s, s.emb
+FROM {STAGE_TABLE} s
+JOIN chunk c ON c.chunk_id = s.chunk_id
+ORDER BY s.chunk_id
+ON CONFLICT (chunk_id, embedding_space) DO NOTHING
+"""
+
+_CACHE = f"""
+INSERT INTO embed_cache (embedding_space, text_sha256, dim, emb)
+SELECT DISTINCT ON (s.text_sha256) %s, s.text_sha256, %s, s.emb
+FROM {STAGE_TABLE} s
+WHERE s.text_sha256 IS NOT NULL
+ORDER BY s.text_sha256
+ON CONFLICT (embedding_space, text_sha256) DO NOTHING
+"""
+
+_HEADER = b"PGCOPY\n\xff\r\n\x00" + struct.pack("!ii", 0, 0)
+_TRAILER = struct.pack("!h", -1)
+
+
+def _row_dtype(dim: int, keyed: bool = False) -> np.dtype:
+    fields = [
+        ("nfields", ">i2"),
+        ("id_len", ">i4"),
+        ("chunk_id", ">i8"),
+        ("vec_len", ">i4"),
+        ("dim", ">i2"),
+        ("unused", ">i2"),
+        ("emb", ">f4", (dim,)),
+    ]
+    if keyed:
+        fields += [("key_len", ">i4"), ("key", "u1", (32,))]
+    return np.dtype(fields)
+
+
+def copy_payload(ids: Sequence[int], embs, keys: Optional[Sequence[bytes]] = None) -> bytes:
+    """Binary COPY data for (chunk_id, emb[, text_sha256]) rows, built from an (n, dim) array."""
+    embs = np.asarray(embs)
+    if embs.ndim != 2 or embs.shape[0] != len(ids):
+        raise ValueError(f"expected {len(ids)} x dim embeddings, got shape {embs.shape}")
+    if keys is not None and len(keys) != len(ids):
+        raise ValueError(f"expected {len(ids)} keys, got {len(keys)}")
+    n, dim = embs.shape
+    rows = np.empty(n, dtype=_row_dtype(dim, keys is not None))
+    rows["nfields"] = 2 if keys is None else 3
+    rows["id_len"] = 8
+    rows["chunk_id"] = np.asarray(ids, dtype=np.int64)
+    rows["vec_len"] = 4 + 4 * dim
+    rows["dim"] = dim
+    rows["unused"] = 0
+    rows["emb"] = embs
+    if keys is not None:
+        rows["key_len"] = 32
+        rows["key"] = np.frombuffer(b"".join(keys), dtype=np.uint8).reshape(n, 32)
+    return b"".join((_HEADER, rows.tobytes(), _TRAILER))
+
+
+def write_vectors(conn, space: str, ids: Sequence[int], embs, keys: Optional[Sequence[bytes]] = None) -> int:
+    """Write one batch of vectors to chunk_vec (and embed_cache with ``keys``) and commit.
+
+    Returns the number of rows inserted (existing vectors are left as is).
+    """
+    if not len(ids):
+        return 0
+    dim = int(np.shape(embs)[1])
+    data = copy_payload(ids, embs, keys)
+    columns = "chunk_id, emb" if keys is None else "chunk_id, emb, text_sha256"
+    with conn.transaction():
+        with conn.cursor() as cur:
+            # Rows may survive from an earlier batch inside an outer transaction
+            cur.execute(f"{_CREATE_STAGE}; TRUNCATE {STAGE_TABLE}")
+            with cur.copy(f"COPY {STAGE_TABLE} ({columns}) FROM STDIN WITH (FORMAT BINARY)") as cp:
+                cp.write(data)
+            cur.execute(_MOVE, (space, dim))
+            n = cur.rowcount
+            if keys is not None:
+                cur.execute(_CACHE, (space, dim))
+    conn.commit()
+    return n
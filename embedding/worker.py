@@ -0,0 +1,198 @@
+"""
+Pipelined embedding worker for scripts/embed_chunks.py.
+
+Fetching pending chunks, encoding them and writing vectors used to run
+strictly in sequence, so the CPU idled during DB I/O and the DB idled
+during encoding. Here the three steps overlap, connected by bounded queues:
+
+    reader thread (own connection)  --q_in-->  encode (calling thread)
+        --q_out-->  writer thread (own connection, commits per batch)
+
+The reader pages through pending chunks by chunk_id (see scanner), so it
+never re-reads a batch that is still being encoded or written; vectors go out with binary
+COPY (see vec_writer). Progress is reported through embeddings_built_total
+(chunks) and embed_duration_seconds (encode time per batch); chunks/sec is
+rate(embeddings_built_total).
+"""
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from mcp_news.metrics import observe_embed_duration, record_embed_cache, record_embedding_built
+
+from .batching import plan_batches
+from .cache import copy_cached, dedupe_rows, text_key
+from .scanner import PendingScanner, fetch_pending  # noqa: F401 (re-export)
+from .vec_writer import write_vectors
+
+_DONE = object()
+
+
+def _put(q: "queue.Queue", item: Any, stop: threading.Event) -> bool:
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=0.2)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def run_pipelined(
+    connect: Callable[[], Any],
+    encode: Callable[[List[str]], Any],
+    space: str,
+    *,
+    batch: int = 64,
+    prefetch: int = 2,
+    max_chunks: Optional[int] = None,
+    write: Callable[[Any, str, Sequence[int], Any], int] = write_vectors,
+    scanner: Optional[PendingScanner] = None,
+    token_budget: Optional[int] = None,
+    window: int = 1024,
+    max_batch: int = 256,
+    cache: bool = False,
+    log: Callable[[str], None] = print,
+) -> Dict[str, Any]:
+    """Embed every pending chunk of ``space``; returns run stats.
+
+    ``connect()`` opens a new DB connection (one each for reader and
+    writer); ``encode(texts)`` returns one vector per text. ``scanner``
+    decides where the scan starts and records progress (default: from
+    chunk_id 0, nothing persisted).
+
+    With ``token_budget`` the reader fetches ``window`` chunks at a time and
+    splits them with batching.plan_batches (length-sorted, at most
+    ``token_budget`` padded tokens and ``max_batch`` texts per batch);
+    otherwise every encode call gets ``batch`` chunks in chunk_id order.
+
+    With ``cache`` each fetched window is first resolved against embed_cache
+    (see cache.py): hits are copied into chunk_vec by the reader, identical
+    texts are encoded once, and new vectors are added to the cache.
+    """
+    scanner = scanner or PendingScanner(space)
+    drained = threading.Event()
+    stop = threading.Event()
+    errors: List[BaseException] = []
+    q_in: "queue.Queue" = queue.Queue(maxsize=max(1, prefetch))
+    q_out: "queue.Queue" = queue.Queue(maxsize=max(1, prefetch))
+    stats: Dict[str, Any] = {"chunks": 0, "batches": 0, "cached": 0, "encode_s": 0.0}
+    t0 = time.perf_counter()
+
+    def reader() -> None:
+        try:
+            with connect() as conn:
+                seen = 0
+                while not stop.is_set():
+                    size = window if token_budget else batch
+                    n = size if max_chunks is None else min(size, max_chunks - seen)
+                    if n <= 0:
+                        break
+                    rows = scanner.fetch(conn, n)
+                    if not rows:
+                        drained.set()
+                        break
+                    seen += len(rows)
+                    upto = rows[-1][0]
+                    if cache:
+                        keys = [text_key(r[1]) for r in rows]
+                        hit = copy_cached(conn, space, [r[0] for r in rows], keys)
+                        todo = [(r, k) for r, k in zip(rows, keys) if r[0] not in hit]
+                        rows = dedupe_rows([r for r, _ in todo], [k for _, k in todo])
+                        record_embed_cache(space, len(todo) - len(rows) + len(hit), len(rows))
+                        stats["cached"] += len(hit)
+                    if token_budget:
+                        batches = plan_batches(rows, token_budget=token_budget, max_batch=max_batch)
+                    else:
+                        batches = [rows] if rows else []
+                    # An all-hit window still has to move the cursor
+                    batches = batches or [[]]
+                    # The cursor may only pass the window once its last batch is written
+                    for i, b in enumerate(batches):
+                        if not _put(q_in, (b, upto if i == len(batches) - 1 else None), stop):
+                            return
+        except BaseException as ex:  # pragma: no cover - surfaced below
+            errors.append(ex)
+            stop.set()
+        finally:
+            _put(q_in, _DONE, threading.Event())
+
+    def writer() -> None:
+        try:
+            with connect() as conn:
+                while True:
+                    item = q_out.get()
+                    if item is _DONE:
+                        break
+                    ids, embs, upto, keys = item
+                    if not ids:
+                        if upto is not None:
+                            scanner.written(upto)
+                        continue
+                    n = write(conn, space, ids, embs) if keys is None else write(conn, space, ids, embs, keys=keys)
+                    if upto is not None:
+                        scanner.written(upto)
+                    record_embedding_built(n)
+                    stats["chunks"] += n
+                    stats["batches"] += 1
+                    elapsed = time.perf_counter() - t0
+                    log(f"[+] inserted: {n} (space={space}, dim={len(embs[0])}) "
+                        f"total={stats['chunks']} {stats['chunks'] / max(elapsed, 1e-9):.1f} chunks/s")
+        except BaseException as ex:
+            errors.append(ex)
+            stop.set()
+            # Keep draining so the encoder never blocks on a dead writer
+            while q_out.get() is not _DONE:
+                pass
+
+    threads = [threading.Thread(target=reader, daemon=True), threading.Thread(target=writer, daemon=True)]
+    for t in threads:
+        t.start()
+    try:
+        while True:
+            item = q_in.get()
+            if item is _DONE:
+                break
+            rows, upto = item
+            if stop.is_set():
+                continue
+            if not rows:
+                q_out.put(([], None, upto, None))
+                continue
+            te = time.perf_counter()
+            embs = encode([r[1] for r in rows])
+            dt = time.perf_counter() - te
+            stats["encode_s"] += dt
+            observe_embed_duration(dt)
+            if len(rows[0]) > 2:
+                # Cache mode: (chunk_id, text, key, duplicate ids) -> one row per chunk
+                counts = [1 + len(r[3]) for r in rows]
+                ids = [cid for r in rows for cid in (r[0], *r[3])]
+                keys = [r[2] for r, c in zip(rows, counts) for _ in range(c)]
+                if len(ids) > len(rows):
+                    embs = np.repeat(np.asarray(embs), counts, axis=0)
+                q_out.put((ids, embs, upto, keys))
+            else:
+                q_out.put(([r[0] for r in rows], embs, upto, None))
+    except BaseException:
+        stop.set()
+        # The reader's final _DONE put is unconditional; drain so it can never block on a full queue
+        while q_in.get() is not _DONE:
+            pass
+        raise
+    finally:
+        q_out.put(_DONE)
+        for t in threads:
+            t.join()
+    if errors:
+        raise errors[0]
+    if drained.is_set():
+        scanner.finish()
+    stats["elapsed_s"] = time.perf_counter() - t0
+    stats["chunks_per_s"] = stats["chunks"] / stats["elapsed_s"] if stats["elapsed_s"] > 0 else 0.0
+    return stats
@@ -0,0 +1,382 @@
+"""
+Article body stage: fetch pages, extract the main text, write body chunks.
+
+Feeds only carry a snippet (chunk part_ix=0). This stage picks recent docs
+whose body has not been fetched yet, downloads the article pages
+concurrently (global limit, per-host concurrency and per-host request
+rate), extracts the main text and splits it into overlapping,
+token-bounded windows written as chunk part_ix=1..N with ``span`` set to
+the window's character offsets in the extracted text.
+
+Progress is recorded in ``hint`` (key='body_fetch'): 'ok', a terminal
+failure ('http_404', 'not_html', 'empty', ...) or 'retry' with the attempt
+count in ``conf``. Chunks and the hint are written in the same
+transaction, so re-runs only touch docs that have no body yet.
+"""
+from __future__ import annotations
+
+import asyncio
+import re
+import time
+from collections import defaultdict
+from concurrent.futures import Executor
+from html.parser import HTMLParser
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:
+    from typing_extensions import TypedDict  # type: ignore
+except Exception:  # pragma: no cover
+    from typing import TypedDict  # type: ignore
+
+from .fetch import HostLimiter, TokenBucket
+
+HINT_KEY = "body_fetch"
+
+# Elements whose text is never article body
+_SKIP_TAGS = {"script", "style", "noscript", "template", "svg", "nav", "header", "footer", "aside", "form", "button", "iframe"}
+_BLOCK_TAGS = {"p", "h1", "h2", "h3", "h4", "li", "blockquote", "pre", "td", "dd", "div", "section", "article", "main", "br"}
+_VOID_TAGS = {"br", "img", "hr", "meta", "link", "input", "source", "wbr", "area", "base", "col", "embed", "param", "track"}
+
+
+class BodyResult(TypedDict, total=False):
+    doc_id: int
+    lang: Optional[str]
+    status: str                                 # hint value: ok / retry / http_404 / ...
+    chunks: List[Tuple[int, int, str]]          # (start, end, text)
+
+
+class _MainText(HTMLParser):
+    """Collect text blocks, remembering whether they sit inside <article>/<main>."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.stack: List[str] = []
+        self.skip = 0
+        self.main = 0
+        self.blocks: List[Tuple[bool, str]] = []
+        self.buf: List[str] = []
+
+    def _flush(self) -> None:
+        text = re.sub(r"\s+", " ", "".join(self.buf)).strip()
+        self.buf = []
+        if text:
+            self.blocks.append((self.main > 0, text))
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _VOID_TAGS:
+            if tag == "br":
+                self.buf.append("\n")
+            return
+        if tag in _BLOCK_TAGS:
+            self._flush()
+        self.stack.append(tag)
+        if tag in _SKIP_TAGS:
+            self.skip += 1
+        if tag in ("article", "main"):
+            self.main += 1
+
+    def handle_endtag(self, tag):
+        if tag in _VOID_TAGS or tag not in self.stack:
+            return
+        # Close implicitly-closed children too (<p> without </p>, ...)
+        while self.stack:
+            t = self.stack.pop()
+            if t in _SKIP_TAGS:
+                self.skip -= 1
+            if t in ("article", "main"):
+                self.main -= 1
+            if t == tag:
+                break
+        if tag in _BLOCK_TAGS:
+            self._flush()
+
+    def handle_data(self, data):
+        if not self.skip:
+            self.buf.append(data)
+
+    def close(self):
+        super().close()
+        self._flush()
+
+
+def _min_block_len(text: str) -> int:
+    # CJK text carries much more per character than Latin text
+    cjk = sum(1 for ch in text[:200] if "\u3040" <= ch <= "\u9fff" or "\uac00" <= ch <= "\ud7af")
+    return 20 if cjk > len(text[:200]) // 3 else 60
+
+
+def extract_main_text(html: str) -> str:
+    """Main text of an article page (paragraphs joined by blank lines).
+
+    Uses trafilatura when installed; otherwise keeps the text blocks inside
+    <article>/<main> (or every sufficiently long block when the page has
+    neither), skipping navigation, scripts and forms.
+    """
+    try:
+        import trafilatura  # type: ignore
+
+        text = trafilatura.extract(html, include_comments=False, include_tables=False)
+        if text:
+            return text.strip()
+    except Exception:
+        pass
+    p = _MainText()
+    try:
+        p.feed(html)
+        p.close()
+    except Exception:
+        pass
+    blocks = [t for (in_main, t) in p.blocks if in_main] or [t for (_, t) in p.blocks]
+    blocks = [t for t in blocks if len(t) >= _min_block_len(t)]
+    return "\n\n".join(blocks)
+
+
+# One token per word / number, and per CJK character or symbol: a cheap,
+# tokenizer-free estimate. Subword tokenizers split words further, so this
+# is a lower bound on model tokens: keep max_tokens well below the model
+# limit (the default 256 leaves headroom under a 512-token encoder).
+_TOKEN_RE = re.compile("[A-Za-z0-9\u00c0-\u024f\u0400-\u04ff]+(?:['\u2019][A-Za-z]+)?|\\S")
+
+
+def chunk_text(text: str, max_tokens: int = 256, overlap: int = 32) -> List[Tuple[int, int, str]]:
+    """Split ``text`` into overlapping windows of at most ``max_tokens`` tokens.
+
+    Returns (start, end, window_text) with character offsets into ``text``.
+    """
+    max_tokens = max(1, int(max_tokens))
+    overlap = min(max(0, int(overlap)), max_tokens - 1)
+    spans = [m.span() for m in _TOKEN_RE.finditer(text)]
+    out: List[Tuple[int, int, str]] = []
+    i = 0
+    while i < len(spans):
+        j = min(len(spans), i + max_tokens)
+        s, e = spans[i][0], spans[j - 1][1]
+        out.append((s, e, text[s:e]))
+        if j == len(spans):
+            break
+        i = j - overlap
+    return out
+
+
+_META_CHARSET = re.compile(rb"""<meta[^>]+charset=["']?([A-Za-z0-9_\-]+)""", re.I)
+
+
+def decode_html(content: bytes, header_charset: Optional[str] = None) -> str:
+    enc = header_charset
+    if not enc:
+        m = _META_CHARSET.search(content[:4096])
+        enc = m.group(1).decode("ascii") if m else "utf-8"
+    try:
+        return content.decode(enc, errors="replace")
+    except LookupError:
+        return content.decode("utf-8", errors="replace")
+
+
+def process_page(content: bytes, charset: Optional[str], max_tokens: int, overlap: int) -> List[Tuple[int, int, str]]:
+    """CPU part of the stage (decode, extract, chunk); runs in an executor."""
+    return chunk_text(extract_main_text(decode_html(content, charset)), max_tokens, overlap)
+
+
+_PENDING_SQL = f"""
+SELECT d.doc_id, d.url_canon, d.lang, COALESCE(h.conf, 0)
+FROM doc d
+LEFT JOIN hint h ON h.doc_id = d.doc_id AND h.key = '{HINT_KEY}'
+WHERE d.published_at >= now() - make_interval(days => %s)
+  AND d.url_canon LIKE 'http%%'
+  AND (h.doc_id IS NULL OR (h.val = 'retry' AND h.conf < %s))
+  AND d.doc_id < %s
+  AND (%s::text[] IS NULL OR d.source = ANY(%s::text[]))
+ORDER BY d.doc_id DESC
+LIMIT %s
+"""
+
+
+def pending_docs(
+    conn,
+    *,
+    limit: int = 200,
+    days: int = 7,
+    max_attempts: int = 3,
+    before: Optional[int] = None,
+    sources: Optional[Sequence[str]] = None,
+) -> List[Tuple[int, str, Optional[str], float]]:
+    """Recent docs without a body yet, newest first: (doc_id, url, lang, attempts).
+
+    ``before`` continues a scan below the last doc_id of the previous batch.
+    """
+    before = before if before is not None else 2**63 - 1
+    src = list(sources) if sources else None
+    rows = conn.execute(_PENDING_SQL, (days, max_attempts, before, src, src, limit)).fetchall()
+    conn.commit()
+    return rows
+
+
+class HostRates:
+    """Per-host TokenBucket so each publisher sees at most ``rate`` requests/second."""
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self._buckets: Dict[str, TokenBucket] = defaultdict(lambda: TokenBucket(rate, burst=1))
+
+    async def acquire(self, host: str) -> None:
+        await self._buckets[host].acquire()
+
+
+def _is_html(resp) -> bool:
+    return "html" in resp.headers.get("content-type", "").lower()
+
+
+async def _get_capped(client, url: str, max_bytes: int) -> Tuple[Any, bytes]:
+    """GET ``url`` reading at most ``max_bytes`` of an HTML body; the rest is never downloaded.
+
+    Error and non-HTML responses come back with an empty body.
+    """
+    async with client.stream("GET", url) as resp:
+        if resp.status_code >= 400 or not _is_html(resp):
+            return resp, b""
+        buf = bytearray()
+        async for part in resp.aiter_bytes():
+            buf += part
+            if len(buf) >= max_bytes:
+                break
+        return resp, bytes(buf[:max_bytes])
+
+
+async def fetch_bodies(
+    docs: Sequence[Tuple[int, str, Optional[str], float]],
+    client,
+    *,
+    concurrency: int = 16,
+    per_host: int = 1,
+    host_rate: float = 1.0,
+    timeout: float = 20.0,
+    max_bytes: int = 3_000_000,
+    max_tokens: int = 256,
+    overlap: int = 32,
+    pool: Optional[Executor] = None,
+) -> List[BodyResult]:
+    """Fetch and chunk ``docs`` concurrently; never raises per document."""
+    import urllib.parse as urlparse
+
+    loop = asyncio.get_running_loop()
+    sem = asyncio.Semaphore(max(1, int(concurrency)))
+    hosts = HostLimiter(per_host)
+    rates = HostRates(host_rate)
+
+    async def one(doc_id: int, url: str, lang: Optional[str], attempts: float) -> BodyResult:
+        res = BodyResult(doc_id=doc_id, lang=lang, status="retry", chunks=[])
+        host = urlparse.urlsplit(url).netloc.lower()
+        try:
+            # Wait for the host's turn before taking a global slot
+            async with hosts.get(url):
+                await rates.acquire(host)
+                async with sem:
+                    resp, content = await asyncio.wait_for(_get_capped(client, url, max_bytes), timeout)
+        except Exception as ex:
+            print(f"[!] body fetch failed: {url} ({type(ex).__name__})")
+            return res
+        if resp.status_code >= 500 or resp.status_code == 429:
+            return res
+        if resp.status_code >= 400:
+            res["status"] = f"http_{resp.status_code}"
+            return res
+        if not _is_html(resp):
+            res["status"] = "not_html"
+            return res
+        charset = resp.charset_encoding
+        try:
+            chunks = await loop.run_in_executor(pool, process_page, content, charset, max_tokens, overlap)
+        except Exception as ex:
+            print(f"[!] body extract failed: {url} ({ex})")
+            res["status"] = "extract_error"
+            return res
+        res["chunks"] = chunks
+        res["status"] = "ok" if chunks else "empty"
+        return res
+
+    return list(await asyncio.gather(*(one(*d) for d in docs)))
+
+
+_CREATE_STAGE = """
+CREATE TEMP TABLE IF NOT EXISTS _body_stage (
+  doc_id   BIGINT,
+  part_ix  INT,
+  text_raw TEXT,
+  span     INT4RANGE,
+  lang     TEXT
+) ON COMMIT DELETE ROWS
+"""
+
+
+def write_bodies(conn, results: Sequence[BodyResult], attempts: Dict[int, float]) -> int:
+    """Write body chunks (part_ix 1..N) and body_fetch hints in one transaction."""
+    n = 0
+    with conn.transaction():
+        with conn.cursor() as cur:
+            cur.execute(f"{_CREATE_STAGE}; TRUNCATE _body_stage")
+            with cur.copy("COPY _body_stage (doc_id, part_ix, text_raw, span, lang) FROM STDIN") as cp:
+                for r in results:
+                    for ix, (s, e, text) in enumerate(r.get("chunks") or [], 1):
+                        cp.write_row((r["doc_id"], ix, text, f"[{s},{e})", r.get("lang")))
+                        n += 1
+            cur.execute(
+                """
+                INSERT INTO chunk (doc_id, part_ix, text_raw, span, lang)
+                SELECT doc_id, part_ix, text_raw, span, lang FROM _body_stage
+                ON CONFLICT (doc_id, part_ix) DO NOTHING
+                """
+            )
+            ids = [r["doc_id"] for r in results]
+            vals = [r["status"] for r in results]
+            confs = [float(attempts.get(r["doc_id"], 0)) + 1.0 if r["status"] == "retry" else 1.0 for r in results]
+            cur.execute(
+                f"""
+                INSERT INTO hint (doc_id, key, val, conf)
+                SELECT u.doc_id, '{HINT_KEY}', u.val, u.conf
+                FROM unnest(%s::bigint[], %s::text[], %s::real[]) AS u(doc_id, val, conf)
+                ON CONFLICT (doc_id, key) DO UPDATE SET val = EXCLUDED.val, conf = EXCLUDED.conf
+                """,
+                (ids, vals, confs),
+            )
+    return n
+
+
+async def run_bodies(
+    conn,
+    client,
+    *,
+    batch: int = 200,
+    max_docs: int = 1000,
+    days: int = 7,
+    max_attempts: int = 3,
+    sources: Optional[Sequence[str]] = None,
+    **fetch_kw: Any,
+) -> Dict[str, int]:
+    """Process pending docs batch by batch; returns counts per status plus chunks/elapsed_ms."""
+    stats: Dict[str, int] = defaultdict(int)
+    t0 = time.perf_counter()
+    done = 0
+    before = None
+    while done < max_docs:
+        docs = await asyncio.to_thread(
+            pending_docs,
+            conn,
+            limit=min(batch, max_docs - done),
+            days=days,
+            max_attempts=max_attempts,
+            before=before,
+            sources=sources,
+        )
+        if not docs:
+            break
+        before = docs[-1][0]
+        results = await fetch_bodies(docs, client, **fetch_kw)
+        stats["chunks"] += await asyncio.to_thread(write_bodies, conn, results, {d[0]: d[3] for d in docs})
+        for r in results:
+            stats[r["status"]] += 1
+        done += len(docs)
+        if len(docs) < batch:
+            break
+    stats["docs"] = done
+    stats["elapsed_ms"] = int((time.perf_counter() - t0) * 1000)
+    return dict(stats)
@@ -0,0 +1,146 @@
+"""
+Incremental RSS / RDF / Atom / sitemap parser.
+
+iter_entries() walks the document with ElementTree.iterparse and yields one
+plain entry dict (the ENTRY_KEYS the ingestors use) per item, freeing each
+item's elements as soon as it has been read. With ``since`` it stops once it
+runs into entries at or before that high-water mark (``patience`` in a row,
+to tolerate feeds that are not strictly newest-first), so a poll of a large
+feed touches only its new head.
+
+Anything it does not understand (malformed XML, undeclared HTML entities,
+encodings expat cannot decode, unknown roots) raises StreamParseError; the
+caller falls back to feedparser (see fetch.parse_feed).
+"""
+from __future__ import annotations
+
+import io
+import xml.etree.ElementTree as ET
+from datetime import datetime
+from typing import Any, Dict, Iterator, Optional
+
+from .normalize import parse_time
+
+# Entry fields the ingestors actually use; everything else is dropped early
+# so results stay cheap to pickle.
+ENTRY_KEYS = ("id", "title", "link", "summary", "description", "published", "updated", "author", "language")
+
+# root element -> item element
+_ITEM_TAGS = {"rss": "item", "RDF": "item", "feed": "entry", "urlset": "url"}
+
+# child element (local name) -> entry key, first value wins
+_FIELDS = {
+    "title": "title",
+    "guid": "id",
+    "id": "id",
+    "description": "description",
+    "summary": "summary",
+    "encoded": "summary",          # content:encoded
+    "content": "summary",          # atom:content
+    "pubDate": "published",
+    "published": "published",
+    "issued": "published",
+    "date": "published",           # dc:date
+    "publication_date": "published",  # news sitemap
+    "updated": "updated",
+    "modified": "updated",
+    "lastmod": "updated",          # sitemap
+    "creator": "author",           # dc:creator
+    "name": "author",              # atom:author/name
+    "language": "language",
+    "loc": "link",                 # sitemap
+}
+
+
+class StreamParseError(Exception):
+    pass
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1] if tag and tag[0] == "{" else tag
+
+
+def _text(elem: ET.Element) -> Optional[str]:
+    t = "".join(elem.itertext()).strip()
+    return t or None
+
+
+def _atom_link(elem: ET.Element) -> Optional[str]:
+    rel = elem.get("rel", "alternate")
+    if rel == "alternate":
+        return elem.get("href")
+    return None
+
+
+def iter_entries(
+    content: bytes,
+    *,
+    since: Optional[datetime] = None,
+    patience: int = 3,
+    feed: Optional[Dict[str, Any]] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Yield entry dicts from a feed body; fills ``feed`` with title/link/language."""
+    feed = feed if feed is not None else {}
+    stack = []
+    item_tag = None
+    entry: Optional[Dict[str, Any]] = None
+    older = 0
+    try:
+        for event, elem in ET.iterparse(io.BytesIO(content), events=("start", "end")):
+            name = _local(elem.tag)
+            if event == "start":
+                if not stack:
+                    item_tag = _ITEM_TAGS.get(name)
+                    if item_tag is None:
+                        raise StreamParseError(f"unsupported root <{name}>")
+                elif name == item_tag and entry is None:
+                    entry = {}
+                stack.append(elem)
+                continue
+
+            stack.pop()
+            if entry is not None:
+                if name == item_tag:
+                    out = {k: entry.get(k) for k in ENTRY_KEYS}
+                    if out["link"] is None and out["id"] and str(out["id"]).startswith("http"):
+                        out["link"] = out["id"]
+                    entry = None
+                    elem.clear()
+                    if stack:
+                        stack[-1].remove(elem)
+                    if since is not None:
+                        t = parse_time(out["published"] or out["updated"])
+                        if t is not None and t <= since:
+                            older += 1
+                            if older >= patience:
+                                return
+                            continue
+                        older = 0
+                    yield out
+                elif name == "link":
+                    link = _atom_link(elem) if elem.get("href") is not None else _text(elem)
+                    if link and not entry.get("link"):
+                        entry["link"] = link
+                elif name in _FIELDS and _FIELDS[name] not in entry:
+                    if name == "name" and (len(stack) < 1 or _local(stack[-1].tag) != "author"):
+                        continue
+                    value = _text(elem)
+                    if value is not None:
+                        entry[_FIELDS[name]] = value
+                elif name == "author" and "author" not in entry:
+                    # RSS <author>text</author>; atom authors are handled via <name>
+                    if len(elem) == 0 and _text(elem):
+                        entry["author"] = _text(elem)
+                continue
+
+            # channel / feed level metadata (direct children of channel or feed root)
+            parent = _local(stack[-1].tag) if stack else None
+            if parent in ("channel", "feed") and name in ("title", "link", "language") and name not in feed:
+                value = _atom_link(elem) if elem.get("href") is not None else _text(elem)
+                if value:
+                    feed[name] = value
+            if parent in ("channel", "feed", "RDF") and name not in ("title", "link", "language"):
+                # Drop other channel children (image, category, ...) as we go
+                elem.clear()
+    except ET.ParseError as ex:
+        raise StreamParseError(str(ex)) from ex
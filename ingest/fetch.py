@@ -0,0 +1,239 @@
+"""
+Concurrent feed fetcher for ingest scripts.
+
+Feeds are downloaded with asyncio under a global concurrency limit plus a
+per-host limit, each with its own timeout, and every body is handed to a
+parser pool as soon as it arrives. One slow publisher therefore only costs
+its own timeout instead of stalling the whole sweep. With a ValidatorCache
+the requests are conditional and unchanged feeds are never parsed.
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+import urllib.parse as urlparse
+from datetime import datetime
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional
+
+try:
+    from typing_extensions import TypedDict  # type: ignore
+except Exception:  # pragma: no cover
+    from typing import TypedDict  # type: ignore
+
+try:
+    import httpx  # type: ignore
+except Exception:  # pragma: no cover
+    httpx = None  # type: ignore
+
+from .feed_stream import ENTRY_KEYS, StreamParseError, iter_entries
+from .http_cache import ValidatorCache, cache_key
+from .normalize import parse_time
+
+
+DEFAULT_AGENT = "newspaper-bot/0.1 (+https://example.invalid/newspaper)"
+
+
+
+class FetchResult(TypedDict, total=False):
+    feed: Dict[str, Any]
+    url: str
+    status: Optional[int]
+    content: Optional[bytes]
+    headers: Dict[str, str]
+    key: str
+    unchanged: bool
+    parsed: Optional[Dict[str, Any]]
+    error: Optional[str]
+    elapsed: float
+
+
+def default_agent() -> str:
+    return os.environ.get("USER_AGENT", DEFAULT_AGENT)
+
+
+def parse_feed(content: bytes, since: Optional[datetime] = None) -> Dict[str, Any]:
+    """Parse a feed body into plain dicts (runs inside the parser pool).
+
+    Uses the streaming parser (stopping at ``since``), and feedparser for
+    documents it cannot handle.
+    """
+    feed: Dict[str, Any] = {}
+    try:
+        entries = list(iter_entries(content, since=since, feed=feed))
+        return {"feed": {k: feed.get(k) for k in ("title", "link", "language")}, "entries": entries}
+    except StreamParseError:
+        pass
+
+    import feedparser
+
+    fp = feedparser.parse(content)
+    feed = {
+        "title": fp.feed.get("title"),
+        "link": fp.feed.get("link"),
+        "language": fp.feed.get("language"),
+    }
+    entries = [{k: e.get(k) for k in ENTRY_KEYS} for e in fp.entries]
+    if since is not None:
+        entries = [e for e in entries if not _older(e, since)]
+    return {"feed": feed, "entries": entries}
+
+
+def _older(entry: Dict[str, Any], since: datetime) -> bool:
+    t = parse_time(entry.get("published") or entry.get("updated"))
+    return t is not None and t <= since
+
+
+def parse_feed_data(data: Any) -> Dict[str, Any]:
+    """Pipeline parse step: ``data`` is a feed body or (body, since)."""
+    if isinstance(data, tuple):
+        return parse_feed(data[0], data[1])
+    return parse_feed(data)
+
+
+def make_parse_pool(workers: int) -> Optional[Executor]:
+    """Return a process pool for parsing, or None to use the loop's default executor."""
+    if workers <= 1:
+        return None
+    return ProcessPoolExecutor(max_workers=workers)
+
+
+class HostLimiter:
+    """Lazily created semaphore per host (netloc)."""
+
+    def __init__(self, per_host: int):
+        self.per_host = max(1, int(per_host))
+        self._sems: Dict[str, asyncio.Semaphore] = {}
+
+    def get(self, url: str) -> asyncio.Semaphore:
+        host = urlparse.urlsplit(url).netloc.lower()
+        sem = self._sems.get(host)
+        if sem is None:
+            sem = asyncio.Semaphore(self.per_host)
+            self._sems[host] = sem
+        return sem
+
+
+class TokenBucket:
+    """Async token bucket: ``rate`` requests/second with bursts of ``burst``.
+
+    Replaces fixed sleeps between requests, so concurrent fetches share one
+    request budget. ``rate <= 0`` disables limiting.
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        self.rate = float(rate)
+        self.capacity = float(burst) if burst else max(1.0, self.rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, n: float = 1.0) -> None:
+        if self.rate <= 0:
+            return
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= n:
+                    self.tokens -= n
+                    return
+                await asyncio.sleep((n - self.tokens) / self.rate)
+
+
+def http2_available() -> bool:
+    try:
+        import h2  # type: ignore  # noqa: F401
+    except Exception:
+        return False
+    return True
+
+
+def make_async_client(*, timeout: float = 20.0, max_connections: Optional[int] = None) -> "httpx.AsyncClient":
+    """Shared AsyncClient for ingest: keep-alive, redirects, HTTP/2 when h2 is installed."""
+    if httpx is None:
+        raise RuntimeError("httpx is required for ingest")
+    limits = httpx.Limits(max_connections=max_connections) if max_connections else httpx.Limits()
+    return httpx.AsyncClient(
+        headers={"User-Agent": default_agent()},
+        limits=limits,
+        timeout=timeout,
+        follow_redirects=True,
+        http2=http2_available(),
+    )
+
+
+async def fetch_one(
+    client: "httpx.AsyncClient",
+    feed: Dict[str, Any],
+    *,
+    sem: asyncio.Semaphore,
+    hosts: HostLimiter,
+    timeout: float,
+    cache: Optional[ValidatorCache] = None,
+) -> FetchResult:
+    """Download a single feed. Never raises; failures are reported in ``error``."""
+    url = feed["url"]
+    key = cache_key(url)
+    out: FetchResult = {
+        "feed": feed, "url": url, "key": key, "status": None, "content": None,
+        "headers": {}, "unchanged": False, "parsed": None, "error": None,
+    }
+    req_headers = cache.request_headers(key) if cache is not None else {}
+    t0 = time.perf_counter()
+    try:
+        async with sem, hosts.get(url):
+            # The timeout starts once we hold both slots, so queueing behind
+            # other feeds never counts against this one.
+            resp = await asyncio.wait_for(client.get(url, headers=req_headers), timeout)
+        out["status"] = resp.status_code
+        out["headers"] = dict(resp.headers)
+        if cache is not None and cache.is_unchanged(key, resp.status_code, resp.content):
+            out["unchanged"] = True
+            cache.touch(key)
+        elif resp.status_code == 200:
+            out["content"] = resp.content
+        else:
+            out["error"] = f"HTTP {resp.status_code}"
+    except asyncio.TimeoutError:
+        out["error"] = f"timeout after {timeout:.1f}s"
+    except Exception as ex:
+        out["error"] = str(ex) or ex.__class__.__name__
+    out["elapsed"] = time.perf_counter() - t0
+    return out
+
+
+async def sweep(
+    feeds: Iterable[Dict[str, Any]],
+    *,
+    concurrency: int = 16,
+    per_host: int = 2,
+    timeout: float = 20.0,
+    parse_pool: Optional[Executor] = None,
+    client: Optional["httpx.AsyncClient"] = None,
+    cache: Optional[ValidatorCache] = None,
+) -> List[FetchResult]:
+    """Fetch all feeds concurrently and parse each body as soon as it arrives.
+
+    Results are returned in the same order as ``feeds``. Feeds reported as
+    ``unchanged`` by ``cache`` carry no content and are not parsed.
+    """
+    loop = asyncio.get_running_loop()
+    sem = asyncio.Semaphore(max(1, int(concurrency)))
+    hosts = HostLimiter(per_host)
+
+    async def _one(c, feed) -> FetchResult:
+        res = await fetch_one(c, feed, sem=sem, hosts=hosts, timeout=timeout, cache=cache)
+        if res.get("content") is not None:
+            try:
+                res["parsed"] = await loop.run_in_executor(parse_pool, parse_feed, res["content"])
+            except Exception as ex:
+                res["error"] = f"parse error: {ex}"
+        return res
+
+    if client is not None:
+        return list(await asyncio.gather(*(_one(client, f) for f in feeds)))
+    async with make_async_client(timeout=timeout, max_connections=max(1, int(concurrency))) as c:
+        return list(await asyncio.gather(*(_one(c, f) for f in feeds)))
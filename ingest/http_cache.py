@@ -0,0 +1,131 @@
+"""
+Conditional GET support for ingest sources.
+
+ValidatorCache keeps, per URL, the ETag / Last-Modified validators and the
+sha256 of the last body that was written to the DB. Requests carry
+If-None-Match / If-Modified-Since, so an unchanged feed costs a single 304.
+Servers that ignore validators are still caught by the content hash, and
+the item is skipped before parsing or touching Postgres.
+
+Validators are only remembered after the caller has written the body, so
+a failed run never causes data to be skipped on the next one.
+"""
+from __future__ import annotations
+
+import hashlib
+import time
+import urllib.parse as urlparse
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from .state import load_json, save_json, state_path
+
+# Query parameters that must never be persisted (or used as part of a key)
+SECRET_PARAMS = {"apikey", "api_key", "key", "token"}
+
+
+def content_hash(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+def cache_key(url: str, params: Optional[Mapping[str, Any]] = None) -> str:
+    """Stable key for url+params with secrets dropped and params sorted."""
+    u = urlparse.urlsplit(url)
+    q = urlparse.parse_qsl(u.query, keep_blank_values=True)
+    if params:
+        q.extend((str(k), str(v)) for k, v in params.items() if v is not None)
+    q = sorted((k, v) for (k, v) in q if k.lower() not in SECRET_PARAMS)
+    return urlparse.urlunsplit((u.scheme, u.netloc, u.path, urlparse.urlencode(q), ""))
+
+
+class ValidatorCache:
+    """Persistent per-URL validator cache backed by a JSON file."""
+
+    def __init__(self, path: Optional[str] = None, *, max_age_days: float = 7.0):
+        self.path = path or state_path("http_validators.json")
+        self.max_age_s = max_age_days * 86400.0
+        data = load_json(self.path, {})
+        self._entries: Dict[str, Dict[str, Any]] = data if isinstance(data, dict) else {}
+        self._dirty = False
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        return self._entries.get(key)
+
+    def request_headers(self, key: str) -> Dict[str, str]:
+        ent = self._entries.get(key) or {}
+        headers: Dict[str, str] = {}
+        if ent.get("etag"):
+            headers["If-None-Match"] = ent["etag"]
+        if ent.get("last_modified"):
+            headers["If-Modified-Since"] = ent["last_modified"]
+        return headers
+
+    def is_unchanged(self, key: str, status: int, content: Optional[bytes]) -> bool:
+        """True for a 304, or a 200 whose body hash matches the last written one."""
+        if status == 304:
+            return key in self._entries
+        if status != 200 or content is None:
+            return False
+        ent = self._entries.get(key)
+        return bool(ent) and ent.get("sha256") == content_hash(content)
+
+    def remember(self, key: str, headers: Mapping[str, str], content: Optional[bytes]) -> None:
+        """Record validators for a body that has been processed successfully."""
+        ent = dict(self._entries.get(key) or {})
+        etag = headers.get("etag") or headers.get("ETag")
+        last_mod = headers.get("last-modified") or headers.get("Last-Modified")
+        if etag:
+            ent["etag"] = etag
+        if last_mod:
+            ent["last_modified"] = last_mod
+        if content is not None:
+            ent["sha256"] = content_hash(content)
+        ent["seen"] = time.time()
+        self._entries[key] = ent
+        self._dirty = True
+
+    def touch(self, key: str) -> None:
+        """Mark an unchanged entry as still in use so it survives pruning."""
+        ent = self._entries.get(key)
+        if ent is not None:
+            ent["seen"] = time.time()
+            self._dirty = True
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+        cutoff = time.time() - self.max_age_s
+        self._entries = {k: v for k, v in self._entries.items() if float(v.get("seen", 0)) >= cutoff}
+        save_json(self.path, self._entries)
+        self._dirty = False
+
+
+def conditional_get(client, url: str, cache: Optional[ValidatorCache], params=None) -> Tuple[Any, str, bool]:
+    """GET with validators (sync httpx client).
+
+    Returns (response, cache_key, unchanged). The caller must call
+    ``cache.remember(key, resp.headers, resp.content)`` once the body has
+    been processed.
+    """
+    key = cache_key(url, params)
+    headers = cache.request_headers(key) if cache is not None else {}
+    resp = client.get(url, params=params, headers=headers)
+    if cache is not None and cache.is_unchanged(key, resp.status_code, resp.content):
+        cache.touch(key)
+        return resp, key, True
+    resp.raise_for_status()
+    return resp, key, False
+
+
+async def conditional_get_async(client, url: str, cache: Optional[ValidatorCache], params=None) -> Tuple[Any, str, bool]:
+    """Async variant of conditional_get for httpx.AsyncClient."""
+    key = cache_key(url, params)
+    headers = cache.request_headers(key) if cache is not None else {}
+    resp = await client.get(url, params=params, headers=headers)
+    if cache is not None and cache.is_unchanged(key, resp.status_code, resp.content):
+        cache.touch(key)
+        return resp, key, True
+    resp.raise_for_status()
+    return resp, key, False
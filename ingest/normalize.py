@@ -0,0 +1,110 @@
+"""
+Normalization helpers shared by all ingest sources.
+
+Every adapter maps its items through make_row(), so URL canonicalization,
+UTC conversion and the body hash are computed the same way everywhere.
+"""
+from __future__ import annotations
+
+import hashlib
+import urllib.parse as urlparse
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional
+
+from .bulk_writer import ArticleRow
+
+
+# Tracking parameters dropped from URLs (in addition to any utm_*)
+DROP_KEYS = {"gclid", "fbclid", "yclid", "mc_cid", "mc_eid"}
+
+
+def canonicalize_url(url: str) -> str:
+    """Normalize URL by dropping tracking params and fragment.
+
+    Removes common trackers like utm_*, gclid, fbclid, and clears the fragment.
+    """
+    try:
+        u = urlparse.urlsplit(url)
+        q = urlparse.parse_qsl(u.query, keep_blank_values=False)
+        q = [
+            (k, v)
+            for (k, v) in q
+            if (not k.lower().startswith("utm_")) and (k.lower() not in DROP_KEYS)
+        ]
+        new_q = urlparse.urlencode(q)
+        return urlparse.urlunsplit((u.scheme, u.netloc, u.path, new_q, ""))
+    except Exception:
+        return url
+
+
+def parse_time(value: Any) -> Optional[datetime]:
+    """Datetime, epoch seconds, RFC 822 or ISO 8601 string -> aware UTC, or None."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            return value.replace(tzinfo=timezone.utc)
+        return value.astimezone(timezone.utc)
+    if isinstance(value, (int, float)):
+        try:
+            return datetime.fromtimestamp(float(value), tz=timezone.utc)
+        except Exception:
+            return None
+    s = str(value).strip()
+    for parse in (parsedate_to_datetime, lambda x: datetime.fromisoformat(x.replace("Z", "+00:00"))):
+        try:
+            d = parse(s)
+        except Exception:
+            continue
+        if d.tzinfo is None:
+            d = d.replace(tzinfo=timezone.utc)
+        return d.astimezone(timezone.utc)
+    return None
+
+
+def to_utc(value: Any) -> datetime:
+    """Like parse_time(), but missing or unparsable values fall back to now (UTC)."""
+    return parse_time(value) or datetime.now(timezone.utc)
+
+
+def hash_body(text: str) -> bytes:
+    """sha256 of the text used for duplicate detection (doc.hash_body)."""
+    return hashlib.sha256((text or "").encode("utf-8", errors="ignore")).digest()
+
+
+def make_row(
+    *,
+    source: str,
+    url: Optional[str],
+    title: Optional[str],
+    summary: Optional[str] = None,
+    published: Any = None,
+    source_uid: Optional[str] = None,
+    author: Optional[str] = None,
+    lang: Optional[str] = None,
+    raw: Optional[Dict[str, Any]] = None,
+    genre_hint: Optional[str] = None,
+    hint_conf: float = 0.6,
+) -> Optional[ArticleRow]:
+    """Build an ArticleRow; returns None for items without a title or URL."""
+    title = (title or "").strip()
+    summary = (summary or "").strip()
+    if not title or not url:
+        return None
+    text = summary or title
+    return {
+        "source": source,
+        "source_uid": source_uid,
+        "url_canon": canonicalize_url(url),
+        "title_raw": title,
+        "author": author,
+        "lang": lang,
+        "published_at": to_utc(published),
+        "hash_body": hash_body(text),
+        "raw": raw,
+        # Minimal chunk: 1 per doc using summary/title
+        "text_raw": text,
+        "genre_hint": genre_hint,
+        "hint_conf": hint_conf,
+    }
@@ -0,0 +1,252 @@
+"""
+Streaming ingest pipeline: source adapter -> parse/normalize -> sink.
+
+The three stages run concurrently and are connected by bounded asyncio
+queues, so fetching, parsing and DB writes overlap while memory stays
+bounded:
+
+    fetch (Source.fetch)  --q_fetch-->  parse workers (Source.parse in an
+    executor, then Source.normalize)  --q_rows-->  sink (BulkWriter + commit)
+
+A new source only implements a small adapter (see ingest/sources.py);
+batching, concurrency, validator confirmation and metrics come from here.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from concurrent.futures import Executor
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional, Tuple
+
+try:
+    from typing_extensions import TypedDict  # type: ignore
+except Exception:  # pragma: no cover
+    from typing import TypedDict  # type: ignore
+
+from mcp_news.metrics import record_ingest_item, record_ingest_outcome, time_ingest_operation_async
+
+from .bulk_writer import ArticleRow, BulkWriter
+from .dedup import DedupFilter
+from .fetch import make_async_client
+
+
+class Payload(TypedDict, total=False):
+    key: str                                   # fetched unit (feed URL, item URL, page)
+    data: Any                                  # body handed to Source.parse
+    meta: Dict[str, Any]                       # adapter context (feed config, ...)
+    unchanged: bool                            # validator hit: nothing to parse
+    error: Optional[str]                       # fetch failed
+    on_written: Optional[Callable[[], None]]   # called once all rows are committed
+
+
+def _identity(data: Any) -> Any:
+    return data
+
+
+class Source:
+    """Base class for source adapters.
+
+    - ``fetch(client)``: async generator of Payloads (network I/O only)
+    - ``parse(data)``: CPU-bound decode; must be a module-level function
+      (wrapped in staticmethod) so it can run in a process pool
+    - ``normalize(parsed, payload)``: yield ArticleRows (see normalize.make_row)
+    - ``observe(payload, rows, new_rows)``: optional per-payload feedback
+      (all rows vs. rows not already known)
+    - ``close(stats)``: persist adapter state after the run
+    """
+
+    name = "source"
+    parse = staticmethod(_identity)
+
+    async def fetch(self, client) -> AsyncIterator[Payload]:  # pragma: no cover - interface
+        raise NotImplementedError
+        yield  # make this an async generator
+
+    def normalize(self, parsed: Any, payload: Payload) -> Iterable[Optional[ArticleRow]]:  # pragma: no cover
+        raise NotImplementedError
+
+    def observe(self, payload: Payload, rows: List[ArticleRow], new_rows: List[ArticleRow]) -> None:
+        pass
+
+    def close(self, stats: Dict[str, int]) -> None:
+        pass
+
+
+_DONE = object()
+
+
+def new_stats() -> Dict[str, int]:
+    return {"payloads": 0, "unchanged": 0, "errors": 0, "rows": 0, "known": 0, "written": 0, "failed": 0}
+
+
+async def _fetch_stage(source: Source, client, q_fetch: asyncio.Queue, workers: int, stats: Dict[str, int]) -> None:
+    try:
+        async for payload in source.fetch(client):
+            stats["payloads"] += 1
+            if payload.get("unchanged"):
+                stats["unchanged"] += 1
+                continue
+            if payload.get("error"):
+                stats["errors"] += 1
+                continue
+            await q_fetch.put(payload)
+    except Exception as ex:
+        print(f"[!] {source.name}: fetch stage error: {ex}")
+        stats["errors"] += 1
+    finally:
+        for _ in range(workers):
+            await q_fetch.put(_DONE)
+
+
+async def _parse_stage(
+    source: Source,
+    q_fetch: asyncio.Queue,
+    q_rows: asyncio.Queue,
+    pool: Optional[Executor],
+    dedup: Optional[DedupFilter],
+    stats: Dict[str, int],
+) -> None:
+    loop = asyncio.get_running_loop()
+    try:
+        while True:
+            payload = await q_fetch.get()
+            if payload is _DONE:
+                break
+            try:
+                parsed = await loop.run_in_executor(pool, source.parse, payload.get("data"))
+                rows = [r for r in source.normalize(parsed, payload) if r]
+            except Exception as ex:
+                print(f"[!] {source.name}: parse error ({payload.get('key')}): {ex}")
+                stats["errors"] += 1
+                continue
+            stats["rows"] += len(rows)
+            new_rows = rows
+            if dedup is not None:
+                # Known url/title/body: nothing to write
+                new_rows, known = dedup.filter(rows)
+                stats["known"] += known
+            source.observe(payload, rows, new_rows)
+            rows = new_rows
+            await q_rows.put((rows, payload))
+    finally:
+        await q_rows.put(_DONE)
+
+
+async def _sink_stage(
+    source: Source,
+    conn,
+    q_rows: asyncio.Queue,
+    producers: int,
+    batch_size: int,
+    flush_interval: float,
+    dedup: Optional[DedupFilter],
+    stats: Dict[str, int],
+) -> None:
+    writer = BulkWriter(conn, batch_size=batch_size)
+    buf_rows: List[ArticleRow] = []
+    buf_payloads: List[Tuple[Payload, set]] = []
+
+    def _write(rows: List[ArticleRow]) -> Tuple[Dict[str, int], set]:
+        failed_before = set(writer.failed)
+        out = writer.write(rows)
+        conn.commit()
+        return out, writer.failed - failed_before
+
+    async def _flush() -> None:
+        nonlocal buf_rows, buf_payloads
+        if not buf_payloads:
+            return
+        rows, payloads = buf_rows, buf_payloads
+        buf_rows, buf_payloads = [], []
+        out, failed = await asyncio.to_thread(_write, rows)
+        stats["written"] += len(out)
+        stats["failed"] += len(failed)
+        record_ingest_item(len(out))
+        record_ingest_outcome(source.name, "written", len(out))
+        record_ingest_outcome(source.name, "failed", len(failed))
+        if dedup is not None:
+            dedup.add_rows(r for r in rows if r["url_canon"] not in failed)
+        for payload, urls in payloads:
+            cb = payload.get("on_written")
+            if cb is not None and not (urls & failed):
+                cb()
+
+    remaining = producers
+    while remaining:
+        try:
+            item = await asyncio.wait_for(q_rows.get(), flush_interval)
+        except asyncio.TimeoutError:
+            # Producers are slow: write what we have so rows don't linger
+            await _flush()
+            continue
+        if item is _DONE:
+            remaining -= 1
+            continue
+        rows, payload = item
+        buf_rows.extend(rows)
+        buf_payloads.append((payload, {r["url_canon"] for r in rows}))
+        if len(buf_rows) >= batch_size:
+            await _flush()
+    await _flush()
+
+
+@time_ingest_operation_async
+async def run_pipeline(
+    source: Source,
+    conn,
+    *,
+    client=None,
+    parse_workers: int = 2,
+    parse_pool: Optional[Executor] = None,
+    batch_size: int = 500,
+    queue_size: int = 64,
+    flush_interval: float = 2.0,
+    timeout: float = 20.0,
+    dedup: Optional[DedupFilter] = None,
+) -> Dict[str, int]:
+    """Run ``source`` through the pipeline into ``conn``; returns run stats.
+
+    ``client`` (httpx.AsyncClient) and ``conn`` may be shared across runs;
+    a client is created for the run when omitted. ``conn`` is committed
+    after every batch. Rows already known to ``dedup`` are dropped before
+    the sink; written rows are added to it (the caller saves it).
+    """
+    stats = new_stats()
+    t0 = time.perf_counter()
+    own_client = client is None
+    if own_client:
+        client = make_async_client(timeout=timeout)
+    workers = max(1, int(parse_workers))
+    q_fetch: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+    q_rows: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+    tasks = [
+        asyncio.create_task(_fetch_stage(source, client, q_fetch, workers, stats)),
+        *(asyncio.create_task(_parse_stage(source, q_fetch, q_rows, parse_pool, dedup, stats)) for _ in range(workers)),
+        asyncio.create_task(_sink_stage(source, conn, q_rows, workers, batch_size, flush_interval, dedup, stats)),
+    ]
+    try:
+        await asyncio.gather(*tasks)
+    except BaseException:
+        # e.g. the DB went away: don't leave stages blocked on full queues
+        stats["errors"] += 1
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+    finally:
+        if own_client:
+            await client.aclose()
+        source.close(stats)
+    record_ingest_outcome(source.name, "unchanged", stats["unchanged"])
+    record_ingest_outcome(source.name, "known", stats["known"])
+    record_ingest_outcome(source.name, "error", stats["errors"])
+    stats["elapsed_ms"] = int((time.perf_counter() - t0) * 1000)
+    return stats
+
+
+def format_stats(name: str, stats: Dict[str, int]) -> str:
+    return (
+        f"[✓] {name} ingest done: {stats['written']} docs written, {stats.get('known', 0)} known, "
+        f"{stats['unchanged']} unchanged, {stats['failed']} failed, {stats['errors']} errors "
+        f"({stats.get('elapsed_ms', 0)} ms)"
+    )
@@ -0,0 +1,208 @@
+"""
+Adaptive per-feed polling for the resident ingest daemon.
+
+Each feed gets its own interval derived from its observed publish rate:
+
+    rate     = entries seen / (now - min(oldest entry, last poll))   (items/s)
+    interval = target_items / rate, backed off x1.5 per poll that found
+               nothing new, clamped to [min_interval, max_interval]
+
+so a breaking-news feed publishing every few minutes is polled every few
+minutes while a weekly blog drifts to max_interval. Feeds without dates fall
+back to the number of new items seen since the previous poll. The rate is
+smoothed across polls, and the learned schedule is persisted under
+INGEST_STATE_DIR so a restart keeps it.
+
+run_daemon() keeps one connection pool, HTTP client, validator cache and
+dedup filter for the life of the process and runs due feeds through the
+ingest pipeline.
+"""
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+try:
+    from typing_extensions import TypedDict  # type: ignore
+except Exception:  # pragma: no cover
+    from typing import TypedDict  # type: ignore
+
+from mcp_news.metrics import record_feed_schedule
+
+from .state import load_json, save_json, state_path
+
+
+class FeedState(TypedDict, total=False):
+    interval: float      # seconds between polls
+    next_due: float      # unix time
+    rate: float          # smoothed items/second (0: unknown)
+    misses: int          # consecutive polls without new items
+    last_poll: float     # unix time the last poll started
+    lag: float           # seconds late on the last poll
+
+
+class FeedScheduler:
+    """Per-feed next-due times with intervals adapted to each feed's publish rate."""
+
+    def __init__(
+        self,
+        feeds: Sequence[Dict[str, Any]],
+        *,
+        min_interval: float = 120.0,
+        max_interval: float = 6 * 3600.0,
+        default_interval: float = 900.0,
+        target_items: float = 1.0,
+        smoothing: float = 0.5,
+        jitter: float = 0.1,
+        path: Optional[str] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.feeds = {f["url"]: f for f in feeds if f.get("url")}
+        self.min_interval = float(min_interval)
+        self.max_interval = float(max_interval)
+        self.default_interval = min(max(float(default_interval), self.min_interval), self.max_interval)
+        self.target_items = float(target_items)
+        self.smoothing = float(smoothing)
+        self.jitter = float(jitter)
+        self.path = path or state_path("feed_schedule.json")
+        self.clock = clock
+        saved = load_json(self.path, {})
+        saved = saved if isinstance(saved, dict) else {}
+        now = self.clock()
+        self.state: Dict[str, FeedState] = {}
+        for url in self.feeds:
+            st = saved.get(url)
+            if isinstance(st, dict) and "next_due" in st:
+                self.state[url] = FeedState(**st)  # type: ignore[misc]
+            else:
+                # New feeds are due now, spread a little so they don't all start together
+                self.state[url] = FeedState(
+                    interval=self.default_interval, next_due=now + random.uniform(0, 5.0), rate=0.0, misses=0
+                )
+
+    def name(self, url: str) -> str:
+        return self.feeds[url].get("name") or url
+
+    def due(self, now: Optional[float] = None) -> List[Dict[str, Any]]:
+        now = self.clock() if now is None else now
+        return [self.feeds[u] for u, st in self.state.items() if st["next_due"] <= now]
+
+    def next_wakeup(self) -> float:
+        return min((st["next_due"] for st in self.state.values()), default=self.clock() + self.default_interval)
+
+    def publish_rate(self, published: Sequence[datetime], now: float, last_poll: Optional[float] = None) -> Optional[float]:
+        """Items/second over the window the feed currently shows, or None.
+
+        When the parser stopped at the high-water mark only new entries are
+        seen, so the window reaches back to the previous poll at least.
+        """
+        if not published:
+            return None
+        oldest = min(p.timestamp() for p in published)
+        if last_poll:
+            oldest = min(oldest, last_poll)
+        span = now - oldest
+        if span <= 0:
+            return None
+        return len(published) / span
+
+    def interval_for(self, st: FeedState) -> float:
+        rate = st.get("rate") or 0.0
+        base = self.target_items / rate if rate > 0 else self.default_interval
+        base *= 1.5 ** min(int(st.get("misses", 0)), 4)
+        return min(max(base, self.min_interval), self.max_interval)
+
+    def observe(
+        self,
+        url: str,
+        *,
+        started: float,
+        published: Sequence[datetime] = (),
+        new: int = 0,
+        unchanged: bool = False,
+        error: bool = False,
+    ) -> FeedState:
+        """Update a feed's schedule after a poll that started at ``started``."""
+        st = self.state[url]
+        st["lag"] = max(0.0, started - st["next_due"])
+        rate = None if (unchanged or error) else self.publish_rate(published, started, st.get("last_poll"))
+        if rate is None and not (unchanged or error) and st.get("last_poll"):
+            # No dates in the feed: fall back to what actually showed up
+            rate = new / max(1.0, started - st["last_poll"])
+        if rate is not None:
+            prev = st.get("rate") or 0.0
+            st["rate"] = rate if prev <= 0 else self.smoothing * rate + (1 - self.smoothing) * prev
+        st["misses"] = 0 if new > 0 else int(st.get("misses", 0)) + 1
+        st["last_poll"] = started
+        interval = self.interval_for(st)
+        st["interval"] = interval
+        st["next_due"] = started + interval * (1 + random.uniform(-self.jitter, self.jitter))
+        record_feed_schedule(self.name(url), st["next_due"], interval, st["lag"])
+        return st
+
+    def publish_metrics(self) -> None:
+        for url, st in self.state.items():
+            record_feed_schedule(self.name(url), st["next_due"], st["interval"], st.get("lag"))
+
+    def save(self) -> None:
+        save_json(self.path, {u: dict(st) for u, st in self.state.items()})
+
+
+async def run_daemon(
+    scheduler: FeedScheduler,
+    pool,
+    *,
+    make_source: Callable[[List[Dict[str, Any]]], Any],
+    client,
+    dedup=None,
+    stop: Optional[asyncio.Event] = None,
+    idle: float = 30.0,
+    **pipeline_kw: Any,
+) -> None:
+    """Poll due feeds until ``stop`` is set.
+
+    ``pool`` is a psycopg_pool.ConnectionPool; ``make_source(feeds)`` builds
+    an RssSource for the due feeds (sharing the validator cache).
+    """
+    from .pipeline import format_stats, run_pipeline
+
+    stop = stop or asyncio.Event()
+    scheduler.publish_metrics()
+    while not stop.is_set():
+        now = scheduler.clock()
+        due = scheduler.due(now)
+        if due:
+            source = make_source(due)
+            try:
+                with pool.connection() as conn:
+                    if dedup is not None:
+                        # Pick up docs written by other ingest jobs
+                        await asyncio.to_thread(dedup.warm, conn)
+                    stats = await run_pipeline(source, conn, client=client, dedup=dedup, **pipeline_kw)
+                print(format_stats(f"daemon ({len(due)} feeds)", stats))
+            except Exception as ex:
+                print(f"[!] daemon: poll failed: {ex}")
+                for f in due:
+                    scheduler.observe(f["url"], started=now, error=True)
+            else:
+                for f in due:
+                    fs = source.feed_stats.get(f["url"], {"error": True})
+                    scheduler.observe(
+                        f["url"],
+                        started=now,
+                        published=fs.get("published", ()),
+                        new=fs.get("new", 0),
+                        unchanged=fs.get("unchanged", False),
+                        error=fs.get("error", False),
+                    )
+                if dedup is not None:
+                    dedup.save()
+            scheduler.save()
+        wait = min(idle, max(0.5, scheduler.next_wakeup() - scheduler.clock()))
+        try:
+            await asyncio.wait_for(stop.wait(), wait)
+        except asyncio.TimeoutError:
+            pass
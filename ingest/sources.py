@@ -0,0 +1,363 @@
+"""
+Source adapters for the ingest pipeline (RSS/Atom, Hacker News, NewsAPI).
+
+Each adapter only knows how to fetch its payloads and map items to rows
+with make_row(); see ingest/pipeline.py for the shared stages.
+"""
+from __future__ import annotations
+
+import asyncio
+import functools
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional, Sequence, Set
+
+from .bulk_writer import ArticleRow
+from .fetch import HostLimiter, TokenBucket, fetch_one, parse_feed_data
+from .http_cache import ValidatorCache, conditional_get_async
+from .normalize import make_row, parse_time
+from .pipeline import Payload, Source
+from .state import HighWaterMarks
+
+
+def _confirm(cache: Optional[ValidatorCache], key: str, resp) -> Optional[Any]:
+    """on_written callback that stores validators for ``resp``."""
+    if cache is None:
+        return None
+    return functools.partial(cache.remember, key, dict(resp.headers), resp.content)
+
+
+class RssSource(Source):
+    """RSS/Atom feeds from a feeds.json list (name, url, genre_hint).
+
+    ``feed_stats`` collects per-feed outcomes of the run (keyed by feed URL)
+    for the polling scheduler: unchanged / error flags, entry publish times
+    and the number of entries that were new.
+
+    With ``marks``, each feed's newest entry time is kept as a high-water
+    mark and the streaming parser stops at entries older than it.
+    """
+
+    name = "rss"
+    parse = staticmethod(parse_feed_data)
+
+    def __init__(
+        self,
+        feeds: List[Dict[str, Any]],
+        *,
+        default_source: str = "RSS",
+        genre_hint: Optional[str] = None,
+        cache: Optional[ValidatorCache] = None,
+        concurrency: int = 16,
+        per_host: int = 2,
+        timeout: float = 20.0,
+        marks: Optional[HighWaterMarks] = None,
+    ):
+        self.feeds = feeds
+        self.default_source = default_source
+        self.genre_hint = genre_hint
+        self.cache = cache
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.timeout = timeout
+        self.marks = marks
+        self.feed_stats: Dict[str, Dict[str, Any]] = {}
+
+    @staticmethod
+    def mark_key(url: str) -> str:
+        return f"rss|{url}"
+
+    def _written(self, res) -> None:
+        if self.cache is not None:
+            self.cache.remember(res["key"], res["headers"], res["content"])
+        published = (self.feed_stats.get(res["url"]) or {}).get("published")
+        if self.marks is not None and published:
+            self.marks.advance(self.mark_key(res["url"]), max(published))
+
+    async def fetch(self, client) -> AsyncIterator[Payload]:
+        sem = asyncio.Semaphore(max(1, int(self.concurrency)))
+        hosts = HostLimiter(self.per_host)
+        tasks = [
+            asyncio.create_task(fetch_one(client, f, sem=sem, hosts=hosts, timeout=self.timeout, cache=self.cache))
+            for f in self.feeds
+        ]
+        try:
+            # Hand feeds downstream in completion order
+            for fut in asyncio.as_completed(tasks):
+                res = await fut
+                feed = res["feed"]
+                name = feed.get("name") or self.default_source
+                self.feed_stats[res["url"]] = {
+                    "unchanged": bool(res.get("unchanged")),
+                    "error": res.get("content") is None and not res.get("unchanged"),
+                    "published": [],
+                    "new": 0,
+                }
+                if res.get("unchanged"):
+                    print(f"[=] Unchanged: {name} :: {res['url']}")
+                    yield {"key": res["key"], "unchanged": True}
+                elif res.get("content") is None:
+                    print(f"[!] Fetch failed: {name} :: {res['url']} ({res.get('error')})")
+                    yield {"key": res["key"], "error": res.get("error")}
+                else:
+                    print(f"[+] Fetch: {name} :: {res['url']} ({res.get('elapsed', 0.0):.2f}s)")
+                    data = res["content"]
+                    if self.marks is not None:
+                        data = (data, self.marks.get(self.mark_key(res["url"])))
+                    on_written = functools.partial(self._written, res)
+                    yield {"key": res["key"], "data": data, "meta": {"feed": feed}, "on_written": on_written}
+        finally:
+            for t in tasks:
+                t.cancel()
+
+    def normalize(self, parsed: Dict[str, Any], payload: Payload) -> Iterable[Optional[ArticleRow]]:
+        feed = payload["meta"]["feed"]
+        name = feed.get("name") or self.default_source
+        code = feed.get("genre_hint") or self.genre_hint
+        pf = parsed["feed"]
+        fs = self.feed_stats.get(feed.get("url"))
+        if fs is not None:
+            fs["published"] = [
+                t for t in (parse_time(e.get("published") or e.get("updated")) for e in parsed["entries"]) if t
+            ]
+        for e in parsed["entries"]:
+            yield make_row(
+                source=name,
+                url=e.get("link"),
+                title=e.get("title"),
+                summary=e.get("summary") or e.get("description"),
+                published=e.get("published") or e.get("updated"),
+                source_uid=e.get("id"),
+                author=e.get("author"),
+                lang=e.get("language") or pf.get("language") or None,
+                raw={
+                    "feed": {"title": pf.get("title"), "link": pf.get("link")},
+                    "entry": {k: e.get(k) for k in ("id", "title", "link", "summary", "published", "updated", "author")},
+                },
+                genre_hint=code,
+            )
+
+    def observe(self, payload: Payload, rows: List[ArticleRow], new_rows: List[ArticleRow]) -> None:
+        fs = self.feed_stats.get(payload["meta"]["feed"].get("url"))
+        if fs is not None:
+            fs["new"] += len(new_rows)
+
+    def close(self, stats: Dict[str, int]) -> None:
+        if self.cache is not None:
+            self.cache.save()
+        if self.marks is not None:
+            self.marks.save()
+
+
+HN_BASE = "https://hacker-news.firebaseio.com/v0"
+
+
+class HackerNewsSource(Source):
+    """Hacker News story list (top/new/best) and its items.
+
+    Items are fetched concurrently (``concurrency`` in flight, ``rate``
+    requests/second overall). ``known(ids)`` may return the ids already in
+    the DB so they are not fetched at all.
+    """
+
+    name = "HackerNews"
+
+    def __init__(
+        self,
+        *,
+        kind: str = "topstories",
+        limit: int = 100,
+        concurrency: int = 8,
+        rate: float = 20.0,
+        known: Optional[Callable[[Sequence[str]], Set[str]]] = None,
+        cache: Optional[ValidatorCache] = None,
+        base: str = HN_BASE,
+    ):
+        self.kind = kind
+        self.limit = limit
+        self.concurrency = concurrency
+        self.rate = rate
+        self.known = known
+        self.cache = cache
+        self.base = base
+        self._list = None  # (key, response) of the story list
+
+    async def _item(self, client, item_id: str, sem: asyncio.Semaphore, bucket: TokenBucket) -> Payload:
+        iu = f"{self.base}/item/{item_id}.json"
+        async with sem:
+            await bucket.acquire()
+            try:
+                it, ikey, unchanged = await conditional_get_async(client, iu, self.cache)
+                if unchanged:
+                    return {"key": ikey, "unchanged": True}
+                data = it.json()
+            except Exception as ex:
+                print(f"[!] fetch item {item_id} error: {ex}")
+                return {"key": iu, "error": str(ex)}
+        return {"key": ikey, "data": data, "on_written": _confirm(self.cache, ikey, it)}
+
+    async def fetch(self, client) -> AsyncIterator[Payload]:
+        url = f"{self.base}/{self.kind}.json"
+        print(f"[+] GET {url}")
+        lst, key, unchanged = await conditional_get_async(client, url, self.cache)
+        if unchanged:
+            # Same story list as the last complete run: nothing to do
+            yield {"key": key, "unchanged": True}
+            return
+        self._list = (key, lst)
+        ids = [str(i) for i in lst.json()[: self.limit]]
+        if self.known is not None:
+            skip = await asyncio.to_thread(self.known, ids)
+            if skip:
+                print(f"[=] {len(skip)} of {len(ids)} items already stored")
+            ids = [i for i in ids if i not in skip]
+        sem = asyncio.Semaphore(max(1, int(self.concurrency)))
+        bucket = TokenBucket(self.rate)
+        tasks = [asyncio.create_task(self._item(client, i, sem, bucket)) for i in ids]
+        try:
+            for fut in asyncio.as_completed(tasks):
+                yield await fut
+        finally:
+            for t in tasks:
+                t.cancel()
+
+    def normalize(self, item: Dict[str, Any], payload: Payload) -> Iterable[Optional[ArticleRow]]:
+        if not item or item.get("type") != "story":
+            return []
+        return [
+            make_row(
+                source="HackerNews",
+                url=item.get("url"),
+                title=item.get("title"),
+                summary=item.get("text"),
+                published=item.get("time"),
+                source_uid=str(item.get("id")),
+                author=item.get("by"),
+                raw={k: item.get(k) for k in ("id", "by", "score", "title", "url", "time", "descendants")},
+            )
+        ]
+
+    def close(self, stats: Dict[str, int]) -> None:
+        if self.cache is None:
+            return
+        # Only trust the list once every item from it made it to the DB
+        if self._list is not None and not stats.get("failed") and not stats.get("errors"):
+            key, lst = self._list
+            self.cache.remember(key, lst.headers, lst.content)
+        self.cache.save()
+
+
+NEWSAPI_URL = "https://newsapi.org/v2"
+
+
+class NewsApiSource(Source):
+    """NewsAPI top-headlines / everything, walked page by page.
+
+    With ``marks``, the newest publishedAt per source/query is persisted
+    after a clean run: ``everything`` requests pass it as ``from`` and
+    paging stops at the first page that is entirely older than it. Both
+    only apply to ``everything`` (sorted by publishedAt); top-headlines is
+    ranked by NewsAPI, so an old page says nothing about the next one.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        *,
+        mode: str = "top",
+        country: str = "jp",
+        category: Optional[str] = None,
+        q: Optional[str] = None,
+        page_size: int = 50,
+        pages: int = 1,
+        genre_hint: Optional[str] = None,
+        sleep: float = 0.3,
+        cache: Optional[ValidatorCache] = None,
+        marks: Optional[HighWaterMarks] = None,
+        base: str = NEWSAPI_URL,
+    ):
+        self.api_key = api_key
+        self.mode = mode
+        self.country = country
+        self.category = category
+        self.q = q
+        self.page_size = page_size
+        self.pages = pages
+        self.genre_hint = genre_hint
+        self.sleep = sleep
+        self.cache = cache
+        self.marks = marks
+        self.base = base
+        self.name = f"NewsAPI:{category or 'general'}:{country}"
+        self._newest = None  # newest publishedAt fetched in this run
+
+    @property
+    def mark_key(self) -> str:
+        return f"{self.name}|{self.mode}|{self.q or ''}"
+
+    def request(self, page: int, since=None):
+        params: Dict[str, Any] = {"pageSize": self.page_size, "page": page, "apiKey": self.api_key}
+        if self.mode == "top":
+            url = f"{self.base}/top-headlines"
+            params["country"] = self.country
+            if self.category:
+                params["category"] = self.category
+            if self.q:
+                params["q"] = self.q
+        else:
+            url = f"{self.base}/everything"
+            if self.q:
+                params["q"] = self.q
+            params["sortBy"] = "publishedAt"
+            if since is not None:
+                params["from"] = since.strftime("%Y-%m-%dT%H:%M:%S")
+        return url, params
+
+    async def fetch(self, client) -> AsyncIterator[Payload]:
+        # Only `everything` is sorted by publishedAt, so only there is the mark a stop condition
+        sorted_by_time = self.mode != "top"
+        mark = self.marks.get(self.mark_key) if self.marks is not None and sorted_by_time else None
+        for page in range(1, self.pages + 1):
+            url, params = self.request(page, since=mark)
+            print(f"[+] GET {url} {({k: v for k, v in params.items() if k != 'apiKey'})}")
+            r, key, unchanged = await conditional_get_async(client, url, self.cache, params=params)
+            if unchanged:
+                print(f"[=] page {page} unchanged")
+                yield {"key": key, "unchanged": True}
+            else:
+                data = r.json()
+                articles = data.get("articles") or []
+                times = [parse_time(a.get("publishedAt")) for a in articles]
+                known = [t for t in times if t is not None]
+                if known:
+                    newest = max(known)
+                    self._newest = newest if self._newest is None else max(self._newest, newest)
+                if mark is not None and articles and all(t is not None and t <= mark for t in times):
+                    print(f"[=] page {page} is older than the high-water mark ({mark.isoformat()}); stop")
+                    break
+                yield {"key": key, "data": data, "on_written": _confirm(self.cache, key, r)}
+                if not articles:
+                    break
+            if self.sleep:
+                await asyncio.sleep(self.sleep)
+
+    def normalize(self, data: Dict[str, Any], payload: Payload) -> Iterable[Optional[ArticleRow]]:
+        for a in data.get("articles", []):
+            yield make_row(
+                source=self.name,
+                url=a.get("url"),
+                title=a.get("title"),
+                summary=a.get("description"),
+                published=a.get("publishedAt"),
+                source_uid=a.get("url"),  # best-effort unique
+                author=a.get("author"),
+                lang=a.get("language"),  # not always present
+                raw={k: a.get(k) for k in ("source", "author", "title", "description", "url", "publishedAt", "content")},
+                genre_hint=self.genre_hint,
+            )
+
+    def close(self, stats: Dict[str, int]) -> None:
+        if self.cache is not None:
+            self.cache.save()
+        # A failed page must be fetched again next run, so keep the old mark
+        if self.marks is not None and self._newest is not None and not stats.get("failed") and not stats.get("errors"):
+            self.marks.advance(self.mark_key, self._newest)
+            self.marks.save()
@@ -0,0 +1,74 @@
+"""
+Small on-disk state shared by ingest runs (validators, marks, filters).
+
+Files live under INGEST_STATE_DIR (default: tmp/ingest_state) and are
+written atomically so an interrupted run never leaves a torn file behind.
+"""
+from __future__ import annotations
+
+import json
+import os
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+
+def state_dir() -> str:
+    return os.environ.get("INGEST_STATE_DIR") or os.path.join("tmp", "ingest_state")
+
+
+def state_path(name: str) -> str:
+    return os.path.join(state_dir(), name)
+
+
+def load_json(path: str, default: Any) -> Any:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return default
+    except Exception:
+        # Corrupt state is not fatal: start fresh
+        return default
+
+
+def save_json(path: str, data: Any) -> None:
+    d = os.path.dirname(path)
+    if d:
+        os.makedirs(d, exist_ok=True)
+    tmp = f"{path}.tmp.{os.getpid()}"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp, path)
+
+
+class HighWaterMarks:
+    """Latest timestamp seen per key (e.g. source + query), persisted as JSON.
+
+    Callers advance a mark only once everything up to it has been written.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or state_path("high_water.json")
+        data = load_json(self.path, {})
+        self._marks: Dict[str, str] = data if isinstance(data, dict) else {}
+        self._dirty = False
+
+    def get(self, key: str) -> Optional[datetime]:
+        v = self._marks.get(key)
+        if not v:
+            return None
+        try:
+            return datetime.fromisoformat(v)
+        except Exception:
+            return None
+
+    def advance(self, key: str, when: datetime) -> None:
+        cur = self.get(key)
+        if cur is None or when > cur:
+            self._marks[key] = when.isoformat()
+            self._dirty = True
+
+    def save(self) -> None:
+        if self._dirty:
+            save_json(self.path, self._marks)
+            self._dirty = False
@@ -5,7 +5,7 @@ Avoids duplicate metric registrations between web and MCP server modules.
 import asyncio
 import functools
 import time
-from typing import Any, Callable, TypeVar, Union
+from typing import Any, Callable, Optional, TypeVar, Union
 
 # Prometheus metrics
 try:
@@ -24,6 +24,22 @@ try:
     search_requests_total = Counter('search_requests_total', 'Total number of search requests processed')
     embed_latency_seconds = Histogram('embed_latency_seconds', 'Latency of embedding operations')
     dup_ratio = Gauge('dup_ratio', 'Near-duplicate ratio of ingested documents')
+    # Ingest pipeline (per source / outcome: written, unchanged, failed, error)
+    ingest_source_items_total = Counter('ingest_source_items_total', 'Ingest pipeline items by source and outcome', ['source', 'outcome'])
+    # Ingest daemon scheduler (per feed)
+    ingest_feed_next_due_timestamp = Gauge('ingest_feed_next_due_timestamp_seconds', 'Unix time of the next scheduled poll', ['feed'])
+    ingest_feed_interval_seconds = Gauge('ingest_feed_interval_seconds', 'Current adaptive polling interval', ['feed'])
+    ingest_feed_lag_seconds = Gauge('ingest_feed_lag_seconds', 'Delay between a feed becoming due and its last poll start', ['feed'])
+    # Embedding cache (per embedding space; result: hit, miss)
+    embed_cache_requests_total = Counter('embed_cache_requests_total', 'Embedding cache lookups by space and result', ['space', 'result'])
+    embed_cache_hit_ratio = Gauge('embed_cache_hit_ratio', 'Embedding cache hit ratio since process start', ['space'])
+    # Query embedding LRU in the search servers (result: hit, miss)
+    query_embed_cache_total = Counter('query_embed_cache_total', 'Query embedding cache lookups by result', ['result'])
+    # Query-embedding model readiness in the MCP server (loaded in the background)
+    embedding_model_ready = Gauge('embedding_model_ready', 'Whether the query embedding model is loaded (1) or not (0)')
+    embedding_model_load_seconds = Gauge('embedding_model_load_seconds', 'Time the query embedding model took to load')
+    # Local embedding service: texts per coalesced inference pass
+    embed_service_batch_size = Histogram('embed_service_batch_size', 'Texts per micro-batched inference pass in the embedding service', buckets=(1, 2, 4, 8, 16, 32, 64, 128))
 except ImportError:
     PROMETHEUS_AVAILABLE = False
     items_ingested_total = None
@@ -37,6 +53,16 @@ except ImportError:
     search_requests_total = None
     embed_latency_seconds = None
     dup_ratio = None
+    ingest_source_items_total = None
+    ingest_feed_next_due_timestamp = None
+    ingest_feed_interval_seconds = None
+    ingest_feed_lag_seconds = None
+    embed_cache_requests_total = None
+    embed_cache_hit_ratio = None
+    query_embed_cache_total = None
+    embed_service_batch_size = None
+    embedding_model_ready = None
+    embedding_model_load_seconds = None
 
 
 F = TypeVar('F', bound=Callable[..., Any])
@@ -50,16 +76,91 @@ def get_metrics_content() -> str:
     return generate_latest().decode('utf-8')
 
 
-def record_ingest_item() -> None:
-    """Record that an item was ingested."""
+def record_ingest_item(n: int = 1) -> None:
+    """Record that an item (or ``n`` items) was ingested."""
     if PROMETHEUS_AVAILABLE and items_ingested_total is not None:
-        items_ingested_total.inc()
+        items_ingested_total.inc(n)
 
 
-def record_embedding_built() -> None:
-    """Record that an embedding was built."""
+def record_ingest_outcome(source: str, outcome: str, n: int = 1) -> None:
+    """Record ingest pipeline items for a source by outcome."""
+    if PROMETHEUS_AVAILABLE and ingest_source_items_total is not None and n:
+        ingest_source_items_total.labels(source=source, outcome=outcome).inc(n)
+
+
+def record_feed_schedule(feed: str, next_due: float, interval: float, lag: Union[float, None] = None) -> None:
+    """Record the ingest daemon's schedule for a feed (lag: seconds late on the last poll)."""
+    if not PROMETHEUS_AVAILABLE or ingest_feed_next_due_timestamp is None:
+        return
+    ingest_feed_next_due_timestamp.labels(feed=feed).set(next_due)
+    ingest_feed_interval_seconds.labels(feed=feed).set(interval)
+    if lag is not None:
+        ingest_feed_lag_seconds.labels(feed=feed).set(max(0.0, lag))
+
+
+def serve_metrics(port: int, addr: str = "127.0.0.1") -> bool:
+    """Expose /metrics from a standalone process (e.g. the ingest daemon)."""
+    if not PROMETHEUS_AVAILABLE:
+        return False
+    from prometheus_client import start_http_server
+    start_http_server(port, addr=addr)
+    return True
+
+
+def record_embedding_built(n: int = 1) -> None:
+    """Record that an embedding (or ``n`` embeddings) was built."""
     if PROMETHEUS_AVAILABLE and embeddings_built_total is not None:
-        embeddings_built_total.inc()
+        embeddings_built_total.inc(n)
+
+
+def observe_embed_duration(seconds: float) -> None:
+    """Record the duration of one embedding batch."""
+    if PROMETHEUS_AVAILABLE and embed_duration_seconds is not None:
+        embed_duration_seconds.observe(seconds)
+
+
+_embed_cache_counts: dict = {}
+
+
+def record_embed_cache(space: str, hits: int, misses: int) -> None:
+    """Record embedding cache lookups for a space and update its hit ratio."""
+    if not PROMETHEUS_AVAILABLE or embed_cache_requests_total is None:
+        return
+    if hits:
+        embed_cache_requests_total.labels(space=space, result="hit").inc(hits)
+    if misses:
+        embed_cache_requests_total.labels(space=space, result="miss").inc(misses)
+    h, m = _embed_cache_counts.get(space, (0, 0))
+    h, m = h + hits, m + misses
+    _embed_cache_counts[space] = (h, m)
+    if h + m:
+        embed_cache_hit_ratio.labels(space=space).set(h / (h + m))
+
+
+def record_query_embed_cache(hit: bool) -> None:
+    """Record a query embedding cache lookup."""
+    if PROMETHEUS_AVAILABLE and query_embed_cache_total is not None:
+        query_embed_cache_total.labels(result="hit" if hit else "miss").inc()
+
+
+def observe_embed_latency(seconds: float) -> None:
+    """Record the latency of one (query) embedding call."""
+    if PROMETHEUS_AVAILABLE and embed_latency_seconds is not None:
+        embed_latency_seconds.observe(seconds)
+
+
+def observe_embed_service_batch(n: int) -> None:
+    """Record the size of one micro-batched inference pass in the embedding service."""
+    if PROMETHEUS_AVAILABLE and embed_service_batch_size is not None:
+        embed_service_batch_size.observe(n)
+
+
+def set_embedding_model_ready(ready: bool, load_seconds: Optional[float] = None) -> None:
+    """Publish query embedding model readiness (and how long loading took)."""
+    if PROMETHEUS_AVAILABLE and embedding_model_ready is not None:
+        embedding_model_ready.set(1 if ready else 0)
+        if load_seconds is not None:
+            embedding_model_load_seconds.set(load_seconds)
 
 
 def record_entity_linked() -> None:
@@ -30,10 +30,15 @@ except Exception:  # pragma: no cover
     psycopg = None  # type: ignore
 from .db import connect
 from .config_guard import require_fixed_env
-from search.ranker import rerank_candidates
+from search.ranker import install_reload_signal, rerank_candidates
+from search.sql_fusion import fused_search, fusion_mode
+from search.candidates import semantic_candidates
+from search.hybrid import hybrid_search as run_hybrid_search
+from embedding.loader import BackgroundLoader
+from embedding.query_cache import QueryEmbeddingCache
 
 # Import common metrics module
-from .metrics import get_metrics_content, record_search_request
+from .metrics import get_metrics_content, record_search_request, set_embedding_model_ready
 
 # Enforce fixed environment at import time (fail fast on policy violations)
 require_fixed_env()
@@ -60,19 +65,53 @@ if not logger.handlers:
 
 
 def _try_load_model():
+    # A host-wide embedding service (scripts/embed_service.py) takes precedence over an in-process model
+    from embedding.client import service_client
+
+    client = service_client()
+    if client is not None:
+        return client
     flag = os.environ.get("ENABLE_SERVER_EMBEDDING", "0").strip().lower()
     if flag not in ("1", "true", "yes", "on"):
         return None
     try:
-        from sentence_transformers import SentenceTransformer
+        # EMBEDDING_BACKEND: sentence-transformers (default) | onnx | onnx-int8
+        from embedding.backends import load_backend
 
         model_name = os.environ.get("EMBEDDING_MODEL", "intfloat/multilingual-e5-base")
-        return SentenceTransformer(model_name)
+        return load_backend(model_name=model_name)
     except Exception:
+        logger.exception("embedding backend failed to load; semantic_search falls back to recency")
         return None
 
 
-_MODEL = _try_load_model()
+def _model_loaded(loader: BackgroundLoader) -> None:
+    set_embedding_model_ready(loader.ready, loader.load_s)
+    if loader.ready:
+        logger.info("embedding model ready in %.1fs", loader.load_s)
+
+
+# Loaded off the import path: started by main() (or the first semantic_search), so the
+# stdio server answers immediately and semantic_search serves recency until it is ready.
+_MODEL_LOADER = BackgroundLoader(_try_load_model, name="embedding-model", on_done=_model_loaded)
+# Seconds a semantic_search may wait for a model that is still loading (0: never wait)
+MODEL_WAIT_SECONDS = float(os.environ.get("EMBED_MODEL_WAIT_SECONDS", "0") or 0)
+set_embedding_model_ready(False)
+
+
+def _get_model(timeout: Optional[float] = None):
+    return _MODEL_LOADER.get(MODEL_WAIT_SECONDS if timeout is None else timeout)
+
+
+# Repeated / paginated queries reuse their vector instead of re-running the model
+_QUERY_CACHE = QueryEmbeddingCache(
+    maxsize=int(os.environ.get("QUERY_EMBED_CACHE_SIZE", "1024")),
+    ttl=float(os.environ.get("QUERY_EMBED_CACHE_TTL", "0")) or None,
+)
+
+
+def _embed_query(q: str, model=None):
+    return _QUERY_CACHE.encode(model if model is not None else _get_model(), q)
 
 
 def _to_iso(dt_utc: datetime) -> str:
@@ -91,6 +130,22 @@ def _row_to_bundle(row) -> Bundle:
     }
 
 
+def _parse_since(since: Optional[str], tool: str) -> Optional[datetime]:
+    if not since:
+        return None
+    try:
+        since_dt = datetime.fromisoformat(since)
+        if since_dt.tzinfo is None:
+            since_dt = since_dt.replace(tzinfo=timezone.utc)
+        return since_dt.astimezone(timezone.utc)
+    except Exception:
+        try:
+            logger.info(f"{tool}: bad since; falling back to no-since", extra={"since": since})
+        except Exception:
+            pass
+        return None
+
+
 @mcp.tool()
 def doc_head(doc_id: int) -> Bundle:
     with connect() as conn:
@@ -114,54 +169,28 @@ def doc_head(doc_id: int) -> Bundle:
 def semantic_search(q: str, top_k: int = 50, since: Optional[str] = None) -> List[Bundle]:
     """Semantic search over chunk_vec if available; fallback to recency."""
     record_search_request()
-    since_dt = None
-    if since:
-        try:
-            since_dt = datetime.fromisoformat(since)
-            if since_dt.tzinfo is None:
-                since_dt = since_dt.replace(tzinfo=timezone.utc)
-            since_dt = since_dt.astimezone(timezone.utc)
-        except Exception:
-            since_dt = None
-            try:
-                logger.info("semantic_search: bad since; falling back to no-since", extra={"since": since})
-            except Exception:
-                pass
+    since_dt = _parse_since(since, "semantic_search")
 
     with connect() as conn:
         # Vector search if model is available and chunk_vec exists
-        if _MODEL is not None:
+        model = _get_model()
+        if model is not None:
             try:
                 from pgvector.psycopg import Vector  # local import to avoid hard dep when unused
-                q_emb = _MODEL.encode([q], normalize_embeddings=True)[0]
-                cond_sql = ""
-                params: List[Any] = []
-                if since_dt is not None:
-                    cond_sql = "AND d.published_at >= %s"
-                    # will append later after space
-                    pass
+                q_emb = _embed_query(q, model)
                 qv = Vector(list(map(float, q_emb)))
-                # candidate expansion for fusion re-ranking
+                # candidate expansion for fusion re-ranking (docs, best chunk each)
                 cand = min(200, max(top_k * 3 + 10, top_k))
-                # order: qv(for dist), space, optional since, limit
-                params = [qv, EMBED_SPACE] + ([since_dt] if since_dt is not None else []) + [cand]
-
-                cur = conn.execute(
-                    f"""
-                    SELECT d.doc_id, d.title_raw, d.published_at,
-                           (SELECT val FROM hint WHERE doc_id=d.doc_id AND key='genre_hint') AS genre_hint,
-                           d.url_canon, d.source, d.lang,
-                           (v.emb <=> %s) AS dist
-                    FROM chunk_vec v
-                    JOIN chunk c ON c.chunk_id = v.chunk_id
-                    JOIN doc d   ON d.doc_id   = c.doc_id
-                    WHERE v.embedding_space = %s {cond_sql}
-                    ORDER BY dist ASC
-                    LIMIT %s
-                    """,
-                    tuple(params),
-                )
-                rows = cur.fetchall()
+
+                if fusion_mode() == "sql":
+                    # Postgres scores the candidates and hydrates only the final top_k
+                    fused = fused_search(conn, qv, EMBED_SPACE, limit=top_k, cand=cand, since=since_dt)
+                    if fused:
+                        logger.info("semantic_search: route=vector-sql", extra={"q": q, "top_k": top_k})
+                        return [_row_to_bundle(r) for r in fused]
+                    raise LookupError("no vector candidates")  # -> recency fallback below
+
+                rows = semantic_candidates(conn, qv, EMBED_SPACE, n=cand, since=since_dt)
                 if rows:
                     reranked = rerank_candidates(
                         rows,
@@ -203,6 +232,30 @@ def semantic_search(q: str, top_k: int = 50, since: Optional[str] = None) -> Lis
         return [_row_to_bundle(r) for r in rows]
 
 
+@mcp.tool()
+def hybrid_search(q: str, top_k: int = 50, since: Optional[str] = None) -> List[Bundle]:
+    """Hybrid search: title match (pg_trgm / pgroonga / ILIKE) + vector search, fused by reciprocal rank.
+
+    Without a loaded embedding model the lexical ranking is used alone.
+    """
+    record_search_request()
+    since_dt = _parse_since(since, "hybrid_search")
+    qv = None
+    model = _get_model()
+    if model is not None:
+        try:
+            qv = _embed_query(q, model)  # float32 ndarray; register_vector adapts it
+        except Exception:
+            logger.exception("hybrid_search: query embedding failed; lexical only")
+    try:
+        rows = run_hybrid_search(connect, q, qv, EMBED_SPACE, limit=top_k, since=since_dt)
+    except Exception:
+        logger.exception("hybrid_search failed")
+        return []
+    logger.info("hybrid_search: route=%s", "hybrid" if qv is not None else "lexical", extra={"q": q, "top_k": top_k})
+    return [_row_to_bundle(r) for r in rows]
+
+
 @mcp.tool()
 def entity_search(ext_ids: List[str] | None = None, names: List[str] | None = None, top_k: int = 50) -> List[Bundle]:
     """Search docs by linked entities.
@@ -331,5 +384,7 @@ def get_metrics() -> str:
 
 
 if __name__ == "__main__":
+    _MODEL_LOADER.start()
+    install_reload_signal()  # SIGHUP: re-read config/ranking.*
     # stdio transport
     mcp.run_stdio()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""Query-encode latency and agreement per embedding backend (sentence-transformers / onnx / onnx-int8)."""
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+# Allow `python scripts/benchmark_embed_backends.py` to import repo packages
+_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+
+from embedding.backends import BACKENDS, load_backend
+from embedding.models import MODEL_NAME
+
+QUERIES = [
+    "日銀 金融政策 決定会合",
+    "Tokyo stock market close",
+    "半導体 輸出規制 中国",
+    "earthquake tsunami warning Japan",
+    "election results United States",
+    "円相場 介入",
+    "central bank interest rate decision",
+    "AI regulation European Union",
+]
+
+
+def pct(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(p / 100.0 * (len(values) - 1))))]
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--model", default=MODEL_NAME)
+    ap.add_argument("--backends", default=",".join(BACKENDS), help="comma-separated backends")
+    ap.add_argument("--runs", type=int, default=50, help="single-query encodes per backend")
+    ap.add_argument("--batch", type=int, default=32, help="texts per call for the throughput run")
+    args = ap.parse_args()
+
+    out = {"model": args.model, "cores": os.cpu_count(), "backends": {}}
+    ref = None
+    for name in [b.strip() for b in args.backends.split(",") if b.strip()]:
+        t = time.perf_counter()
+        try:
+            backend = load_backend(name, args.model)
+        except Exception as ex:
+            out["backends"][name] = {"error": f"{type(ex).__name__}: {ex}"}
+            continue
+        res = {"load_s": round(time.perf_counter() - t, 2), "dim": backend.dim}
+        backend.encode(QUERIES[:2])  # warm up
+        lat = []
+        for i in range(args.runs):
+            t = time.perf_counter()
+            backend.encode([QUERIES[i % len(QUERIES)]], normalize_embeddings=True)
+            lat.append((time.perf_counter() - t) * 1000.0)
+        res["query_p50_ms"] = round(pct(lat, 50), 2)
+        res["query_p95_ms"] = round(pct(lat, 95), 2)
+        texts = (QUERIES * (args.batch // len(QUERIES) + 1))[: args.batch]
+        t = time.perf_counter()
+        vecs = backend.encode(texts, normalize_embeddings=True)
+        res["batch_texts_per_s"] = round(len(texts) / (time.perf_counter() - t), 1)
+        if ref is None:
+            ref = vecs
+            res["reference"] = True
+        else:
+            cos = (ref * vecs).sum(axis=1)
+            res["cos_vs_reference_min"] = round(float(np.min(cos)), 5)
+            res["cos_vs_reference_mean"] = round(float(np.mean(cos)), 5)
+        out["backends"][name] = res
+    print(json.dumps(out, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
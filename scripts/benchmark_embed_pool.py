@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""Embedding throughput: fixed vs length-bucketed batches, in-process vs EmbedPool with 1..N workers."""
+import argparse
+import functools
+import json
+import os
+import random
+import sys
+import time
+
+# Allow `python scripts/benchmark_embed_pool.py` to import repo packages
+_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+
+from embedding.batching import approx_tokens, padded_tokens, plan_batches
+from embedding.models import MODEL_NAME, hashing_encoder, sentence_transformer_encoder
+from embedding.pool import EmbedPool
+
+
+def make_texts(n: int, long_ratio: float, seed: int = 0):
+    """Headline-heavy mix: mostly 8-16 words, some 150-250 word body chunks."""
+    rng = random.Random(seed)
+    words = [f"w{i}" for i in range(5000)]
+    out = []
+    for _ in range(n):
+        k = rng.randint(150, 250) if rng.random() < long_ratio else rng.randint(8, 16)
+        out.append(" ".join(rng.choices(words, k=k)))
+    return out
+
+
+def fixed_batches(texts, batch: int):
+    return [texts[i : i + batch] for i in range(0, len(texts), batch)]
+
+
+def bucketed_batches(texts, token_budget: int, max_batch: int):
+    rows = list(enumerate(texts))
+    return [[r[1] for r in b] for b in plan_batches(rows, token_budget=token_budget, max_batch=max_batch)]
+
+
+def throughput(encode, batches, runs: int) -> float:
+    n = sum(len(b) for b in batches)
+    best = 0.0
+    for _ in range(runs):
+        t = time.perf_counter()
+        for b in batches:
+            encode(b)
+        best = max(best, n / (time.perf_counter() - t))
+    return round(best, 1)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--model", default=MODEL_NAME, help="SentenceTransformer name, or 'hashing' (no model needed)")
+    ap.add_argument("--texts", type=int, default=2000)
+    ap.add_argument("--long-ratio", type=float, default=0.1)
+    ap.add_argument("--batch", type=int, default=64, help="fixed batch: texts per worker per call")
+    ap.add_argument("--token-budget", type=int, default=8192, help="bucketed batch: padded tokens per worker per call")
+    ap.add_argument("--max-batch", type=int, default=256)
+    ap.add_argument("--workers", default="1,2,4", help="comma-separated worker counts")
+    ap.add_argument("--threads", type=int, default=None, help="threads per worker (default: cores / workers)")
+    ap.add_argument("--runs", type=int, default=2)
+    args = ap.parse_args()
+
+    if args.model == "hashing":
+        factory = functools.partial(hashing_encoder, 768, 4)
+    else:
+        factory = functools.partial(sentence_transformer_encoder, args.model, True)
+    texts = make_texts(args.texts, args.long_ratio)
+    out = {"model": args.model, "texts": len(texts), "cores": os.cpu_count(), "padded_tokens": {}, "texts_per_s": {}}
+    fixed = fixed_batches(texts, args.batch)
+    bucketed = bucketed_batches(texts, args.token_budget, args.max_batch)
+    for name, batches in (("fixed", fixed), ("bucketed", bucketed)):
+        out["padded_tokens"][name] = sum(padded_tokens([approx_tokens(t) for t in b]) for b in batches)
+    encode = factory()
+    encode(texts[:8])  # warm up
+    out["texts_per_s"]["in_process_fixed"] = throughput(encode, fixed, args.runs)
+    out["texts_per_s"]["in_process_bucketed"] = throughput(encode, bucketed, args.runs)
+    del encode
+    for n in [int(x) for x in args.workers.split(",") if x.strip()]:
+        with EmbedPool(factory, n, threads=args.threads) as pool:
+            pool.encode(texts[: 8 * n])
+            batches = bucketed_batches(texts, args.token_budget * n, args.max_batch * n)
+            out["texts_per_s"][f"pool_{n}x{pool.threads}_bucketed"] = throughput(pool.encode, batches, args.runs)
+    print(json.dumps(out, indent=2))
+
+
+if __name__ == "__main__":
+    main()
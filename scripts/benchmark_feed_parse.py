@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""Compare feedparser with the streaming parser on a synthetic feed (time + peak memory)."""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+# Allow `python scripts/benchmark_feed_parse.py` to import repo packages
+_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+
+from ingest.feed_stream import ENTRY_KEYS, iter_entries
+
+
+def make_feed(n: int) -> bytes:
+    t0 = datetime(2025, 9, 1, tzinfo=timezone.utc)
+    items = []
+    for i in range(n):
+        ts = format_datetime(t0 - timedelta(minutes=i))
+        items.append(
+            f"<item><title>Item {i}</title><link>https://bench.test/{i}</link><guid>g{i}</guid>"
+            f"<description>{'lorem ipsum ' * 40}</description><pubDate>{ts}</pubDate></item>"
+        )
+    body = "".join(items)
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel><title>Bench</title>'
+        f"<link>https://bench.test/</link>{body}</channel></rss>"
+    ).encode()
+
+
+def measure(fn, runs: int):
+    times = []
+    peak = 0
+    for _ in range(runs):
+        tracemalloc.start()
+        t = time.perf_counter()
+        n = fn()
+        times.append((time.perf_counter() - t) * 1000.0)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    times.sort()
+    return {"entries": n, "p50_ms": round(times[len(times) // 2], 2), "peak_kib": round(peak / 1024, 1)}
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--items", type=int, default=5000)
+    ap.add_argument("--new", type=int, default=50, help="entries newer than the high-water mark")
+    ap.add_argument("--runs", type=int, default=5)
+    args = ap.parse_args()
+
+    content = make_feed(args.items)
+    since = datetime(2025, 9, 1, tzinfo=timezone.utc) - timedelta(minutes=args.new)
+    out = {"items": args.items, "bytes": len(content)}
+    try:
+        import feedparser
+
+        def fp():
+            parsed = feedparser.parse(content)
+            return len([{k: e.get(k) for k in ENTRY_KEYS} for e in parsed.entries])
+
+        out["feedparser"] = measure(fp, args.runs)
+    except ImportError:
+        out["feedparser"] = None
+    out["stream_full"] = measure(lambda: sum(1 for _ in iter_entries(content)), args.runs)
+    out["stream_since"] = measure(lambda: sum(1 for _ in iter_entries(content, since=since)), args.runs)
+    print(json.dumps(out, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""rerank_candidates: per-row loop vs. vectorized NumPy scorer (latency and identical ordering)."""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+# Allow `python scripts/benchmark_rank_fusion.py` to import repo packages
+_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+
+from search.ranker import get_ranking_config, rerank_candidates, rerank_candidates_loop, score_candidates, top_k_indices
+
+SOURCES = ["nhk.or.jp", "apnews.com", "bbc.co.uk", "reuters.com", "example.com", None]
+LANGS = ["ja", "en", "zh", "ko", None]
+
+
+def make_rows(n, seed=0):
+    """Rows shaped like semantic_search candidates: (doc_id, title, published_at, genre, url, source, lang, dist)."""
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    rows = []
+    for i in range(n):
+        published = now - timedelta(seconds=rng.randint(0, 30 * 86400))
+        dist = None if rng.random() < 0.01 else round(rng.uniform(0.05, 0.9), 6)
+        rows.append((i, f"title {i}", published, None, f"https://example.com/{i}", rng.choice(SOURCES), rng.choice(LANGS), dist))
+    return rows
+
+
+def timeit(fn, runs):
+    lat = []
+    for _ in range(runs):
+        t = time.perf_counter()
+        fn()
+        lat.append((time.perf_counter() - t) * 1000.0)
+    lat.sort()
+    return round(lat[len(lat) // 2], 3)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--sizes", default="200,10000")
+    ap.add_argument("--limit", type=int, default=50)
+    ap.add_argument("--runs", type=int, default=20)
+    args = ap.parse_args()
+
+    cfg = get_ranking_config()
+    kw = dict(dist_index=7, published_index=2, source_index=5, language_index=6, limit=args.limit, config=cfg)
+    out = {"limit": args.limit, "weights": [cfg.alpha, cfg.beta, cfg.gamma, cfg.delta], "sizes": {}}
+    for n in [int(x) for x in args.sizes.split(",") if x.strip()]:
+        rows = make_rows(n)
+        now = datetime.now(timezone.utc)
+        loop_ids = [r[0] for r in rerank_candidates_loop(rows, now=now, **kw)]
+        scores = score_candidates(rows, dist_index=7, published_index=2, source_index=5, language_index=6, config=cfg, now=now)
+        vec_ids = [rows[i][0] for i in top_k_indices(scores, args.limit)]
+        full_loop = [r[0] for r in rerank_candidates_loop(rows, now=now, **dict(kw, limit=n))]
+        full_vec = [rows[i][0] for i in top_k_indices(scores, n)]
+        loop_ms = timeit(lambda: rerank_candidates_loop(rows, **kw), args.runs)
+        vec_ms = timeit(lambda: rerank_candidates(rows, **kw), args.runs)
+        out["sizes"][n] = {
+            "loop_p50_ms": loop_ms,
+            "vectorized_p50_ms": vec_ms,
+            "speedup": round(loop_ms / vec_ms, 1) if vec_ms else None,
+            "identical_top_k": loop_ids == vec_ids,
+            "identical_full_order": full_loop == full_vec,
+        }
+    print(json.dumps(out, indent=2))
+
+
+if __name__ == "__main__":
+    main()
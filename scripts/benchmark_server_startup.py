@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""Cold-start time of the MCP server: time to importable/serving vs. time until the embedding model is ready."""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Runs in a fresh interpreter per measurement so every run is a cold import
+_PROBE = r"""
+import json, time
+t0 = time.perf_counter()
+import mcp_news.server as s
+t1 = time.perf_counter()
+s._MODEL_LOADER.start()
+s._MODEL_LOADER.wait()
+t2 = time.perf_counter()
+err = s._MODEL_LOADER.error
+print(json.dumps({"import_s": t1 - t0, "model_ready_s": t2 - t0, "model_load_s": s._MODEL_LOADER.load_s,
+                  "ready": s._MODEL_LOADER.ready, "model": type(s._MODEL_LOADER.value).__name__,
+                  "error": repr(err) if err else None}))
+"""
+
+
+def pct(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(p / 100.0 * (len(values) - 1))))]
+
+
+def probe(env):
+    t = time.perf_counter()
+    out = subprocess.run([sys.executable, "-c", _PROBE], cwd=_ROOT, env=env, capture_output=True, text=True, check=True)
+    res = json.loads(out.stdout.strip().splitlines()[-1])
+    res["process_s"] = time.perf_counter() - t
+    return res
+
+
+def import_profile(env, top):
+    """Slowest modules by cumulative import time (python -X importtime)."""
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import mcp_news.server"], cwd=_ROOT, env=env, capture_output=True, text=True
+    )
+    rows = []
+    for line in out.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        # "import time:   self_us |   cumulative_us | [indent]module"
+        _, cum_us, name = line[len("import time:"):].split("|", 2)
+        rows.append((int(cum_us), name.strip()))
+    rows.sort(reverse=True)
+    return [{"module": n, "cumulative_ms": round(c / 1000.0, 1)} for c, n in rows[:top]]
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--runs", type=int, default=5)
+    ap.add_argument("--top", type=int, default=10, help="slowest imports to list (0: skip)")
+    args = ap.parse_args()
+
+    env = dict(os.environ)
+    env["PYTHONPATH"] = _ROOT + (os.pathsep + env["PYTHONPATH"] if env.get("PYTHONPATH") else "")
+    runs = [probe(env) for _ in range(max(1, args.runs))]
+    out = {
+        "runs": len(runs),
+        "ENABLE_SERVER_EMBEDDING": os.environ.get("ENABLE_SERVER_EMBEDDING"),
+        "EMBEDDING_SERVICE_URL": os.environ.get("EMBEDDING_SERVICE_URL"),
+        "model": runs[-1]["model"],
+        "ready": runs[-1]["ready"],
+        "error": runs[-1]["error"],
+    }
+    for key in ("process_s", "import_s", "model_ready_s"):
+        vals = [r[key] for r in runs]
+        out[f"{key}_p50"] = round(pct(vals, 50), 3)
+        out[f"{key}_max"] = round(max(vals), 3)
+    if args.top:
+        out["slowest_imports"] = import_profile(env, args.top)
+    print(json.dumps(out, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""Rank fusion in Python (rerank_candidates) vs. in SQL (search/sql_fusion.py): rows/bytes shipped, client CPU, latency."""
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import psycopg
+from pgvector.psycopg import register_vector
+
+# Allow `python scripts/benchmark_sql_fusion.py` to import repo packages
+_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+
+from embedding.vec_writer import write_vectors
+from ingest.bulk_writer import write_articles
+from ingest.normalize import make_row
+from search.ranker import get_ranking_config, rerank_candidates
+from search.sql_fusion import fused_search
+
+# Same candidate query as semantic_search / /api/search_sem
+PY_SQL = """
+SELECT d.doc_id, d.title_raw, d.published_at,
+       (SELECT val FROM hint WHERE doc_id=d.doc_id AND key='genre_hint') AS genre_hint,
+       d.url_canon, d.source, d.lang,
+       (v.emb <=> %s) AS dist
+FROM chunk_vec v
+JOIN chunk c ON c.chunk_id = v.chunk_id
+JOIN doc d   ON d.doc_id   = c.doc_id
+WHERE v.embedding_space = %s
+ORDER BY dist ASC
+LIMIT %s
+"""
+
+SOURCES = ["nhk.or.jp", "apnews.com", "bbc.co.uk", "reuters.com", "example.com"]
+
+
+def row_bytes(rows):
+    """Approximate result size: text length of every field (what the wire/protocol carries)."""
+    return sum(len(str(v).encode("utf-8")) for r in rows for v in r if v is not None)
+
+
+def seed(conn, space, n, dim):
+    rng = np.random.default_rng(0)
+    now = datetime.now(timezone.utc)
+    have = conn.execute("SELECT count(*) FROM chunk_vec WHERE embedding_space = %s", (space,)).fetchone()[0]
+    for start in range(have, n, 1000):
+        rows = [
+            make_row(
+                source=SOURCES[i % len(SOURCES)],
+                url=f"https://bench-fusion.example/{space}/{i}",
+                title=f"ベンチマーク用の見出し {i}: " + "金融政策と市場の反応について " * 3,
+                published=(now - timedelta(minutes=int(rng.integers(0, 60 * 24 * 30)))).isoformat(),
+                lang=["ja", "en"][i % 2],
+                genre_hint="economy",
+            )
+            for i in range(start, min(n, start + 1000))
+        ]
+        doc_ids = list(write_articles(conn, rows).values())
+        conn.commit()
+        ids = [r[0] for r in conn.execute("SELECT chunk_id FROM chunk WHERE doc_id = ANY(%s) ORDER BY chunk_id", (doc_ids,))]
+        write_vectors(conn, space, ids, rng.standard_normal((len(ids), dim)).astype(np.float32))
+    return conn.execute("SELECT count(*) FROM chunk_vec WHERE embedding_space = %s", (space,)).fetchone()[0]
+
+
+def measure(fn, runs):
+    wall, cpu, out = [], [], None
+    for _ in range(runs):
+        t, c = time.perf_counter(), time.process_time()
+        out = fn()
+        wall.append((time.perf_counter() - t) * 1000.0)
+        cpu.append((time.process_time() - c) * 1000.0)
+    wall.sort()
+    cpu.sort()
+    return out, round(wall[len(wall) // 2], 2), round(cpu[len(cpu) // 2], 3)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--dsn", default=os.environ.get("DATABASE_URL", "postgresql://localhost/newshub"))
+    ap.add_argument("--space", default="bench-fusion")
+    ap.add_argument("--seed", type=int, default=0, help="make sure the space holds this many synthetic vectors")
+    ap.add_argument("--dim", type=int, default=768)
+    ap.add_argument("--top-k", type=int, default=20)
+    ap.add_argument("--runs", type=int, default=30)
+    ap.add_argument("--hnsw", action="store_true", help="build a partial HNSW (cosine) index for the space, like production spaces have")
+    ap.add_argument("--cleanup", action="store_true", help="delete the synthetic docs/vectors (and --hnsw index) afterwards")
+    args = ap.parse_args()
+
+    # The servers open a connection per request, so statements are never prepared; mirror that
+    # (a prepared generic plan would not match the per-space partial HNSW index)
+    with psycopg.connect(args.dsn, prepare_threshold=None) as conn:
+        register_vector(conn)
+        n = seed(conn, args.space, args.seed, args.dim) if args.seed else None
+        index = "idx_bench_fusion_hnsw"
+        if args.hnsw:
+            conn.execute(
+                f"CREATE INDEX IF NOT EXISTS {index} ON chunk_vec USING hnsw (emb vector_cosine_ops) WHERE embedding_space = '{args.space}'"
+            )
+            conn.commit()
+        row = conn.execute("SELECT emb FROM chunk_vec WHERE embedding_space = %s LIMIT 1", (args.space,)).fetchone()
+        if not row:
+            raise SystemExit(f"no vectors in space {args.space!r} (use --seed N)")
+        emb = row[0].to_numpy() if hasattr(row[0], "to_numpy") else row[0]  # pgvector >= 0.3 returns Vector
+        qv = np.asarray(emb, dtype=np.float32)
+        cfg = get_ranking_config()
+        cand = min(200, max(args.top_k * 3 + 10, args.top_k))
+
+        def py_path():
+            rows = conn.execute(PY_SQL, (qv, args.space, cand)).fetchall()
+            top = rerank_candidates(rows, dist_index=7, published_index=2, source_index=5, language_index=6, limit=args.top_k, config=cfg)
+            return rows, top
+
+        def sql_path():
+            return fused_search(conn, qv, args.space, limit=args.top_k, cand=cand, config=cfg)
+
+        py_path(), sql_path()  # warm up
+        (py_rows, py_top), py_ms, py_cpu = measure(py_path, args.runs)
+        sql_top, sql_ms, sql_cpu = measure(sql_path, args.runs)
+        out = {
+            "space": args.space,
+            "vectors": n,
+            "hnsw": args.hnsw,
+            "top_k": args.top_k,
+            "candidates": cand,
+            "python": {"rows": len(py_rows), "bytes": row_bytes(py_rows), "p50_ms": py_ms, "client_cpu_ms": py_cpu},
+            "sql": {"rows": len(sql_top), "bytes": row_bytes(sql_top), "p50_ms": sql_ms, "client_cpu_ms": sql_cpu},
+            "same_doc_ids": [r[0] for r in py_top] == [r[0] for r in sql_top],
+        }
+        if args.cleanup:
+            conn.execute(f"DROP INDEX IF EXISTS {index}")
+            conn.execute("DELETE FROM chunk_vec WHERE embedding_space = %s", (args.space,))
+            conn.execute("DELETE FROM doc WHERE url_canon LIKE %s", (f"https://bench-fusion.example/{args.space}/%",))
+            conn.commit()
+    print(json.dumps(out, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""/api/search title lookup at scale: ILIKE + OFFSET (before) vs. trigram GIN + keyset pagination (after).
+
+Works on a scratch copy of the doc layout (``bench_doc``) so the real table is untouched.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+import psycopg
+
+# Allow `python scripts/benchmark_title_search.py` to import repo packages
+_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+
+from search.hybrid import like_pattern
+
+TABLE = "bench_doc"
+
+# Word frequencies roughly like news headlines: a few very common words, a long tail
+COMMON = ["政府", "市場", "発表", "東京", "米国", "中国", "経済", "選挙", "news", "market", "update", "report"]
+MEDIUM = ["日銀", "金融政策", "半導体", "inflation", "earthquake", "election", "為替", "決算", "AI", "tariff"]
+RARE = ["量子暗号", "超伝導", "quasar", "陽子線", "exoplanet", "蓄電池リサイクル"]
+
+QUERIES = ["政府", "日銀", "金融政策", "inflation", "量子暗号", "exoplanet", "zzqxnotfound"]
+
+BEFORE_SQL = f"""
+SELECT d.doc_id, d.title_raw, d.published_at, d.url_canon, d.source
+FROM {TABLE} d
+WHERE d.title_raw ILIKE %s
+ORDER BY d.published_at DESC
+LIMIT %s OFFSET %s
+"""
+
+AFTER_FIRST_SQL = f"""
+SELECT d.doc_id, d.title_raw, d.published_at, d.url_canon, d.source
+FROM {TABLE} d
+WHERE d.title_raw ILIKE %s
+ORDER BY d.published_at DESC, d.doc_id DESC
+LIMIT %s
+"""
+
+AFTER_NEXT_SQL = f"""
+SELECT d.doc_id, d.title_raw, d.published_at, d.url_canon, d.source
+FROM {TABLE} d
+WHERE d.title_raw ILIKE %s AND (d.published_at, d.doc_id) < (%s, %s)
+ORDER BY d.published_at DESC, d.doc_id DESC
+LIMIT %s
+"""
+
+
+def title(rng, i):
+    words = [rng.choice(COMMON) for _ in range(rng.randint(2, 4))]
+    if rng.random() < 0.08:
+        words.append(rng.choice(MEDIUM))
+    if rng.random() < 0.0005:
+        words.append(rng.choice(RARE))
+    rng.shuffle(words)
+    return " ".join(words) + f" のニュース {i}"
+
+
+def seed(conn, n):
+    conn.execute(f"DROP TABLE IF EXISTS {TABLE}")
+    conn.execute(
+        f"""CREATE TABLE {TABLE} (
+              doc_id BIGINT PRIMARY KEY, source TEXT NOT NULL, url_canon TEXT,
+              title_raw TEXT NOT NULL, published_at TIMESTAMPTZ NOT NULL)"""
+    )
+    rng = random.Random(0)
+    now = datetime.now(timezone.utc)
+    with conn.cursor().copy(f"COPY {TABLE} (doc_id, source, url_canon, title_raw, published_at) FROM STDIN") as cp:
+        for i in range(1, n + 1):
+            ts = now - timedelta(seconds=rng.randint(0, 2 * 365 * 86400))
+            cp.write_row((i, f"src{i % 50}", f"https://bench.example/{i}", title(rng, i), ts))
+    # what doc already has in production (schema_v2.sql)
+    conn.execute(f"CREATE INDEX ON {TABLE} (published_at DESC)")
+    conn.execute(f"ANALYZE {TABLE}")
+    conn.commit()
+
+
+def add_indexes(conn):
+    """Indexes from db/migrations/2026-10-18_doc_title_trgm.sql; returns whether the trigram index exists."""
+    trgm = conn.execute("SELECT 1 FROM pg_extension WHERE extname='pg_trgm'").fetchone() is not None
+    if not trgm:
+        try:
+            conn.execute("CREATE EXTENSION pg_trgm")
+            trgm = True
+        except psycopg.Error:
+            conn.rollback()
+    if trgm:
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {TABLE}_title_trgm ON {TABLE} USING gin (title_raw gin_trgm_ops)")
+    conn.execute(f"CREATE INDEX IF NOT EXISTS {TABLE}_published_doc_id ON {TABLE} (published_at DESC, doc_id DESC)")
+    conn.execute(f"ANALYZE {TABLE}")
+    conn.commit()
+    return trgm
+
+
+def plan(conn, sql, params):
+    """EXPLAIN ANALYZE text of one query, and the indexes it touched."""
+    lines = [r[0] for r in conn.execute("EXPLAIN (ANALYZE, COSTS OFF, TIMING OFF) " + sql, params)]
+    used = sorted({w for line in lines for w in line.replace("(", " ").split() if w.startswith(f"{TABLE}_") or w == f"{TABLE}_pkey"})
+    return lines, used
+
+
+def timed(conn, sql, params):
+    t = time.perf_counter()
+    rows = conn.execute(sql, params).fetchall()
+    return (time.perf_counter() - t) * 1000.0, rows
+
+
+def pct(values, p):
+    values = sorted(values)
+    return round(values[min(len(values) - 1, int(round(p / 100.0 * (len(values) - 1))))], 2)
+
+
+def summarize(lat):
+    return {"p50_ms": pct(lat, 50), "p95_ms": pct(lat, 95), "max_ms": round(max(lat), 2), "n": len(lat)}
+
+
+def run_before(conn, limit, page, runs):
+    lat = {}
+    for q in QUERIES:
+        pattern = f"%{q}%"
+        lat[q] = [timed(conn, BEFORE_SQL, (pattern, limit, page * limit))[0] for _ in range(runs)]
+    return lat
+
+
+def run_after(conn, limit, page, runs):
+    lat = {}
+    for q in QUERIES:
+        pattern = like_pattern(q)
+        if page == 0:
+            lat[q] = [timed(conn, AFTER_FIRST_SQL, (pattern, limit))[0] for _ in range(runs)]
+            continue
+        # cursor = last row of the previous page (not timed)
+        prev = conn.execute(AFTER_FIRST_SQL, (pattern, page * limit)).fetchall()
+        if not prev:
+            lat[q] = [timed(conn, AFTER_FIRST_SQL, (pattern, limit))[0] for _ in range(runs)]
+            continue
+        last = prev[-1]
+        lat[q] = [timed(conn, AFTER_NEXT_SQL, (pattern, last[2], last[0], limit))[0] for _ in range(runs)]
+    return lat
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--dsn", default=os.environ.get("DATABASE_URL", "postgresql://localhost/newshub"))
+    ap.add_argument("--rows", type=int, default=1_000_000)
+    ap.add_argument("--limit", type=int, default=50)
+    ap.add_argument("--pages", default="0,10", help="page numbers to measure (0 = first page)")
+    ap.add_argument("--runs", type=int, default=5, help="runs per query and page")
+    ap.add_argument("--reuse", action="store_true", help=f"reuse an existing {TABLE} instead of re-seeding")
+    ap.add_argument("--keep", action="store_true", help=f"keep {TABLE} afterwards")
+    ap.add_argument("--no-trgm", action="store_true", help="measure without pg_trgm (keyset/composite index only) instead of failing")
+    ap.add_argument("--explain", action="store_true", help="include the full EXPLAIN ANALYZE text of every page-1 query")
+    ap.add_argument("--out", help="also write the JSON result to this file")
+    args = ap.parse_args()
+
+    pages = [int(p) for p in args.pages.split(",") if p.strip()]
+    # The web app opens a connection per request, so statements are never prepared; mirror that
+    with psycopg.connect(args.dsn, prepare_threshold=None) as conn:
+        t = time.perf_counter()
+        if not args.reuse:
+            seed(conn, args.rows)
+        seed_s = round(time.perf_counter() - t, 1)
+        conn.execute(f"DROP INDEX IF EXISTS {TABLE}_title_trgm")
+        conn.execute(f"DROP INDEX IF EXISTS {TABLE}_published_doc_id")
+        conn.commit()
+        out = {
+            "server": conn.execute("SHOW server_version").fetchone()[0],
+            "rows": conn.execute(f"SELECT count(*) FROM {TABLE}").fetchone()[0],
+            "seed_s": seed_s,
+            "limit": args.limit,
+        }
+        out["matches"] = {q: conn.execute(f"SELECT count(*) FROM {TABLE} WHERE title_raw ILIKE %s", (f"%{q}%",)).fetchone()[0] for q in QUERIES}
+        before = {p: run_before(conn, args.limit, p, args.runs) for p in pages}
+        out["trgm_index"] = add_indexes(conn)
+        if not out["trgm_index"] and not args.no_trgm:
+            raise SystemExit("pg_trgm is not available: the 'after' numbers would not include the GIN index (use --no-trgm to measure anyway)")
+        # Which index answers each query: the trigram GIN (bitmap scan) or a backward walk of the ordered index
+        out["plans"] = {}
+        for q in QUERIES:
+            lines, used = plan(conn, AFTER_FIRST_SQL, (like_pattern(q), args.limit))
+            out["plans"][q] = {"indexes": used, **({"explain": lines} if args.explain else {})}
+        # The queries the GIN index is for: 3+ characters (a trigram), where the planner picked it
+        out["trgm_used_by"] = [q for q in QUERIES if f"{TABLE}_title_trgm" in out["plans"][q]["indexes"]]
+        after = {p: run_after(conn, args.limit, p, args.runs) for p in pages}
+        for label, res in (("before", before), ("after", after)):
+            out[label] = {}
+            for p, per_q in res.items():
+                out[label][f"page{p}"] = {
+                    "all": summarize([x for lat in per_q.values() for x in lat]),
+                    "per_query_p50_ms": {q: pct(lat, 50) for q, lat in per_q.items()},
+                }
+        if not args.keep:
+            conn.execute(f"DROP TABLE IF EXISTS {TABLE}")
+            conn.commit()
+    text = json.dumps(out, indent=2, ensure_ascii=False)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 import argparse
+import functools
 import os
 import sys
 from typing import List, Tuple
@@ -7,65 +8,118 @@ from typing import List, Tuple
 import psycopg
 from pgvector.psycopg import register_vector
 
-MODEL_NAME = os.environ.get("EMBEDDING_MODEL", "intfloat/multilingual-e5-base")
+# Allow `python scripts/embed_chunks.py` to import repo packages
+_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+
+from embedding.backends import backend_name, load_backend
+from embedding.models import MODEL_NAME, backend_encoder
+from embedding.pool import EmbedPool
+from embedding.scanner import EmbedCursor, PendingScanner, fetch_pending
+from embedding.worker import run_pipelined
+from mcp_news.metrics import serve_metrics
+
 _model = None
 
 
-def load_model():
+def load_model(backend=None):
     global _model
     if _model is None:
-        from sentence_transformers import SentenceTransformer
-        _model = SentenceTransformer(MODEL_NAME)
+        _model = load_backend(backend, MODEL_NAME)
     return _model
 
 
 def fetch_chunks(conn, space: str, limit: int) -> List[Tuple[int, str]]:
-    sql = (
-        """
-        SELECT c.chunk_id, c.text_raw
-        FROM chunk c
-        LEFT JOIN chunk_vec v ON (v.chunk_id = c.chunk_id AND v.embedding_space = %s)
-        WHERE v.chunk_id IS NULL
-        ORDER BY c.chunk_id ASC
-        LIMIT %s
-        """
-    )
-    return list(conn.execute(sql, (space, limit)))
+    return fetch_pending(conn, space, limit)
+
+
+def connect(dsn: str):
+    conn = psycopg.connect(dsn)
+    register_vector(conn)
+    conn.execute("SET TIME ZONE 'UTC'")
+    conn.commit()
+    return conn
 
 
 def main():
     ap = argparse.ArgumentParser(description="Embed chunks into chunk_vec (pgvector)")
     ap.add_argument("--space", required=True, help="embedding_space label (e.g., bge-m3/e5-multilingual)")
-    ap.add_argument("--batch", type=int, default=64)
+    ap.add_argument("--batch", type=int, default=64, help="fixed chunks per encode call when --token-budget is 0 (per worker)")
+    ap.add_argument("--token-budget", type=int, default=8192, help="padded tokens per encode call (per worker); 0: fixed --batch")
+    ap.add_argument("--max-batch", type=int, default=256, help="max texts per encode call with --token-budget (per worker)")
+    ap.add_argument("--window", type=int, default=1024, help="pending chunks sorted by length at once with --token-budget")
     ap.add_argument("--normalize", action="store_true", default=True, help="normalize embeddings (cosine) [required]")
+    ap.add_argument("--backend", default=backend_name(), help="sentence-transformers | onnx | onnx-int8 (env EMBEDDING_BACKEND)")
+    ap.add_argument("--workers", type=int, default=1, help="encoder processes (1: encode in-process)")
+    ap.add_argument("--threads", type=int, default=None, help="threads per encoder process (default: cores / workers)")
+    ap.add_argument("--prefetch", type=int, default=2, help="batches queued ahead of / behind the encoder")
+    ap.add_argument("--max-chunks", type=int, default=None, help="stop after this many chunks")
+    ap.add_argument("--lookback", type=int, default=10_000, help="re-scan this many chunk ids below the saved cursor")
+    ap.add_argument("--sweep-hours", type=float, default=24.0, help="full reconciliation sweep at most this often")
+    ap.add_argument("--sweep", action="store_true", help="force a full reconciliation sweep from chunk_id 0")
+    ap.add_argument("--no-cache", action="store_true", help="encode every chunk (skip the embed_cache lookup/fill)")
+    ap.add_argument("--no-cursor", action="store_true", help="scan from chunk_id 0 and do not persist the cursor")
+    ap.add_argument("--metrics-port", type=int, default=int(os.environ.get("EMBED_METRICS_PORT", "0")), help="serve /metrics while running (0: off)")
+    ap.add_argument("--metrics-addr", default=os.environ.get("EMBED_METRICS_ADDR", "127.0.0.1"))
     args = ap.parse_args()
 
     dsn = os.environ.get("DATABASE_URL", "postgresql://localhost/newshub")
-    model = load_model()
-
-    with psycopg.connect(dsn) as conn:
-        register_vector(conn)
-        conn.execute("SET TIME ZONE 'UTC'")
-        while True:
-            rows = fetch_chunks(conn, args.space, args.batch)
-            if not rows:
-                print("[✓] no pending chunks")
-                break
-            ids = [r[0] for r in rows]
-            texts = [r[1] for r in rows]
-            embs = model.encode(texts, normalize_embeddings=bool(args.normalize))
-            dim = len(embs[0]) if len(embs) else 0
-            with conn.transaction():
-                for cid, vec in zip(ids, embs):
-                    conn.execute(
-                        """
-                        INSERT INTO chunk_vec (chunk_id, embedding_space, dim, emb)
-                        VALUES (%s, %s, %s, %s)
-                        ON CONFLICT (chunk_id, embedding_space) DO NOTHING
-                        """,
-                        (cid, args.space, dim, list(map(float, vec))),
-                    )
-            print(f"[+] inserted: {len(ids)} (space={args.space}, dim={dim})")
+    if args.metrics_port and serve_metrics(args.metrics_port, args.metrics_addr):
+        print(f"[+] metrics on http://{args.metrics_addr}:{args.metrics_port}/metrics")
+
+    use_cache = not args.no_cache
+    if use_cache:
+        with connect(dsn) as conn:
+            if conn.execute("SELECT to_regclass('embed_cache')").fetchone()[0] is None:
+                print("[!] embed_cache table missing (apply db/migrations/2026-10-18_embed_cache.sql); cache disabled")
+                use_cache = False
+
+    pool = None
+    if args.workers > 1:
+        factory = functools.partial(backend_encoder, args.backend, MODEL_NAME, bool(args.normalize))
+        pool = EmbedPool(factory, args.workers, threads=args.threads)
+        print(f"[+] encoder pool: {pool.n} workers x {pool.threads} threads (dim={pool.dim})")
+        encode = pool.encode
+    else:
+        model = load_model(args.backend)
+
+        def encode(texts):
+            return model.encode(texts, normalize_embeddings=bool(args.normalize))
+
+    scanner = PendingScanner(
+        args.space,
+        cursor=None if args.no_cursor else EmbedCursor(),
+        lookback=args.lookback,
+        sweep_interval=args.sweep_hours * 3600.0,
+        sweep=True if args.sweep else None,
+    )
+    if scanner.sweeping:
+        print(f"[+] reconciliation sweep (space={args.space})")
+    try:
+        stats = run_pipelined(
+            lambda: connect(dsn),
+            encode,
+            args.space,
+            batch=args.batch * max(1, args.workers),
+            token_budget=args.token_budget * max(1, args.workers) or None,
+            max_batch=args.max_batch * max(1, args.workers),
+            window=max(args.window, args.max_batch * max(1, args.workers)),
+            prefetch=args.prefetch,
+            max_chunks=args.max_chunks,
+            scanner=scanner,
+            cache=use_cache,
+        )
+    finally:
+        if pool is not None:
+            pool.close()
+    if not stats["chunks"] and not stats["cached"]:
+        print("[✓] no pending chunks")
+    else:
+        print(
+            f"[✓] embedded {stats['chunks']} chunks in {stats['elapsed_s']:.1f}s "
+            f"({stats['chunks_per_s']:.1f} chunks/s, encode {stats['encode_s']:.1f}s, cached {stats['cached']})"
+        )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""Local query-embedding service: one model per host, micro-batched over a Unix socket or loopback port."""
+import argparse
+import os
+import sys
+
+# Allow `python scripts/embed_service.py` to import repo packages
+_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+
+from embedding.backends import backend_name, load_backend
+from embedding.models import MODEL_NAME, HashingEncoder
+from embedding.service import create_app
+
+
+class _HashingModel:
+    """Model-free stand-in (--hashing) for exercising the service without a model."""
+
+    name = "hashing"
+    model_name = None
+
+    def __init__(self, dim: int):
+        self.dim = dim
+        self._encode = HashingEncoder(dim)
+
+    def encode(self, texts, normalize_embeddings=True, **kw):
+        return self._encode(list(texts))
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--uds", default=None, help="Unix socket path (e.g. /run/mcp-news/embed.sock)")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=3012)
+    ap.add_argument("--backend", default=None, help="sentence-transformers | onnx | onnx-int8 (default: EMBEDDING_BACKEND)")
+    ap.add_argument("--model", default=MODEL_NAME)
+    ap.add_argument("--max-batch", type=int, default=32, help="texts per coalesced inference pass")
+    ap.add_argument("--max-wait-ms", type=float, default=5.0, help="how long the first request waits for company")
+    ap.add_argument("--hashing", type=int, default=0, metavar="DIM", help="serve the model-free hashing encoder (testing)")
+    args = ap.parse_args()
+
+    import uvicorn
+
+    if args.hashing:
+        model = _HashingModel(args.hashing)
+    else:
+        print(f"[+] loading {args.model} ({args.backend or backend_name()})")
+        model = load_backend(args.backend, args.model)
+    app = create_app(model, max_batch=args.max_batch, max_wait_ms=args.max_wait_ms)
+    if args.uds:
+        if os.path.exists(args.uds):
+            os.unlink(args.uds)  # stale socket from a previous run
+        print(f"[+] embedding service on unix:{args.uds}")
+        uvicorn.run(app, uds=args.uds, log_level="warning")
+    else:
+        print(f"[+] embedding service on http://{args.host}:{args.port}")
+        uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+import argparse
+import asyncio
+import os
+import sys
+
+import psycopg
+
+# Allow `python scripts/fetch_bodies.py` to import repo packages
+_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+
+from ingest.bodies import run_bodies
+from ingest.fetch import make_async_client, make_parse_pool
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Fetch article bodies and write overlapping body chunks (part_ix>=1)")
+    ap.add_argument("--batch", type=int, default=200, help="docs per fetch/write batch")
+    ap.add_argument("--max-docs", type=int, default=2000, help="max docs per run")
+    ap.add_argument("--days", type=int, default=7, help="only docs published within N days")
+    ap.add_argument("--source", action="append", default=None, help="only docs from this source (repeatable)")
+    ap.add_argument("--max-attempts", type=int, default=3, help="retries for transient failures")
+    ap.add_argument("--concurrency", type=int, default=16, help="max pages downloaded at once")
+    ap.add_argument("--per-host", type=int, default=1, help="max concurrent requests per host")
+    ap.add_argument("--host-rate", type=float, default=1.0, help="max requests per second per host")
+    ap.add_argument("--timeout", type=float, default=20.0, help="per-page timeout in seconds")
+    ap.add_argument("--max-tokens", type=int, default=256, help="tokens per chunk window (word/CJK-character estimate; the model sees more)")
+    ap.add_argument("--overlap", type=int, default=32, help="tokens shared by consecutive windows")
+    ap.add_argument("--parse-workers", type=int, default=min(4, os.cpu_count() or 1), help="extractor processes (<=1: in-process)")
+    args = ap.parse_args()
+
+    dsn = os.environ.get("DATABASE_URL", "postgresql://localhost/newshub")
+    pool = make_parse_pool(args.parse_workers)
+
+    async def run(conn):
+        async with make_async_client(timeout=args.timeout, max_connections=args.concurrency) as client:
+            return await run_bodies(
+                conn,
+                client,
+                batch=args.batch,
+                max_docs=args.max_docs,
+                days=args.days,
+                max_attempts=args.max_attempts,
+                sources=args.source,
+                concurrency=args.concurrency,
+                per_host=args.per_host,
+                host_rate=args.host_rate,
+                timeout=args.timeout,
+                max_tokens=args.max_tokens,
+                overlap=args.overlap,
+                pool=pool,
+            )
+
+    try:
+        with psycopg.connect(dsn) as conn:
+            stats = asyncio.run(run(conn))
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    rest = ", ".join(f"{k}={v}" for k, v in sorted(stats.items()) if k not in ("docs", "chunks", "elapsed_ms"))
+    print(f"[✓] bodies: {stats.get('docs', 0)} docs, {stats.get('chunks', 0)} chunks ({rest}) ({stats.get('elapsed_ms', 0)} ms)")
+
+
+if __name__ == "__main__":
+    main()
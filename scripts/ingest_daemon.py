@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+import argparse
+import asyncio
+import json
+import os
+import signal
+import sys
+
+try:
+    from psycopg_pool import ConnectionPool  # type: ignore
+except Exception:  # pragma: no cover
+    ConnectionPool = None  # type: ignore
+
+# Allow `python scripts/ingest_daemon.py` to import repo packages
+_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+
+from ingest.dedup import DedupFilter
+from ingest.fetch import make_async_client, make_parse_pool
+from ingest.http_cache import ValidatorCache
+from ingest.scheduler import FeedScheduler, run_daemon
+from ingest.sources import RssSource
+from ingest.state import HighWaterMarks
+from mcp_news.metrics import serve_metrics
+
+
+def load_feeds(path: str):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _configure(conn) -> None:
+    conn.execute("SET TIME ZONE 'UTC'")
+    conn.commit()
+
+
+async def amain(args) -> None:
+    feeds = load_feeds(args.feeds)
+    scheduler = FeedScheduler(
+        feeds,
+        min_interval=args.min_interval,
+        max_interval=args.max_interval,
+        default_interval=args.default_interval,
+    )
+    cache = None if args.no_cache else ValidatorCache()
+    marks = None if args.full else HighWaterMarks()
+
+    def make_source(due):
+        return RssSource(
+            due,
+            default_source=args.source,
+            genre_hint=args.genre_hint,
+            cache=cache,
+            concurrency=args.concurrency,
+            per_host=args.per_host,
+            timeout=args.timeout,
+            marks=marks,
+        )
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except NotImplementedError:  # pragma: no cover
+            pass
+
+    dsn = os.environ.get("DATABASE_URL", "postgresql://localhost/newshub")
+    parse_pool = make_parse_pool(args.parse_workers)
+    pool = ConnectionPool(dsn, min_size=1, max_size=args.pool_size, configure=_configure, open=True)
+    try:
+        dedup = None
+        if not args.no_dedup:
+            with pool.connection() as conn:
+                dedup = DedupFilter.open(conn)
+        async with make_async_client(timeout=args.timeout, max_connections=args.concurrency) as client:
+            print(f"[+] ingest daemon: {len(scheduler.feeds)} feeds")
+            await run_daemon(
+                scheduler,
+                pool,
+                make_source=make_source,
+                client=client,
+                dedup=dedup,
+                stop=stop,
+                parse_workers=max(1, args.parse_workers),
+                parse_pool=parse_pool,
+                batch_size=args.batch,
+                timeout=args.timeout,
+            )
+    finally:
+        pool.close()
+        if parse_pool is not None:
+            parse_pool.shutdown()
+        scheduler.save()
+    print("[✓] ingest daemon stopped")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Resident RSS ingest with adaptive per-feed polling")
+    ap.add_argument("--feeds", required=True, help="feeds.json path")
+    ap.add_argument("--source", default="RSS", help="source name")
+    ap.add_argument("--genre_hint", default=None, help="hint code (e.g., medtop:04000000)")
+    ap.add_argument("--concurrency", type=int, default=16, help="max feeds downloaded at once")
+    ap.add_argument("--per-host", type=int, default=2, help="max concurrent requests per host")
+    ap.add_argument("--timeout", type=float, default=20.0, help="per-feed timeout in seconds")
+    ap.add_argument("--parse-workers", type=int, default=min(4, os.cpu_count() or 1), help="parser processes (<=1: in-process)")
+    ap.add_argument("--batch", type=int, default=500, help="articles per COPY batch")
+    ap.add_argument("--min-interval", type=float, default=120.0, help="fastest polling interval per feed (seconds)")
+    ap.add_argument("--max-interval", type=float, default=6 * 3600.0, help="slowest polling interval per feed (seconds)")
+    ap.add_argument("--default-interval", type=float, default=900.0, help="interval before a feed's rate is known")
+    ap.add_argument("--pool-size", type=int, default=4, help="max DB connections")
+    ap.add_argument("--metrics-port", type=int, default=int(os.environ.get("INGEST_METRICS_PORT", "9311")), help="0 disables /metrics")
+    ap.add_argument("--metrics-addr", default=os.environ.get("INGEST_METRICS_ADDR", "127.0.0.1"))
+    ap.add_argument("--full", action="store_true", help="parse whole feeds (ignore per-feed high-water marks)")
+    ap.add_argument("--no-cache", action="store_true", help="ignore ETag/Last-Modified cache (always download)")
+    ap.add_argument("--no-dedup", action="store_true", help="send every parsed item to the DB (skip the known-doc filter)")
+    args = ap.parse_args()
+
+    if ConnectionPool is None:
+        print("[!] psycopg_pool is required: pip install 'psycopg[pool]'")
+        sys.exit(2)
+    if args.metrics_port and serve_metrics(args.metrics_port, args.metrics_addr):
+        print(f"[+] metrics on http://{args.metrics_addr}:{args.metrics_port}/metrics")
+    asyncio.run(amain(args))
+
+
+if __name__ == "__main__":
+    main()
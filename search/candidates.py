@@ -0,0 +1,66 @@
+"""
+Vector candidates, one row per document.
+
+A doc has a vector per chunk: the feed snippet (part_ix=0) and, once the
+body stage ran, its body windows (part_ix=1..N). Ranking chunks directly
+lets one article take several top-k slots, so every vector search reads
+the nearest chunks from the HNSW index and keeps the best chunk per doc
+before reranking / LIMIT:
+
+    hits  nearest ``chunks`` chunks (ORDER BY dist LIMIT: the index path)
+    best  DISTINCT ON (doc_id) -> min distance per doc
+
+BEST_CHUNK_SQL is shared by semantic_search, /api/search_sem, the SQL
+fusion CTE and the hybrid vector retriever. Parameters are named
+(%(q)s, %(space)s, %(chunks)s, %(since)s) and ``{since_cond}`` is filled
+with since_cond().
+"""
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+
+# Chunks read per wanted doc, so docs with many body chunks do not starve the candidate set
+CHUNKS_PER_DOC = 3
+
+BEST_CHUNK_SQL = """
+    SELECT DISTINCT ON (hits.doc_id) hits.doc_id, hits.dist
+    FROM (
+        SELECT c.doc_id, (v.emb <=> %(q)s) AS dist
+        FROM chunk_vec v
+        JOIN chunk c ON c.chunk_id = v.chunk_id
+        JOIN doc d   ON d.doc_id   = c.doc_id
+        WHERE v.embedding_space = %(space)s {since_cond}
+        ORDER BY dist ASC
+        LIMIT %(chunks)s
+    ) hits
+    ORDER BY hits.doc_id, hits.dist
+"""
+
+CANDIDATE_SQL = f"""
+    SELECT d.doc_id, d.title_raw, d.published_at,
+           (SELECT val FROM hint WHERE doc_id=d.doc_id AND key='genre_hint') AS genre_hint,
+           d.url_canon, d.source, d.lang, best.dist
+    FROM ({BEST_CHUNK_SQL}) best
+    JOIN doc d ON d.doc_id = best.doc_id
+    ORDER BY best.dist ASC, best.doc_id
+    LIMIT %(n)s OFFSET %(offset)s
+"""
+
+
+def since_cond(since: Optional[datetime]) -> str:
+    return "AND d.published_at >= %(since)s" if since is not None else ""
+
+
+def chunk_limit(n: int, offset: int = 0) -> int:
+    """Chunks to read from the index for ``n`` docs after ``offset`` docs."""
+    return (n + offset) * CHUNKS_PER_DOC
+
+
+def semantic_candidates(
+    conn, qv: Any, space: str, *, n: int, offset: int = 0, since: Optional[datetime] = None
+) -> List[Tuple[Any, ...]]:
+    """Nearest docs, best chunk each: (doc_id, title_raw, published_at, genre_hint, url_canon, source, lang, dist)."""
+    params = {"q": qv, "space": space, "chunks": chunk_limit(n, offset), "n": n, "offset": offset, "since": since}
+    # Not prepared: a generic plan cannot use the per-space partial HNSW indexes
+    return conn.execute(CANDIDATE_SQL.format(since_cond=since_cond(since)), params, prepare=False).fetchall()
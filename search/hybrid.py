@@ -0,0 +1,172 @@
+"""
+Hybrid lexical + vector search with reciprocal rank fusion (RRF).
+
+Two retrievers run concurrently, each on its own connection (the lexical
+one on a helper thread owned by the request, the vector one in the caller's
+thread, so concurrent requests never queue behind each other):
+
+    lexical  title match, best available backend:
+             pgroonga (&@~)  >  pg_trgm word similarity (<%)  >  ILIKE
+    vector   HNSW cosine candidates from chunk_vec (best chunk per doc)
+
+Their doc rankings are fused with RRF, score(d) = sum 1 / (k + rank_i(d)),
+which needs no score calibration between retrievers. The fused top
+candidates are hydrated and passed through rerank_candidates, with the RRF
+score (scaled to [0, 1]) standing in for the cosine term, so recency and
+source/language trust weighting stay exactly as in semantic_search.
+A missing query vector (no model) or a failing retriever degrades to the
+other ranking alone.
+"""
+from __future__ import annotations
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .candidates import BEST_CHUNK_SQL, chunk_limit, since_cond
+from .ranker import RankingConfig, rerank_candidates
+
+RRF_K = 60
+LEXICAL_BACKENDS = ("pgroonga", "trgm", "ilike")
+
+logger = logging.getLogger(__name__)
+
+_backend_cache: Dict[str, str] = {}
+
+LEXICAL_SQL = {
+    "pgroonga": """
+        SELECT d.doc_id FROM doc d
+        WHERE d.title_raw &@~ %(q)s {since_cond}
+        ORDER BY d.published_at DESC, d.doc_id DESC
+        LIMIT %(n)s
+    """,
+    "trgm": """
+        SELECT d.doc_id FROM doc d
+        WHERE %(q)s <%% d.title_raw {since_cond}
+        ORDER BY word_similarity(%(q)s, d.title_raw) DESC, d.published_at DESC, d.doc_id DESC
+        LIMIT %(n)s
+    """,
+    "ilike": """
+        SELECT d.doc_id FROM doc d
+        WHERE d.title_raw ILIKE %(pattern)s {since_cond}
+        ORDER BY d.published_at DESC, d.doc_id DESC
+        LIMIT %(n)s
+    """,
+}
+
+VECTOR_SQL = f"""
+    SELECT best.doc_id, best.dist
+    FROM ({BEST_CHUNK_SQL}) best
+    ORDER BY best.dist ASC, best.doc_id
+    LIMIT %(n)s
+"""
+
+HYDRATE_SQL = """
+    SELECT d.doc_id, d.title_raw, d.published_at,
+           (SELECT val FROM hint WHERE doc_id=d.doc_id AND key='genre_hint') AS genre_hint,
+           d.url_canon, d.source, d.lang
+    FROM doc d
+    WHERE d.doc_id = ANY(%s)
+"""
+
+
+def like_pattern(q: str) -> str:
+    escaped = q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def lexical_backend(conn) -> str:
+    """Best installed lexical backend (cached per DSN)."""
+    key = conn.info.dsn
+    if key not in _backend_cache:
+        installed = {r[0] for r in conn.execute("SELECT extname FROM pg_extension WHERE extname IN ('pgroonga', 'pg_trgm')")}
+        _backend_cache[key] = "pgroonga" if "pgroonga" in installed else "trgm" if "pg_trgm" in installed else "ilike"
+    return _backend_cache[key]
+
+
+def lexical_candidates(conn, q: str, *, n: int, since: Optional[datetime] = None, backend: Optional[str] = None) -> List[int]:
+    """Doc ids whose title matches ``q``, best first."""
+    backend = backend or lexical_backend(conn)
+    params = {"q": q, "pattern": like_pattern(q), "n": n, "since": since}
+    rows = conn.execute(LEXICAL_SQL[backend].format(since_cond=since_cond(since)), params, prepare=False)
+    return [r[0] for r in rows]
+
+
+def vector_candidates(conn, qv: Any, space: str, *, n: int, since: Optional[datetime] = None) -> List[Tuple[int, float]]:
+    """(doc_id, cosine distance) of the nearest docs, best chunk per doc, best first."""
+    params = {"q": qv, "space": space, "chunks": chunk_limit(n), "n": n, "since": since}
+    # Not prepared: a generic plan cannot use the per-space partial HNSW indexes
+    rows = conn.execute(VECTOR_SQL.format(since_cond=since_cond(since)), params, prepare=False)
+    return [(doc_id, float(dist)) for doc_id, dist in rows]
+
+
+def rrf(rankings: Sequence[Sequence[int]], k: int = RRF_K) -> List[Tuple[int, float]]:
+    """Reciprocal rank fusion of best-first id lists -> [(id, score)] best first (ties: first seen)."""
+    scores: Dict[int, float] = {}
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking, start=1):
+            scores[doc_id] = scores.get(doc_id, 0.0) + 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda kv: kv[1], reverse=True)
+
+
+def _run(connect: Callable[[], Any], fn: Callable[..., Any], *args, **kw):
+    with connect() as conn:
+        return fn(conn, *args, **kw)
+
+
+def _run_retrievers(jobs: Dict[str, Callable[[], List[int]]]) -> List[Optional[List[int]]]:
+    """Run the retrievers of one request concurrently; a failing one yields None."""
+    def call(name, job):
+        try:
+            return job()
+        except Exception:
+            logger.exception("hybrid_search: %s retriever failed", name)
+            return None
+
+    items = list(jobs.items())
+    if len(items) < 2:
+        return [call(name, job) for name, job in items]
+    # Per request rather than a shared pool: a process-wide pool makes concurrent requests wait on each other
+    with ThreadPoolExecutor(max_workers=len(items) - 1, thread_name_prefix="hybrid") as ex:
+        futs = [ex.submit(call, name, job) for name, job in items[:-1]]
+        last = call(*items[-1])
+        return [f.result() for f in futs] + [last]
+
+
+def hybrid_search(
+    connect: Callable[[], Any],
+    q: str,
+    qv: Any,
+    space: str,
+    *,
+    limit: int,
+    since: Optional[datetime] = None,
+    cand: Optional[int] = None,
+    k: int = RRF_K,
+    config: Optional[RankingConfig] = None,
+) -> List[Tuple[Any, ...]]:
+    """Fused rows (doc_id, title_raw, published_at, genre_hint, url_canon, source, lang, dist).
+
+    ``connect`` opens a new DB connection (one per retriever); ``qv`` may be None for lexical-only.
+    ``dist`` is 1 - (RRF score / best RRF score), i.e. 0 for the best fused hit.
+    """
+    cand = cand or min(200, max(limit * 3 + 10, limit))
+    jobs = {}
+    if q and q.strip():
+        jobs["lexical"] = lambda: _run(connect, lexical_candidates, q.strip(), n=cand, since=since)
+    if qv is not None:
+        jobs["vector"] = lambda: [r[0] for r in _run(connect, vector_candidates, qv, space, n=cand, since=since)]
+    rankings = [r for r in _run_retrievers(jobs) if r is not None]
+    fused = rrf(rankings, k)[:cand]
+    if not fused:
+        return []
+    best = fused[0][1]
+    dist = {doc_id: 1.0 - score / best for doc_id, score in fused}
+    with connect() as conn:
+        rows = conn.execute(HYDRATE_SQL, ([doc_id for doc_id, _ in fused],)).fetchall()
+    order = {doc_id: i for i, (doc_id, _) in enumerate(fused)}
+    rows = sorted((tuple(r) + (dist[r[0]],) for r in rows), key=lambda r: order[r[0]])
+    return rerank_candidates(
+        rows, dist_index=7, published_index=2, source_index=5, language_index=6, limit=limit, config=config
+    )
@@ -2,19 +2,25 @@ from __future__ import annotations
 
 import json
 import os
+import signal
+import threading
+import time
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 try:
     import yaml
 except ImportError:
     yaml = None
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
 try:
     import tomllib  # Python 3.11+
 except Exception:  # pragma: no cover
     tomllib = None
-import json
 
 
 def env_float(name: str, default: float) -> float:
@@ -24,9 +30,18 @@ def env_float(name: str, default: float) -> float:
         return default
 
 
+CONFIG_DIR = Path(__file__).parent.parent / "config"
+# Files and environment variables a RankingConfig is compiled from
+CONFIG_FILES = ("ranking.yaml", "ranking.toml", "ranking.json")
+CONFIG_ENV = (
+    "RANK_ALPHA", "RANK_BETA", "RANK_GAMMA", "RANK_DELTA", "RECENCY_HALFLIFE_HOURS",
+    "SOURCE_TRUST_DEFAULT", "LANGUAGE_TRUST_DEFAULT", "SOURCE_TRUST_JSON",
+)
+
+
 def load_ranking_config() -> Dict[str, Any]:
     """Load ranking configuration from YAML file with fallback to defaults."""
-    config_path = Path(__file__).parent.parent / "config" / "ranking.yaml"
+    config_path = CONFIG_DIR / "ranking.yaml"
     
     # Default configuration
     defaults = {
@@ -73,7 +88,7 @@ def load_rank_fusion_overrides() -> Dict[str, Any]:
     Returns dict with keys: alpha, beta, gamma, half_life_hours when available.
     """
     cfg: Dict[str, Any] = {}
-    base = Path(__file__).parent.parent / "config"
+    base = CONFIG_DIR
     # TOML takes precedence over JSON
     toml_path = base / "ranking.toml"
     if tomllib is not None and toml_path.exists():
@@ -99,9 +114,9 @@ def load_rank_fusion_overrides() -> Dict[str, Any]:
     return cfg
 
 
-def load_source_trust() -> Dict[str, float]:
+def load_source_trust(config: Optional[Dict[str, Any]] = None) -> Dict[str, float]:
     """Load source trust configuration from YAML config or environment fallback."""
-    config = load_ranking_config()
+    config = config if config is not None else load_ranking_config()
     trust_config = config["source_trust"]
     
     # Convert to float values, excluding 'default' key
@@ -130,9 +145,9 @@ def load_source_trust() -> Dict[str, float]:
     return result
 
 
-def load_language_trust() -> Dict[str, float]:
+def load_language_trust(config: Optional[Dict[str, Any]] = None) -> Dict[str, float]:
     """Load language trust configuration from YAML config."""
-    config = load_ranking_config()
+    config = config if config is not None else load_ranking_config()
     trust_config = config.get("language_trust", {})
     result: Dict[str, float] = {}
     for k, v in trust_config.items():
@@ -144,10 +159,138 @@ def load_language_trust() -> Dict[str, float]:
     return result
 
 
-def recency_decay(published_at: datetime, halflife_h: float) -> float:
+class RankingConfig:
+    """Rank fusion settings compiled once from config/ranking.* and the environment.
+
+    Weights are normalized to sum to 1; env variables (RANK_*, RECENCY_HALFLIFE_HOURS,
+    *_TRUST_DEFAULT, SOURCE_TRUST_JSON) are already applied.
+    """
+
+    def __init__(
+        self,
+        *,
+        alpha: float,
+        beta: float,
+        gamma: float,
+        delta: float,
+        half_life_hours: float,
+        source_trust: Dict[str, float],
+        source_default: float,
+        language_trust: Dict[str, float],
+        language_default: float,
+    ):
+        ssum = alpha + beta + gamma + delta
+        if ssum <= 0:
+            alpha, beta, gamma, delta = 1.0, 0.0, 0.0, 0.0
+            ssum = 1.0
+        self.alpha = alpha / ssum
+        self.beta = beta / ssum
+        self.gamma = gamma / ssum
+        self.delta = delta / ssum
+        self.half_life_hours = half_life_hours
+        self.source_trust = source_trust
+        self.source_default = source_default
+        self.language_trust = language_trust
+        self.language_default = language_default
+
+    @classmethod
+    def load(cls) -> "RankingConfig":
+        """Parse config/ranking.yaml + ranking.toml/json and resolve env overrides."""
+        config = load_ranking_config()
+        weights = config["score_weights"]
+        # Optional: TOML/JSON overrides for rank fusion weights
+        overrides = load_rank_fusion_overrides()
+        a0 = overrides.get("alpha", weights.get("cosine", 0.7))
+        b0 = overrides.get("beta", weights.get("recency", 0.2))
+        g0 = overrides.get("gamma", weights.get("source_trust", 0.1))
+        hl0 = overrides.get("half_life_hours", config["recency_half_life_hours"])
+        # Environment variables take precedence for backward compatibility
+        return cls(
+            alpha=env_float("RANK_ALPHA", a0),
+            beta=env_float("RANK_BETA", b0),
+            gamma=env_float("RANK_GAMMA", g0),
+            delta=env_float("RANK_DELTA", weights.get("language", 0.0)),
+            half_life_hours=env_float("RECENCY_HALFLIFE_HOURS", hl0),
+            source_trust=load_source_trust(config),
+            source_default=env_float("SOURCE_TRUST_DEFAULT", config["source_trust"]["default"]),
+            language_trust=load_language_trust(config),
+            language_default=env_float("LANGUAGE_TRUST_DEFAULT", config["language_trust"].get("default", 0.0)),
+        )
+
+
+def _config_mtimes() -> Tuple[Optional[int], ...]:
+    out = []
+    for name in CONFIG_FILES:
+        try:
+            out.append((CONFIG_DIR / name).stat().st_mtime_ns)
+        except OSError:
+            out.append(None)
+    return tuple(out)
+
+
+def _config_env() -> Tuple[Optional[str], ...]:
+    return tuple(os.environ.get(k) for k in CONFIG_ENV)
+
+
+class _ConfigCache:
+    """Current RankingConfig; files are re-stat'ed at most every ``check_interval`` seconds."""
+
+    def __init__(self, check_interval: float = 1.0):
+        self.check_interval = check_interval
+        self.config: Optional[RankingConfig] = None
+        self.mtimes: Tuple[Optional[int], ...] = ()
+        self.env: Tuple[Optional[str], ...] = ()
+        self.checked_at = 0.0
+        self.stale = False
+        self.loads = 0
+        self.lock = threading.Lock()
+
+    def get(self) -> RankingConfig:
+        env = _config_env()
+        now = time.monotonic()
+        cfg = self.config
+        if cfg is not None and not self.stale and env == self.env and now - self.checked_at < self.check_interval:
+            return cfg
+        with self.lock:
+            mtimes = _config_mtimes()
+            self.checked_at = now
+            if self.config is None or self.stale or env != self.env or mtimes != self.mtimes:
+                self.stale = False
+                self.config = RankingConfig.load()
+                self.mtimes, self.env = mtimes, env
+                self.loads += 1
+            return self.config
+
+
+_CACHE = _ConfigCache(env_float("RANKING_CONFIG_CHECK_SECONDS", 1.0))
+
+
+def get_ranking_config() -> RankingConfig:
+    """Cached RankingConfig, recompiled when config files or RANK_* env change."""
+    return _CACHE.get()
+
+
+def reload_ranking_config() -> None:
+    """Force a recompile on the next get_ranking_config()."""
+    _CACHE.stale = True
+
+
+def install_reload_signal(signum: int = getattr(signal, "SIGHUP", 0)) -> bool:
+    """Reload ranking config on ``signum`` (default SIGHUP). Must be called from the main thread."""
+    if not signum:
+        return False
+    try:
+        signal.signal(signum, lambda *_: reload_ranking_config())
+        return True
+    except (ValueError, OSError):  # not the main thread / unsupported platform
+        return False
+
+
+def recency_decay(published_at: datetime, halflife_h: float, now: Optional[datetime] = None) -> float:
     try:
         dt = published_at.astimezone(timezone.utc)
-        age_h = max(0.0, (datetime.now(timezone.utc) - dt).total_seconds() / 3600.0)
+        now = now if now is not None else datetime.now(timezone.utc)
+        age_h = max(0.0, (now - dt).total_seconds() / 3600.0)
         if halflife_h <= 0:
             return 0.0
         return 0.5 ** (age_h / halflife_h)
@@ -155,6 +298,73 @@ def recency_decay(published_at: datetime, halflife_h: float) -> float:
         return 0.0
 
 
+def _timestamp(value: Any) -> float:
+    try:
+        return value.timestamp()
+    except Exception:
+        return float("nan")
+
+
+def score_candidates(
+    rows: List[Tuple[Any, ...]],
+    *,
+    dist_index: int,
+    published_index: int,
+    source_index: int,
+    language_index: int | None = None,
+    config: Optional[RankingConfig] = None,
+    now: Optional[datetime] = None,
+) -> "np.ndarray":
+    """Fused scores for ``rows`` as one float64 array (same formula as the per-row loop).
+
+    Fields are pulled out of the rows once; cosine, recency and trust terms are then
+    computed on whole arrays against a single reference ``now``.
+    """
+    cfg = config if config is not None else get_ranking_config()
+    n = len(rows)
+    now_ts = (now if now is not None else datetime.now(timezone.utc)).timestamp()
+
+    dist = np.fromiter((1.0 if r[dist_index] is None else r[dist_index] for r in rows), dtype=np.float64, count=n)
+    cos_sim = 1.0 - np.clip(np.nan_to_num(dist, nan=1.0), 0.0, 1.0)
+
+    rec = np.zeros(n)
+    if cfg.half_life_hours > 0:
+        ts = np.fromiter((_timestamp(r[published_index]) for r in rows), dtype=np.float64, count=n)
+        ok = ~np.isnan(ts)
+        age_h = np.maximum(0.0, now_ts - ts[ok]) / 3600.0
+        rec[ok] = 0.5 ** (age_h / cfg.half_life_hours)
+
+    trust_map, trust_default = cfg.source_trust, cfg.source_default
+    trust = np.fromiter((trust_map.get(r[source_index], trust_default) for r in rows), dtype=np.float64, count=n)
+    score = cfg.alpha * cos_sim + cfg.beta * rec + cfg.gamma * trust
+    if language_index is not None and cfg.delta:
+        lang_map, lang_default = cfg.language_trust, cfg.language_default
+        lang = np.fromiter(
+            (lang_default if r[language_index] is None else lang_map.get(str(r[language_index]), lang_default) for r in rows),
+            dtype=np.float64,
+            count=n,
+        )
+        score += cfg.delta * lang
+    return score
+
+
+def top_k_indices(scores: "np.ndarray", k: int) -> "np.ndarray":
+    """Indices of the ``k`` best scores, best first; ties keep input order (like a stable sort)."""
+    n = len(scores)
+    k = max(0, min(int(k), n))
+    if k == 0:
+        return np.zeros(0, dtype=np.intp)
+    if k < n:
+        part = np.argpartition(-scores, k - 1)[:k]
+        kth = scores[part].min()
+        above = np.flatnonzero(scores > kth)
+        ties = np.flatnonzero(scores == kth)[: k - len(above)]
+        idx = np.concatenate([above, ties])
+    else:
+        idx = np.arange(n)
+    return idx[np.lexsort((idx, -scores[idx]))]
+
+
 def rerank_candidates(
     rows: Iterable[Tuple[Any, ...]],
     *,
@@ -163,6 +373,7 @@ def rerank_candidates(
     source_index: int,
     language_index: int | None = None,
     limit: int,
+    config: Optional[RankingConfig] = None,
 ) -> List[Tuple[Any, ...]]:
     """
     Apply weighted rank fusion to candidate rows.
@@ -170,39 +381,47 @@ def rerank_candidates(
     rows: tuples that include distance (cos distance), published_at (datetime), source (str)
     dist_index/published_index/source_index: indices of those fields in row
     limit: number of results to keep
+    config: weights/trust maps (default: the cached get_ranking_config())
     """
-    # Load configuration from YAML
-    config = load_ranking_config()
-    weights = config["score_weights"]
-    # Optional: TOML/JSON overrides for rank fusion weights
-    overrides = load_rank_fusion_overrides()
-    a0 = overrides.get("alpha", weights.get("cosine", 0.7))
-    b0 = overrides.get("beta", weights.get("recency", 0.2))
-    g0 = overrides.get("gamma", weights.get("source_trust", 0.1))
-    # Environment variables take precedence for backward compatibility
-    a = env_float("RANK_ALPHA", a0)
-    b = env_float("RANK_BETA", b0)
-    g = env_float("RANK_GAMMA", g0)
-    dlt = env_float("RANK_DELTA", weights.get("language", 0.0))
-    
-    ssum = a + b + g + dlt
-    if ssum <= 0:
-        a, b, g, dlt = 1.0, 0.0, 0.0, 0.0
-        ssum = 1.0
-    a, b, g, dlt = a / ssum, b / ssum, g / ssum, dlt / ssum
-    
-    hl0 = overrides.get("half_life_hours", config["recency_half_life_hours"])
-    hl = env_float("RECENCY_HALFLIFE_HOURS", hl0)
-    trust_map = load_source_trust()
-    lang_map = load_language_trust()
-    trust_default = env_float("SOURCE_TRUST_DEFAULT", config["source_trust"]["default"])
-    lang_default = env_float("LANGUAGE_TRUST_DEFAULT", config["language_trust"].get("default", 0.0))
+    cfg = config if config is not None else get_ranking_config()
+    if np is None:
+        return rerank_candidates_loop(
+            rows, dist_index=dist_index, published_index=published_index, source_index=source_index,
+            language_index=language_index, limit=limit, config=cfg,
+        )
+    rows = rows if isinstance(rows, list) else list(rows)
+    scores = score_candidates(
+        rows, dist_index=dist_index, published_index=published_index, source_index=source_index,
+        language_index=language_index, config=cfg,
+    )
+    return [rows[i] for i in top_k_indices(scores, limit)]
+
+
+def rerank_candidates_loop(
+    rows: Iterable[Tuple[Any, ...]],
+    *,
+    dist_index: int,
+    published_index: int,
+    source_index: int,
+    language_index: int | None = None,
+    limit: int,
+    config: Optional[RankingConfig] = None,
+    now: Optional[datetime] = None,
+) -> List[Tuple[Any, ...]]:
+    """Per-row reference implementation of rerank_candidates (used without NumPy)."""
+    cfg = config if config is not None else get_ranking_config()
+    a, b, g, dlt = cfg.alpha, cfg.beta, cfg.gamma, cfg.delta
+    hl = cfg.half_life_hours
+    trust_map = cfg.source_trust
+    lang_map = cfg.language_trust
+    trust_default = cfg.source_default
+    lang_default = cfg.language_default
 
     scored: List[Tuple[float, Tuple[Any, ...]]] = []
     for r in rows:
         dist = float(r[dist_index]) if r[dist_index] is not None else 1.0
         cos_sim = 1.0 - max(0.0, min(1.0, dist))
-        rec = recency_decay(r[published_index], hl)
+        rec = recency_decay(r[published_index], hl, now)
         trust = float(trust_map.get(r[source_index], trust_default))
         lang_val = 0.0
         if language_index is not None:
@@ -0,0 +1,110 @@
+"""
+SQL-side rank fusion (RANK_FUSION_MODE=sql).
+
+The Python path pulls up to 200 fully hydrated candidate rows (title, URL,
+genre hint subquery) out of Postgres only to rerank them and keep top_k.
+Here the HNSW candidate set is a CTE, source/language trust is joined in,
+the cosine/recency/trust score is computed
+in SQL with the weights of the current RankingConfig, and only the final
+top-k rows are hydrated. Candidates are docs, not chunks (best chunk per doc,
+see candidates.py).
+
+Source/language trust travels with the query as two key/value array pairs
+(unnested and LEFT JOINed), taken from the same RankingConfig object the
+Python path uses. The search path only reads: no table to keep in sync
+between processes with different configs, and a read-only role works.
+Rows come back in the same shape as the Python path:
+
+    (doc_id, title_raw, published_at, genre_hint, url_canon, source, lang, dist)
+"""
+from __future__ import annotations
+
+import os
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from .candidates import BEST_CHUNK_SQL, chunk_limit, since_cond
+from .ranker import RankingConfig, get_ranking_config
+
+FUSED_SQL = f"""
+WITH cand AS (
+    SELECT best.doc_id, d.published_at, d.source, d.lang, best.dist
+    FROM ({BEST_CHUNK_SQL}) best
+    JOIN doc d ON d.doc_id = best.doc_id
+    ORDER BY best.dist ASC, best.doc_id
+    LIMIT %(cand)s OFFSET %(offset)s
+), scored AS (
+    SELECT cand.doc_id, cand.dist,
+           %(alpha)s * (1.0 - LEAST(1.0, GREATEST(0.0, COALESCE(cand.dist, 1.0))))
+         + %(beta)s * CASE
+               WHEN %(half_life)s > 0 AND cand.published_at IS NOT NULL
+               THEN power(0.5, GREATEST(0.0, EXTRACT(EPOCH FROM (%(now)s - cand.published_at))::float8) / 3600.0 / %(half_life)s)
+               ELSE 0.0 END
+         + %(gamma)s * COALESCE(st.trust, %(source_default)s)
+         + %(delta)s * COALESCE(lt.trust, %(language_default)s) AS score
+    FROM cand
+    LEFT JOIN unnest(%(source_keys)s::text[], %(source_trust)s::float8[]) AS st(key, trust) ON st.key = cand.source
+    LEFT JOIN unnest(%(language_keys)s::text[], %(language_trust)s::float8[]) AS lt(key, trust) ON lt.key = cand.lang
+    ORDER BY score DESC, cand.dist ASC
+    LIMIT %(limit)s
+)
+SELECT d.doc_id, d.title_raw, d.published_at,
+       (SELECT val FROM hint WHERE doc_id=d.doc_id AND key='genre_hint') AS genre_hint,
+       d.url_canon, d.source, d.lang, s.dist
+FROM scored s
+JOIN doc d ON d.doc_id = s.doc_id
+ORDER BY s.score DESC, s.dist ASC
+"""
+
+def fusion_mode() -> str:
+    """``python`` (default): rerank_candidates in-process; ``sql``: fuse in Postgres."""
+    return (os.environ.get("RANK_FUSION_MODE") or "python").strip().lower()
+
+
+def trust_params(cfg: RankingConfig) -> Dict[str, List[Any]]:
+    """Trust maps of ``cfg`` as parallel key/value arrays for FUSED_SQL."""
+    src = sorted(cfg.source_trust.items())
+    lang = sorted(cfg.language_trust.items())
+    return {
+        "source_keys": [k for k, _ in src],
+        "source_trust": [float(v) for _, v in src],
+        "language_keys": [k for k, _ in lang],
+        "language_trust": [float(v) for _, v in lang],
+    }
+
+
+def fused_search(
+    conn,
+    qv: Any,
+    space: str,
+    *,
+    limit: int,
+    cand: int,
+    offset: int = 0,
+    since: Optional[datetime] = None,
+    config: Optional[RankingConfig] = None,
+    now: Optional[datetime] = None,
+) -> List[Tuple[Any, ...]]:
+    """Final top-``limit`` rows fused in SQL (same shape and order as the Python path)."""
+    cfg = config if config is not None else get_ranking_config()
+    params = {
+        "q": qv,
+        "space": space,
+        "since": since,
+        "cand": cand,
+        "chunks": chunk_limit(cand, offset),
+        "offset": offset,
+        "limit": limit,
+        "alpha": cfg.alpha,
+        "beta": cfg.beta,
+        "gamma": cfg.gamma,
+        "delta": cfg.delta,
+        "half_life": float(cfg.half_life_hours),
+        "source_default": cfg.source_default,
+        "language_default": cfg.language_default,
+        "now": now if now is not None else datetime.now(timezone.utc),
+        **trust_params(cfg),
+    }
+    sql = FUSED_SQL.format(since_cond=since_cond(since))
+    # Never as a prepared statement: a generic plan cannot use the per-space partial HNSW indexes
+    return conn.execute(sql, params, prepare=False).fetchall()
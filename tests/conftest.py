@@ -1,4 +1,9 @@
 import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
 
 # Ensure fixed environment for imports in CI and local runs
 os.environ.setdefault("DATABASE_URL", "postgresql://127.0.0.1/newshub")
@@ -6,3 +11,89 @@ os.environ.setdefault("APP_BIND_HOST", "127.0.0.1")
 os.environ.setdefault("APP_BIND_PORT", "3011")
 os.environ.setdefault("CI", "true")
 
+
+class MockHTTP:
+    """Routes path -> (status, body bytes, headers); ``delay`` simulates latency."""
+
+    def __init__(self):
+        self.routes = {}
+        self.delay = 0.0
+        self.hits = 0
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+        self.url = ""
+
+
+@pytest.fixture
+def mock_http():
+    """Local HTTP/1.1 server on 127.0.0.1 for offline fetch/throughput tests."""
+    state = MockHTTP()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            with state.lock:
+                state.hits += 1
+                state.active += 1
+                state.peak = max(state.peak, state.active)
+            try:
+                if state.delay:
+                    time.sleep(state.delay)
+                status, body, headers = state.routes.get(self.path.split("?")[0], (404, b"", {}))
+                self.send_response(status)
+                for k, v in headers.items():
+                    self.send_header(k, v)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            finally:
+                with state.lock:
+                    state.active -= 1
+
+        def log_message(self, *args):
+            pass
+
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    srv.daemon_threads = True
+    state.url = f"http://127.0.0.1:{srv.server_address[1]}"
+    t = threading.Thread(target=srv.serve_forever, daemon=True)
+    t.start()
+    try:
+        yield state
+    finally:
+        srv.shutdown()
+        srv.server_close()
+
+
+class ChunkConn:
+    """Just enough of a psycopg connection for embedding.scanner.fetch_pending."""
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params):
+        after, _space, limit = params
+        rows = [c for c in self.chunks if c[0] > after][:limit]
+
+        class _Cur:
+            def fetchall(self_inner):
+                return rows
+
+        return _Cur()
+
+    def commit(self):
+        pass
+
+
+@pytest.fixture
+def chunk_conn():
+    """Factory: chunk_conn([(chunk_id, text), ...]) -> connection serving them as pending."""
+    return ChunkConn
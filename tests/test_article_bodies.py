@@ -0,0 +1,97 @@
+import asyncio
+import os
+
+import pytest
+
+PAGE = """<html><head><meta charset="utf-8"><title>t</title><script>var x = 1;</script></head>
+<body><nav><a href="/">Home</a> <a href="/news">News</a></nav>
+<article><h1>Big news</h1>
+<p>The first paragraph of the article explains what happened in considerable detail today.</p>
+<p>A second paragraph adds context and quotes from several people involved in the story.
+<div class="ad">Advertisement</div>
+</article>
+<footer>Copyright example corp, all rights reserved, do not copy this text anywhere</footer></body></html>"""
+
+
+def test_extract_main_text_keeps_article_paragraphs():
+    from ingest.bodies import extract_main_text
+
+    text = extract_main_text(PAGE)
+    assert "first paragraph" in text and "second paragraph" in text
+    assert "Home" not in text and "Copyright" not in text and "var x" not in text
+
+
+def test_chunk_text_windows_overlap_and_spans_match():
+    from ingest.bodies import chunk_text
+
+    text = " ".join(f"w{i}" for i in range(100))
+    chunks = chunk_text(text, max_tokens=30, overlap=5)
+    assert [c[2].split()[0] for c in chunks] == ["w0", "w25", "w50", "w75"]
+    assert all(text[s:e] == t for s, e, t in chunks)
+    assert all(len(t.split()) <= 30 for _, _, t in chunks)
+    # CJK: one token per character
+    ja = "東京で新しい発表があった。" * 10
+    assert all(e - s <= 40 for s, e, _ in chunk_text(ja, max_tokens=40, overlap=8))
+
+
+def test_fetch_bodies_stops_reading_at_max_bytes():
+    httpx = pytest.importorskip("httpx")
+    from ingest.bodies import fetch_bodies
+
+    sent = []
+
+    async def body():
+        yield PAGE.encode()
+        for i in range(1000):
+            sent.append(i)
+            yield b"<p>" + b"filler " * 140 + b"</p>"  # ~1 KB each
+
+    def handler(request):
+        return httpx.Response(200, headers={"Content-Type": "text/html; charset=utf-8"}, content=body())
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as c:
+            return await fetch_bodies([(1, "https://big.test/a", "en", 0)], c, host_rate=0, max_bytes=4096)
+
+    (res,) = asyncio.run(run())
+    assert res["status"] == "ok" and "first paragraph" in " ".join(t for _, _, t in res["chunks"])
+    # ~1 MB on offer; reading stopped after a few KB
+    assert len(sent) < 10
+
+
+@pytest.mark.skipif(os.getenv("SKIP_DB_TESTS") == "1", reason="DB not available in CI")
+def test_run_bodies_writes_chunks_once(mock_http):
+    psycopg = pytest.importorskip("psycopg")
+    httpx = pytest.importorskip("httpx")
+    from ingest.bodies import run_bodies
+    from ingest.bulk_writer import write_articles
+    from ingest.normalize import make_row
+
+    mock_http.routes["/a"] = (200, PAGE.encode(), {"Content-Type": "text/html; charset=utf-8"})
+    mock_http.routes["/gone"] = (404, b"", {"Content-Type": "text/html"})
+    rows = [make_row(source="body-test", url=f"{mock_http.url}/{p}", title=p) for p in ("a", "gone")]
+    urls = [r["url_canon"] for r in rows]
+    dsn = os.environ.get("DATABASE_URL", "postgresql://127.0.0.1/newshub")
+    with psycopg.connect(dsn) as conn:
+        try:
+            ids = write_articles(conn, rows)
+            conn.commit()
+
+            async def run():
+                async with httpx.AsyncClient() as c:
+                    return await run_bodies(conn, c, sources=["body-test"], max_docs=50, max_tokens=12, overlap=3, host_rate=0)
+
+            stats = asyncio.run(run())
+            assert stats["ok"] >= 1 and stats["http_404"] >= 1
+            parts = conn.execute(
+                "SELECT part_ix, lower(span), upper(span), text_raw FROM chunk WHERE doc_id = %s AND part_ix > 0 ORDER BY part_ix",
+                (ids[urls[0]],),
+            ).fetchall()
+            assert len(parts) >= 2 and parts[0][1] == 0 and parts[1][1] < parts[0][2]
+            hits = mock_http.hits
+            asyncio.run(run())
+            assert mock_http.hits == hits  # nothing left to fetch for these docs
+        finally:
+            conn.rollback()
+            conn.execute("DELETE FROM doc WHERE url_canon = ANY(%s)", (urls,))
+            conn.commit()
@@ -0,0 +1,103 @@
+import os
+import hashlib
+from datetime import datetime, timezone
+
+import pytest
+
+pytestmark = pytest.mark.skipif(os.getenv("SKIP_DB_TESTS") == "1", reason="DB not available in CI")
+
+
+def _row(url: str, title: str, **kw):
+    row = {
+        "source": "bulk-test",
+        "source_uid": url,
+        "url_canon": url,
+        "title_raw": title,
+        "author": None,
+        "lang": "en",
+        "published_at": datetime(2025, 9, 1, tzinfo=timezone.utc),
+        "hash_body": hashlib.sha256(title.encode()).digest(),
+        "raw": {"title": title},
+        "text_raw": title,
+        "genre_hint": "medtop:04000000",
+        "hint_conf": 0.6,
+    }
+    row.update(kw)
+    return row
+
+
+def test_write_articles_upserts_doc_chunk_hint():
+    psycopg = pytest.importorskip("psycopg")
+    from ingest.bulk_writer import BulkWriter
+
+    dsn = os.environ.get("DATABASE_URL", "postgresql://127.0.0.1/newshub")
+    urls = [f"https://bulk.test/{i}" for i in range(3)]
+    with psycopg.connect(dsn) as conn:
+        try:
+            w = BulkWriter(conn, batch_size=2)
+            w.extend([_row(urls[0], "a"), _row(urls[1], "b"), _row(urls[2], "c", genre_hint=None)])
+            # duplicate url in the same batch: last one wins
+            w.add(_row(urls[0], "a2"))
+            ids = w.close()
+            assert set(ids) == set(urls) and not w.failed
+
+            titles = dict(conn.execute(
+                "SELECT url_canon, title_raw FROM doc WHERE url_canon = ANY(%s)", (urls,)
+            ).fetchall())
+            assert titles == {urls[0]: "a2", urls[1]: "b", urls[2]: "c"}
+            n_chunks = conn.execute(
+                "SELECT count(*) FROM chunk WHERE doc_id = ANY(%s) AND part_ix = 0", (list(ids.values()),)
+            ).fetchone()[0]
+            assert n_chunks == 3
+            hinted = conn.execute(
+                "SELECT doc_id FROM hint WHERE key='genre_hint' AND doc_id = ANY(%s)", (list(ids.values()),)
+            ).fetchall()
+            assert {h[0] for h in hinted} == {ids[urls[0]], ids[urls[1]]}
+
+            # unchanged docs are not rewritten; a changed title is
+            again = w.write([_row(urls[1], "b"), _row(urls[2], "c2", genre_hint=None)])
+            assert again == {urls[2]: ids[urls[2]]}
+        finally:
+            conn.rollback()
+            conn.execute("DELETE FROM doc WHERE url_canon = ANY(%s)", (urls,))
+            conn.commit()
+
+
+def test_changed_body_replaces_chunk_for_the_scanner():
+    psycopg = pytest.importorskip("psycopg")
+    from embedding.scanner import PendingScanner
+    from ingest.bulk_writer import write_articles
+
+    dsn = os.environ.get("DATABASE_URL", "postgresql://127.0.0.1/newshub")
+    url = "https://bulk.test/body-change"
+    space = "bulk-test"
+    with psycopg.connect(dsn) as conn:
+        try:
+            doc_id = write_articles(conn, [_row(url, "t", text_raw="old body")])[url]
+            old_id = conn.execute("SELECT chunk_id FROM chunk WHERE doc_id=%s AND part_ix=0", (doc_id,)).fetchone()[0]
+            conn.execute(
+                "INSERT INTO chunk_vec (chunk_id, embedding_space, dim, emb) "
+                "VALUES (%s, %s, 768, array_fill(0.1::real, ARRAY[768])::vector)",
+                (old_id, space),
+            )
+            # same title, new body (hash_body changes with it)
+            new = _row(url, "t", text_raw="new body", hash_body=hashlib.sha256(b"new body").digest())
+            assert write_articles(conn, [new]) == {url: doc_id}
+
+            new_id, text = conn.execute(
+                "SELECT chunk_id, text_raw FROM chunk WHERE doc_id=%s AND part_ix=0", (doc_id,)
+            ).fetchone()
+            assert text == "new body" and new_id > old_id
+            assert conn.execute("SELECT count(*) FROM chunk_vec WHERE chunk_id=%s", (old_id,)).fetchone()[0] == 0
+            # a scanner whose mark is already past the old chunk still finds the new one
+            scanner = PendingScanner(space)
+            scanner.after = old_id
+            assert new_id in [r[0] for r in scanner.fetch(conn, 10_000)]
+
+            # an unchanged rewrite keeps the chunk
+            assert write_articles(conn, [new]) == {}
+            assert conn.execute("SELECT chunk_id FROM chunk WHERE doc_id=%s AND part_ix=0", (doc_id,)).fetchone()[0] == new_id
+        finally:
+            conn.rollback()
+            conn.execute("DELETE FROM doc WHERE url_canon = %s", (url,))
+            conn.commit()
@@ -0,0 +1,47 @@
+import os
+
+import pytest
+
+SENTENCES = [
+    "Tokyo stocks rose on Friday as exporters gained.",
+    "東京株式市場は金曜日、輸出関連株が上昇した。",
+    "La banque centrale a maintenu ses taux inchangés.",
+    "Центральный банк сохранил ставку без изменений.",
+    "short",
+    "The government announced a new stimulus package worth 5 trillion yen " * 8,
+]
+
+
+def test_pool_hidden_mean_ignores_padding_and_cls_takes_first_token():
+    np = pytest.importorskip("numpy")
+    from embedding.backends import default_pooling, pool_hidden
+
+    hidden = np.array([[[1.0, 1.0], [3.0, 5.0], [100.0, 100.0]]], dtype=np.float32)
+    mask = np.array([[1, 1, 0]])
+    assert np.allclose(pool_hidden(hidden, mask, "mean"), [[2.0, 3.0]])
+    assert np.allclose(pool_hidden(hidden, mask, "cls"), [[1.0, 1.0]])
+    assert default_pooling("BAAI/bge-m3") == "cls"
+    assert default_pooling("intfloat/multilingual-e5-base") == "mean"
+
+
+def test_load_backend_rejects_unknown_names(monkeypatch):
+    from embedding.backends import load_backend
+
+    monkeypatch.setenv("EMBEDDING_BACKEND", "tensorflow")
+    with pytest.raises(ValueError, match="EMBEDDING_BACKEND"):
+        load_backend()
+
+
+@pytest.mark.skipif(os.getenv("EMBEDDING_PARITY") != "1", reason="needs the model download (set EMBEDDING_PARITY=1)")
+@pytest.mark.parametrize("backend,min_cos", [("onnx", 0.999), ("onnx-int8", 0.97)])
+def test_onnx_backend_matches_reference_model(backend, min_cos):
+    pytest.importorskip("numpy")
+    pytest.importorskip("onnxruntime")
+    pytest.importorskip("sentence_transformers")
+    from embedding.backends import load_backend
+
+    ref = load_backend("sentence-transformers").encode(SENTENCES, normalize_embeddings=True)
+    got = load_backend(backend).encode(SENTENCES, normalize_embeddings=True)
+    assert got.shape == ref.shape
+    cos = (ref * got).sum(axis=1)
+    assert cos.min() >= min_cos, cos
@@ -0,0 +1,60 @@
+import pytest
+
+
+def test_approx_tokens_counts_words_and_cjk():
+    from embedding.batching import approx_tokens
+
+    assert approx_tokens("") == 2
+    assert approx_tokens("Tokyo stocks rise") == 2 + 4  # ceil(3 * 1.3)
+    assert approx_tokens("東京株式") == 2 + 4
+    assert approx_tokens("word " * 1000) == 512
+
+
+def test_plan_batches_respects_budget_and_covers_every_row():
+    from embedding.batching import approx_tokens, padded_tokens, plan_batches
+
+    heads = [(i, f"headline number {i} about markets") for i in range(200)]
+    bodies = [(1000 + i, "long body text " * 80) for i in range(5)]
+    rows = heads[:100] + bodies + heads[100:]
+    batches = plan_batches(rows, token_budget=2048, max_batch=64)
+    assert sorted(r[0] for b in batches for r in b) == sorted(r[0] for r in rows)
+    for b in batches:
+        assert len(b) <= 64
+        assert padded_tokens([approx_tokens(r[1]) for r in b]) <= 2048 or len(b) == 1
+    # Headlines are never padded to a body's length
+    assert all(not ({r[0] for r in b} & {1000} and {r[0] for r in b} & {0}) for b in batches)
+    fixed = sum(padded_tokens([approx_tokens(r[1]) for r in rows[i : i + 64]]) for i in range(0, len(rows), 64))
+    bucketed = sum(padded_tokens([approx_tokens(r[1]) for r in b]) for b in batches)
+    assert bucketed < fixed / 2
+    assert plan_batches([], token_budget=10) == []
+    assert [len(b) for b in plan_batches([(1, "x " * 600)], token_budget=100)] == [1]
+
+
+def test_run_pipelined_token_budget_keeps_id_vector_pairs(tmp_path, chunk_conn):
+    np = pytest.importorskip("numpy")
+    from embedding.scanner import EmbedCursor, PendingScanner
+    from embedding.worker import run_pipelined
+
+    chunks = [(i, "word " * (1 + (i * 37) % 90)) for i in range(1, 301)]
+    written = {}
+    marks = []
+    cur = EmbedCursor(str(tmp_path / "c.json"))
+
+    def encode(texts):
+        return np.array([[len(t), 0.0] for t in texts], dtype=np.float32)
+
+    def write(conn, space, ids, embs):
+        marks.append(cur.get(space))
+        for cid, v in zip(ids, embs):
+            written[cid] = v[0]
+        return len(ids)
+
+    scanner = PendingScanner("s", cursor=cur, sweep=True)
+    stats = run_pipelined(
+        lambda: chunk_conn(chunks), encode, "s", token_budget=1024, window=100, max_batch=32,
+        write=write, scanner=scanner, log=lambda m: None,
+    )
+    assert stats["chunks"] == 300 and stats["batches"] > 300 // 32
+    assert written == {cid: float(len(t)) for cid, t in chunks}
+    # The cursor only ever sat on window boundaries
+    assert set(marks) <= {0, 100, 200} and cur.get("s") == 300
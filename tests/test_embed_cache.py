@@ -0,0 +1,79 @@
+import os
+import struct
+
+import pytest
+
+
+def test_text_key_normalizes_whitespace_and_width():
+    from embedding.cache import dedupe_rows, text_key
+
+    assert text_key("Tokyo  stocks\n rise ") == text_key("Tokyo stocks rise")
+    assert text_key("ＡＢＣ１") == text_key("ABC1")
+    assert text_key("Tokyo") != text_key("tokyo")
+    rows = [(1, "a"), (2, "b"), (3, "a "), (4, "a")]
+    out = dedupe_rows(rows, [text_key(r[1]) for r in rows])
+    assert [(r[0], r[3]) for r in out] == [(1, [3, 4]), (2, [])]
+
+
+def test_copy_payload_with_keys_appends_bytea_field():
+    np = pytest.importorskip("numpy")
+    from embedding.vec_writer import copy_payload
+
+    key = bytes(range(32))
+    data = copy_payload([5], np.array([[1.0, 2.0]], dtype=np.float32), [key])
+    body = data[19:-2]
+    assert struct.unpack("!hiqihh2fi", body[:-32]) == (3, 8, 5, 12, 2, 0, 1.0, 2.0, 32)
+    assert body[-32:] == key
+
+
+@pytest.mark.skipif(os.getenv("SKIP_DB_TESTS") == "1", reason="DB not available in CI")
+def test_cached_vectors_skip_the_model():
+    psycopg = pytest.importorskip("psycopg")
+    np = pytest.importorskip("numpy")
+    from embedding.scanner import PendingScanner
+    from embedding.worker import run_pipelined
+    from ingest.bulk_writer import write_articles
+    from ingest.normalize import make_row
+
+    space = "test-embed-cache"
+    dsn = os.environ.get("DATABASE_URL", "postgresql://127.0.0.1/newshub")
+    text = f"Syndicated wire story {os.getpid()}"
+    rows = [make_row(source=f"cache-test-{i}", url=f"https://cache{i}.example/a", title=text) for i in range(3)]
+    rows.append(make_row(source="cache-test-x", url="https://cachex.example/b", title=f"Unique story {os.getpid()}"))
+    urls = [r["url_canon"] for r in rows]
+    encoded = []
+
+    def encode(texts):
+        encoded.extend(texts)
+        return np.full((len(texts), 768), 0.25, dtype=np.float32)
+
+    def run():
+        sc = PendingScanner(space)
+        return run_pipelined(lambda: psycopg.connect(dsn), encode, space, scanner=sc, cache=True, log=lambda m: None)
+
+    with psycopg.connect(dsn) as conn:
+        try:
+            if conn.execute("SELECT to_regclass('embed_cache')").fetchone()[0] is None:
+                pytest.skip("embed_cache migration not applied")
+            write_articles(conn, rows[:2] + rows[3:])
+            conn.commit()
+            run()
+            assert encoded.count(text) == 1 and f"Unique story {os.getpid()}" in encoded
+            # A third copy of the story arrives later: served from the cache
+            write_articles(conn, rows[2:3])
+            conn.commit()
+            encoded.clear()
+            stats = run()
+            assert text not in encoded and stats["cached"] >= 1
+            n = conn.execute(
+                "SELECT count(*) FROM chunk_vec v JOIN chunk c USING (chunk_id) JOIN doc d USING (doc_id) "
+                "WHERE d.url_canon = ANY(%s) AND v.embedding_space = %s",
+                (urls, space),
+            ).fetchone()[0]
+            assert n == 4
+        finally:
+            conn.rollback()
+            conn.execute("DELETE FROM chunk_vec WHERE embedding_space = %s", (space,))
+            conn.execute("DELETE FROM embed_cache WHERE embedding_space = %s", (space,))
+            conn.execute("DELETE FROM doc WHERE url_canon = ANY(%s)", (urls,))
+            conn.commit()
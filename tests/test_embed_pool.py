@@ -0,0 +1,30 @@
+import functools
+
+import pytest
+
+
+def test_pool_matches_in_process_encoder_and_keeps_order():
+    np = pytest.importorskip("numpy")
+    from embedding.models import HashingEncoder, hashing_encoder
+    from embedding.pool import EmbedPool
+
+    texts = [("word " * n).strip() for n in (30, 1, 7, 2, 50, 3, 3, 12, 1)]
+    ref = HashingEncoder(dim=16)(texts)
+    with EmbedPool(functools.partial(hashing_encoder, 16), workers=2, threads=1) as pool:
+        assert pool.dim == 16
+        got = pool.encode(texts)
+        assert np.allclose(got, ref, atol=1e-6)
+        # More texts than the first shared-memory slots hold; fewer texts than workers
+        many = [f"t{i} " * (i % 9 + 1) for i in range(300)]
+        assert np.allclose(pool.encode(many), HashingEncoder(dim=16)(many), atol=1e-6)
+        assert np.allclose(pool.encode(texts[:1]), ref[:1], atol=1e-6)
+        assert pool.encode([]).shape == (0, 16)
+
+
+def test_pool_reports_worker_start_failure():
+    pytest.importorskip("numpy")
+    from embedding.models import sentence_transformer_encoder
+    from embedding.pool import EmbedPool
+
+    with pytest.raises(RuntimeError, match="embedding worker"):
+        EmbedPool(functools.partial(sentence_transformer_encoder, "/nonexistent/model"), workers=1)
@@ -0,0 +1,107 @@
+import asyncio
+import threading
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+
+class SlowModel:
+    """Records every batch it sees; a short sleep lets concurrent requests pile up."""
+
+    name = "fake"
+    model_name = "fake-model"
+    dim = 2
+
+    def __init__(self, delay=0.01):
+        self.delay = delay
+        self.batches = []
+        self.lock = threading.Lock()
+
+    def encode(self, texts, normalize_embeddings=True):
+        import time
+
+        time.sleep(self.delay)
+        with self.lock:
+            self.batches.append(list(texts))
+        return np.array([[float(len(t)), 1.0] for t in texts], dtype=np.float32)
+
+
+def test_micro_batcher_coalesces_concurrent_requests():
+    from embedding.service import MicroBatcher
+
+    model = SlowModel()
+    texts = [f"query {'x' * i}" for i in range(20)]
+
+    async def main():
+        batcher = MicroBatcher(lambda t: model.encode(t), max_batch=8, max_wait_ms=20)
+        await batcher.start()
+        try:
+            return await asyncio.gather(*(batcher.submit([t]) for t in texts)), batcher
+        finally:
+            await batcher.stop()
+
+    results, batcher = asyncio.run(main())
+    # every caller gets its own row back, in order
+    assert [float(r[0, 0]) for r in results] == [float(len(t)) for t in texts]
+    assert all(len(b) <= 8 for b in model.batches)
+    assert len(model.batches) < len(texts) and batcher.batches == len(model.batches)
+    assert batcher.texts == len(texts)
+
+
+def test_micro_batcher_propagates_encode_errors():
+    from embedding.service import MicroBatcher
+
+    def boom(texts):
+        raise RuntimeError("model crashed")
+
+    async def main():
+        batcher = MicroBatcher(boom, max_wait_ms=1)
+        try:
+            with pytest.raises(RuntimeError, match="model crashed"):
+                await batcher.submit(["a"])
+            # the batching loop survives a failed pass
+            batcher.encode = lambda t: np.ones((len(t), 3), dtype=np.float32)
+            return await batcher.submit(["b", "c"])
+        finally:
+            await batcher.stop()
+
+    assert asyncio.run(main()).shape == (2, 3)
+
+
+def test_client_round_trip_through_app():
+    pytest.importorskip("fastapi")
+    from fastapi.testclient import TestClient
+
+    from embedding.client import EmbeddingClient
+    from embedding.query_cache import QueryEmbeddingCache
+    from embedding.service import create_app
+
+    model = SlowModel(delay=0)
+    with TestClient(create_app(model, max_wait_ms=1, max_texts=4)) as http:
+        client = EmbeddingClient("http://testserver", client=http)
+        vecs = client.encode(["ab", "abcd"], normalize_embeddings=True)
+        assert vecs.dtype == np.float32 and vecs.tolist() == [[2.0, 1.0], [4.0, 1.0]]
+        # drops into the query LRU like a local backend
+        cache = QueryEmbeddingCache()
+        assert cache.encode(client, "abc").tolist() == [3.0, 1.0]
+        assert cache.encode(client, "abc").tolist() == [3.0, 1.0]
+        # keyed by the service's model, not by the caller's embedding space
+        assert client.model_key == "fake-model|fake" and list(cache._items) == [("fake-model|fake", "abc")]
+        assert sum(len(b) for b in model.batches) == 3
+        health = client.health()
+        assert health["backend"] == "fake" and health["texts"] == 3
+        assert http.post("/embed", json={"texts": ["a"] * 5}).status_code == 413
+        assert http.post("/embed", json={"texts": "a"}).status_code == 422
+
+
+def test_service_client_from_env(monkeypatch):
+    pytest.importorskip("httpx")
+    from embedding.client import service_client
+
+    monkeypatch.delenv("EMBEDDING_SERVICE_URL", raising=False)
+    assert service_client() is None
+    monkeypatch.setenv("EMBEDDING_SERVICE_URL", "unix:/tmp/embed-test.sock")
+    client = service_client()
+    assert client is not None and client.url == "unix:/tmp/embed-test.sock"
+    client.close()
@@ -0,0 +1,120 @@
+import os
+import threading
+import time
+
+import pytest
+
+
+def test_run_pipelined_overlaps_encode_and_write(chunk_conn):
+    np = pytest.importorskip("numpy")
+    from embedding.worker import run_pipelined
+
+    chunks = [(i, f"text {i}") for i in range(1, 41)]
+    written = []
+    active = {"encode": False, "overlap": 0}
+
+    def encode(texts):
+        active["encode"] = True
+        time.sleep(0.02)
+        active["encode"] = False
+        return np.ones((len(texts), 4), dtype=np.float32)
+
+    def write(conn, space, ids, embs):
+        time.sleep(0.02)
+        if active["encode"]:
+            active["overlap"] += 1
+        written.extend(ids)
+        return len(ids)
+
+    stats = run_pipelined(lambda: chunk_conn(chunks), encode, "s", batch=8, write=write, log=lambda m: None)
+    assert written == [c[0] for c in chunks]
+    assert stats["chunks"] == 40 and stats["batches"] == 5
+    assert active["overlap"] >= 1  # writes ran while the next batch was encoding
+
+
+def test_run_pipelined_surfaces_writer_errors(chunk_conn):
+    np = pytest.importorskip("numpy")
+    from embedding.worker import run_pipelined
+
+    chunks = [(i, "t") for i in range(1, 100)]
+
+    def write(conn, space, ids, embs):
+        raise RuntimeError("disk full")
+
+    before = threading.active_count()
+    with pytest.raises(RuntimeError, match="disk full"):
+        run_pipelined(lambda: chunk_conn(chunks), lambda t: np.zeros((len(t), 4)), "s", batch=4, write=write, log=lambda m: None)
+    assert threading.active_count() <= before
+
+
+def test_run_pipelined_surfaces_encoder_errors(chunk_conn):
+    from embedding.worker import run_pipelined
+
+    chunks = [(i, "t") for i in range(1, 100)]
+
+    def encode(texts):
+        raise RuntimeError("model crashed")
+
+    # The reader can be blocked on a full prefetch queue when the encoder fails;
+    # run in a thread so a hang fails the test instead of blocking it
+    errors = []
+
+    def run():
+        try:
+            run_pipelined(lambda: chunk_conn(chunks), encode, "s", batch=10, prefetch=2, log=lambda m: None)
+        except RuntimeError as ex:
+            errors.append(ex)
+
+    before = threading.active_count()
+    t = threading.Thread(target=run, daemon=True)
+    t.start()
+    t.join(timeout=10)
+    assert not t.is_alive(), "run_pipelined hung after an encoder error"
+    assert [str(e) for e in errors] == ["model crashed"]
+    assert threading.active_count() <= before
+
+
+@pytest.mark.skipif(os.getenv("SKIP_DB_TESTS") == "1", reason="DB not available in CI")
+def test_run_pipelined_embeds_pending_chunks_once():
+    psycopg = pytest.importorskip("psycopg")
+    np = pytest.importorskip("numpy")
+    pytest.importorskip("pgvector")
+    from pgvector.psycopg import register_vector
+
+    from embedding.worker import run_pipelined
+    from ingest.bulk_writer import write_articles
+    from ingest.normalize import make_row
+
+    space = "test-embed-worker"
+    dsn = os.environ.get("DATABASE_URL", "postgresql://127.0.0.1/newshub")
+
+    def connect():
+        conn = psycopg.connect(dsn)
+        register_vector(conn)
+        return conn
+
+    rows = [make_row(source="embed-test", url=f"https://embed.example/{i}", title=f"embed test {i}") for i in range(3)]
+    urls = [r["url_canon"] for r in rows]
+    with connect() as conn:
+        try:
+            ids = write_articles(conn, rows)
+            conn.commit()
+            doc_ids = list(ids.values())
+
+            def encode(texts):
+                return np.full((len(texts), 768), 0.5, dtype=np.float32)
+
+            stats = run_pipelined(connect, encode, space, batch=2, log=lambda m: None)
+            assert stats["chunks"] >= 3
+            n = conn.execute(
+                "SELECT count(*) FROM chunk c JOIN chunk_vec v USING (chunk_id) "
+                "WHERE c.doc_id = ANY(%s) AND v.embedding_space = %s",
+                (doc_ids, space),
+            ).fetchone()[0]
+            assert n == conn.execute("SELECT count(*) FROM chunk WHERE doc_id = ANY(%s)", (doc_ids,)).fetchone()[0]
+            assert run_pipelined(connect, encode, space, batch=2, log=lambda m: None)["chunks"] == 0
+        finally:
+            conn.rollback()
+            conn.execute("DELETE FROM chunk_vec WHERE embedding_space = %s", (space,))
+            conn.execute("DELETE FROM doc WHERE url_canon = ANY(%s)", (urls,))
+            conn.commit()
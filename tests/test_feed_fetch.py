@@ -0,0 +1,79 @@
+import asyncio
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+
+
+RSS = b"""<?xml version="1.0"?>
+<rss version="2.0"><channel><title>T</title><link>https://example.com/</link>
+<item><title>Hello</title><link>https://example.com/a?utm_source=x</link></item>
+</channel></rss>"""
+
+
+def _client(handler):
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+def test_sweep_respects_per_host_limit_and_keeps_order():
+    from ingest.fetch import sweep
+
+    active = {"a.example": 0, "b.example": 0}
+    peak = {"a.example": 0, "b.example": 0}
+
+    async def handler(request):
+        host = request.url.host
+        active[host] += 1
+        peak[host] = max(peak[host], active[host])
+        await asyncio.sleep(0.01)
+        active[host] -= 1
+        return httpx.Response(200, content=b"")
+
+    feeds = [{"url": f"https://a.example/{i}.xml"} for i in range(6)]
+    feeds += [{"url": f"https://b.example/{i}.xml"} for i in range(3)]
+
+    async def run():
+        async with _client(handler) as c:
+            return await sweep(feeds, concurrency=8, per_host=2, timeout=5.0, client=c)
+
+    results = asyncio.run(run())
+    assert [r["url"] for r in results] == [f["url"] for f in feeds]
+    assert all(r["status"] == 200 for r in results)
+    assert peak["a.example"] <= 2
+    assert peak["b.example"] <= 2
+
+
+def test_sweep_times_out_slow_feed_without_blocking_others():
+    from ingest.fetch import sweep
+
+    async def handler(request):
+        if request.url.host == "slow.example":
+            await asyncio.sleep(5)
+        return httpx.Response(200, content=b"")
+
+    feeds = [{"url": "https://slow.example/feed"}, {"url": "https://fast.example/feed"}]
+
+    async def run():
+        async with _client(handler) as c:
+            return await sweep(feeds, timeout=0.1, client=c)
+
+    slow, fast = asyncio.run(run())
+    assert slow["content"] is None and "timeout" in (slow["error"] or "")
+    assert fast["status"] == 200 and fast["error"] is None
+
+
+def test_sweep_parses_body():
+    pytest.importorskip("feedparser")
+    from ingest.fetch import sweep
+
+    async def handler(request):
+        return httpx.Response(200, content=RSS)
+
+    async def run():
+        async with _client(handler) as c:
+            return await sweep([{"url": "https://example.com/rss"}], client=c)
+
+    (res,) = asyncio.run(run())
+    parsed = res["parsed"]
+    assert parsed["feed"]["title"] == "T"
+    assert parsed["entries"][0]["title"] == "Hello"
@@ -0,0 +1,72 @@
+from datetime import datetime, timezone
+
+import pytest
+
+RSS = b"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0" xmlns:dc="http://purl.org/dc/elements/1.1/" xmlns:content="http://purl.org/rss/1.0/modules/content/">
+<channel><title>Feed</title><link>https://rss.test/</link><language>ja</language>
+<image><title>logo</title><url>https://rss.test/logo.png</url></image>
+<item><title>Third</title><link>https://rss.test/3</link><guid>g3</guid><description>d3</description>
+  <pubDate>Mon, 01 Sep 2025 12:00:00 GMT</pubDate><dc:creator>Alice</dc:creator></item>
+<item><title><![CDATA[Second & co]]></title><link>https://rss.test/2</link><pubDate>Mon, 01 Sep 2025 11:00:00 GMT</pubDate></item>
+<item><title>First</title><link>https://rss.test/1</link><pubDate>Mon, 01 Sep 2025 10:00:00 GMT</pubDate></item>
+<item><title>Zeroth</title><link>https://rss.test/0</link><pubDate>Mon, 01 Sep 2025 09:00:00 GMT</pubDate></item>
+</channel></rss>"""
+
+ATOM = b"""<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom"><title>Atom</title><link href="https://atom.test/"/>
+<entry><title>E1</title><link rel="alternate" href="https://atom.test/e1"/><link rel="edit" href="https://atom.test/edit"/>
+  <id>urn:e1</id><updated>2025-09-01T10:00:00Z</updated><summary>s1</summary><author><name>Bob</name></author></entry>
+</feed>"""
+
+SITEMAP = b"""<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9" xmlns:news="http://www.google.com/schemas/sitemap-news/0.9">
+<url><loc>https://sm.test/a</loc><news:news><news:publication><news:name>SM</news:name><news:language>en</news:language></news:publication>
+  <news:publication_date>2025-09-01T10:00:00Z</news:publication_date><news:title>Sitemap A</news:title></news:news></url>
+</urlset>"""
+
+
+def test_iter_entries_rss_fields_and_feed_meta():
+    from ingest.feed_stream import iter_entries
+
+    feed = {}
+    entries = list(iter_entries(RSS, feed=feed))
+    assert feed == {"title": "Feed", "link": "https://rss.test/", "language": "ja"}
+    assert [e["title"] for e in entries] == ["Third", "Second & co", "First", "Zeroth"]
+    e = entries[0]
+    assert (e["link"], e["id"], e["description"], e["author"]) == ("https://rss.test/3", "g3", "d3", "Alice")
+    assert e["published"] == "Mon, 01 Sep 2025 12:00:00 GMT"
+
+
+def test_iter_entries_atom_and_sitemap():
+    from ingest.feed_stream import iter_entries
+
+    feed = {}
+    (a,) = iter_entries(ATOM, feed=feed)
+    assert feed["link"] == "https://atom.test/"
+    assert (a["title"], a["link"], a["id"], a["summary"], a["author"]) == ("E1", "https://atom.test/e1", "urn:e1", "s1", "Bob")
+    (s,) = iter_entries(SITEMAP)
+    assert (s["title"], s["link"], s["language"], s["published"]) == (
+        "Sitemap A", "https://sm.test/a", "en", "2025-09-01T10:00:00Z"
+    )
+
+
+def test_iter_entries_stops_at_high_water_mark():
+    from ingest.feed_stream import iter_entries
+
+    since = datetime(2025, 9, 1, 11, tzinfo=timezone.utc)
+    assert [e["title"] for e in iter_entries(RSS, since=since, patience=1)] == ["Third"]
+    # with patience the parser skips older entries but keeps reading a little further
+    assert [e["title"] for e in iter_entries(RSS, since=since, patience=3)] == ["Third"]
+
+
+def test_parse_feed_falls_back_to_feedparser():
+    pytest.importorskip("feedparser")
+    from ingest.fetch import parse_feed
+
+    broken = RSS.replace(b"<description>d3</description>", b"<description>a&nbsp;b</description>")
+    out = parse_feed(broken)
+    assert [e["title"] for e in out["entries"]][:2] == ["Third", "Second & co"]
+    assert out["feed"]["title"] == "Feed"
+    since = datetime(2025, 9, 1, 10, 30, tzinfo=timezone.utc)
+    assert [e["title"] for e in parse_feed(broken, since)["entries"]] == ["Third", "Second & co"]
@@ -0,0 +1,77 @@
+import asyncio
+
+import pytest
+
+
+def test_cache_key_drops_secrets_and_sorts_params():
+    from ingest.http_cache import cache_key
+
+    a = cache_key("https://newsapi.org/v2/top-headlines", {"page": 1, "apiKey": "s3cret", "country": "jp"})
+    b = cache_key("https://newsapi.org/v2/top-headlines?country=jp", {"page": 1, "apiKey": "other"})
+    assert a == b
+    assert "s3cret" not in a
+
+
+def test_validator_cache_roundtrip(tmp_path):
+    from ingest.http_cache import ValidatorCache
+
+    path = str(tmp_path / "validators.json")
+    c = ValidatorCache(path)
+    assert c.request_headers("u") == {}
+    assert not c.is_unchanged("u", 200, b"body")
+
+    c.remember("u", {"ETag": '"v1"', "Last-Modified": "Mon, 01 Sep 2025 00:00:00 GMT"}, b"body")
+    c.save()
+
+    c2 = ValidatorCache(path)
+    assert c2.request_headers("u") == {
+        "If-None-Match": '"v1"',
+        "If-Modified-Since": "Mon, 01 Sep 2025 00:00:00 GMT",
+    }
+    assert c2.is_unchanged("u", 304, b"")
+    # Server ignored validators but sent the same body
+    assert c2.is_unchanged("u", 200, b"body")
+    assert not c2.is_unchanged("u", 200, b"new body")
+
+
+def test_validator_cache_prunes_stale_entries(tmp_path):
+    from ingest.http_cache import ValidatorCache
+
+    path = str(tmp_path / "validators.json")
+    c = ValidatorCache(path, max_age_days=1)
+    c.remember("old", {}, b"x")
+    c._entries["old"]["seen"] = 0
+    c.remember("new", {}, b"y")
+    c.save()
+    assert ValidatorCache(path).get("old") is None
+    assert ValidatorCache(path).get("new") is not None
+
+
+def test_sweep_skips_unchanged_feed(tmp_path):
+    httpx = pytest.importorskip("httpx")
+    from ingest.fetch import sweep
+    from ingest.http_cache import ValidatorCache, cache_key
+
+    seen_headers = []
+
+    async def handler(request):
+        seen_headers.append(request.headers.get("if-none-match"))
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, content=b"", headers={"ETag": '"v1"'})
+
+    cache = ValidatorCache(str(tmp_path / "v.json"))
+    feeds = [{"url": "https://example.com/rss"}]
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as c:
+            return await sweep(feeds, client=c, cache=cache)
+
+    (first,) = asyncio.run(run())
+    assert not first["unchanged"] and first["status"] == 200
+    cache.remember(first["key"], first["headers"], first["content"])
+
+    (second,) = asyncio.run(run())
+    assert second["unchanged"] and second["parsed"] is None
+    assert seen_headers == [None, '"v1"']
+    assert first["key"] == cache_key("https://example.com/rss")
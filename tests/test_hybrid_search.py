@@ -0,0 +1,125 @@
+import os
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+
+def test_rrf_rewards_agreement_between_retrievers():
+    from search.hybrid import rrf
+
+    fused = rrf([[1, 2, 3], [3, 4, 1]], k=60)
+    ids = [d for d, _ in fused]
+    assert ids[:2] == [1, 3]  # in both lists
+    assert set(ids) == {1, 2, 3, 4}
+    assert fused[0][1] == pytest.approx(1 / 61 + 1 / 63)
+    assert rrf([]) == [] and rrf([[5]])[0] == (5, pytest.approx(1 / 61))
+
+
+def test_like_pattern_escapes_wildcards():
+    from search.hybrid import like_pattern
+
+    assert like_pattern("50%_off\\") == "%50\\%\\_off\\\\%"
+
+
+def test_concurrent_requests_do_not_share_a_retriever_pool(monkeypatch):
+    import threading
+
+    from search import hybrid
+
+    requests = 6
+    # Every retriever of every request must be running at the same time to pass the barrier
+    barrier = threading.Barrier(2 * requests, timeout=10)
+
+    class _Conn:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def execute(self, *args, **kw):
+            return self
+
+        def fetchall(self):
+            return []
+
+    def lexical(conn, q, *, n, since=None):
+        barrier.wait()
+        return [1]
+
+    def vector(conn, qv, space, *, n, since=None):
+        barrier.wait()
+        return [(1, 0.1)]
+
+    monkeypatch.setattr(hybrid, "lexical_candidates", lexical)
+    monkeypatch.setattr(hybrid, "vector_candidates", vector)
+    errors = []
+
+    def request():
+        try:
+            hybrid.hybrid_search(_Conn, "q", [0.0], "space", limit=5)
+        except Exception as e:  # pragma: no cover - reported below
+            errors.append(e)
+
+    threads = [threading.Thread(target=request) for _ in range(requests)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(30)
+    assert not errors and not barrier.broken
+
+
+@pytest.mark.skipif(os.getenv("SKIP_DB_TESTS") == "1", reason="DB not available in CI")
+def test_hybrid_search_fuses_lexical_and_vector_hits():
+    pytest.importorskip("psycopg")
+    np = pytest.importorskip("numpy")
+    from embedding.vec_writer import write_vectors
+    from ingest.bulk_writer import write_articles
+    from ingest.normalize import make_row
+    from mcp_news.db import connect
+    from search.hybrid import hybrid_search, lexical_candidates
+
+    space = "test-hybrid"
+    now = datetime.now(timezone.utc)
+    titles = ["hybridneedle 決算 発表", "hybridneedle 市場", "unrelated weather", "unrelated sports"]
+    rows = [
+        make_row(source="hybrid-test", url=f"https://hybrid.example/{i}", title=t, published=(now - timedelta(hours=i)).isoformat())
+        for i, t in enumerate(titles)
+    ]
+    urls = [r["url_canon"] for r in rows]
+    with connect() as conn:
+        try:
+            by_url = write_articles(conn, rows)
+            conn.commit()
+            doc_ids = [by_url[u] for u in urls]
+            chunks = dict(conn.execute("SELECT doc_id, chunk_id FROM chunk WHERE doc_id = ANY(%s) AND part_ix = 0", (doc_ids,)).fetchall())
+            embs = np.random.default_rng(5).standard_normal((len(doc_ids), 768)).astype(np.float32)
+            write_vectors(conn, space, [chunks[d] for d in doc_ids], embs)
+
+            assert set(lexical_candidates(conn, "hybridneedle", n=10)) == set(doc_ids[:2])
+            # lexical only (no query vector)
+            lex = hybrid_search(connect, "hybridneedle", None, space, limit=5)
+            assert {r[0] for r in lex} == set(doc_ids[:2])
+            # the vector is closest to doc 2, which has no lexical match; doc 0 matches both ways
+            qv = embs[2] + 0.9 * embs[0]
+            fused = hybrid_search(connect, "hybridneedle", qv, space, limit=4)
+            ids = [r[0] for r in fused]
+            assert doc_ids[2] in ids and ids[0] == doc_ids[0]
+            assert len(fused[0]) == 8 and fused[0][7] == pytest.approx(0.0)
+            since = hybrid_search(connect, "hybridneedle", None, space, limit=5, since=now - timedelta(minutes=30))
+            assert [r[0] for r in since] == [doc_ids[0]]
+        finally:
+            conn.rollback()
+            conn.execute("DELETE FROM chunk_vec WHERE embedding_space = %s", (space,))
+            conn.execute("DELETE FROM doc WHERE url_canon = ANY(%s)", (urls,))
+            conn.commit()
+
+
+def test_hybrid_endpoint_ok():
+    pytest.importorskip("fastapi")
+    from fastapi.testclient import TestClient
+
+    from web.app import app
+
+    r = TestClient(app).get("/api/search_hybrid", params={"q": "a", "limit": 3})
+    assert r.status_code == 200 and isinstance(r.json(), list) and len(r.json()) <= 3
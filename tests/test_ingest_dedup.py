@@ -0,0 +1,96 @@
+import asyncio
+import os
+
+import pytest
+
+
+def test_bloom_filter_membership_and_persistence(tmp_path):
+    from ingest.dedup import BloomFilter, DedupFilter, fingerprint
+
+    f = DedupFilter(BloomFilter(1000, 1e-6), 42, str(tmp_path / "dedup.bloom"))
+    fps = [fingerprint(f"https://d.test/{i}", f"t{i}", b"h") for i in range(500)]
+    for fp in fps:
+        f.bloom.add(fp)
+    assert all(fp in f.bloom for fp in fps)
+    assert fingerprint("https://d.test/0", "t0 changed", b"h") not in f.bloom
+    assert f.bloom.count == 500 and not f.full
+
+    f.save()
+    g = DedupFilter.load(f.path)
+    assert g is not None and g.max_doc_id == 42 and g.bloom.count == 500
+    assert all(fp in g.bloom for fp in fps)
+
+    (tmp_path / "bad.bloom").write_bytes(b"garbage")
+    assert DedupFilter.load(str(tmp_path / "bad.bloom")) is None
+
+
+def test_pipeline_drops_known_rows(tmp_path, monkeypatch):
+    import ingest.pipeline as pl
+    from ingest.dedup import BloomFilter, DedupFilter
+    from ingest.normalize import make_row
+
+    written = []
+
+    class Writer:
+        def __init__(self, conn, batch_size=500):
+            self.failed = set()
+
+        def write(self, rows):
+            written.extend(r["url_canon"] for r in rows)
+            return {r["url_canon"]: i for i, r in enumerate(rows, 1)}
+
+    class Conn:
+        def commit(self):
+            pass
+
+    class Src(pl.Source):
+        name = "dedup-test"
+
+        def __init__(self, titles):
+            self.titles = titles
+
+        async def fetch(self, client):
+            yield {"key": "k", "data": self.titles}
+
+        def normalize(self, titles, payload):
+            for i, t in enumerate(titles):
+                yield make_row(source="dedup-test", url=f"https://d.test/{i}", title=t)
+
+    monkeypatch.setattr(pl, "BulkWriter", Writer)
+    dedup = DedupFilter(BloomFilter(100), 0, str(tmp_path / "dedup.bloom"))
+
+    s1 = asyncio.run(pl.run_pipeline(Src(["a", "b"]), Conn(), client=object(), dedup=dedup))
+    assert s1["written"] == 2 and s1["known"] == 0
+    # same items again, plus one retitled: only the change reaches the writer
+    written.clear()
+    s2 = asyncio.run(pl.run_pipeline(Src(["a", "B", "c"]), Conn(), client=object(), dedup=dedup))
+    assert s2["known"] == 1
+    assert written == ["https://d.test/1", "https://d.test/2"]
+
+
+@pytest.mark.skipif(os.getenv("SKIP_DB_TESTS") == "1", reason="DB not available in CI")
+def test_dedup_warms_from_doc(tmp_path):
+    psycopg = pytest.importorskip("psycopg")
+    from ingest.bulk_writer import write_articles
+    from ingest.dedup import DedupFilter
+    from ingest.normalize import make_row
+
+    dsn = os.environ.get("DATABASE_URL", "postgresql://127.0.0.1/newshub")
+    rows = [make_row(source="dedup-test", url=f"https://dedup.test/{i}", title=f"t{i}") for i in range(3)]
+    urls = [r["url_canon"] for r in rows]
+    path = str(tmp_path / "dedup.bloom")
+    with psycopg.connect(dsn) as conn:
+        try:
+            write_articles(conn, rows)
+            conn.commit()
+            f = DedupFilter.open(conn, capacity=1000, path=path)
+            keep, known = f.filter(rows + [make_row(source="dedup-test", url=urls[0], title="new title")])
+            assert known == 3 and [r["title_raw"] for r in keep] == ["new title"]
+            f.save()
+            # reload is incremental from the saved high-water mark
+            g = DedupFilter.open(conn, capacity=1000, path=path)
+            assert g.max_doc_id == f.max_doc_id and g.bloom.count == f.bloom.count
+        finally:
+            conn.rollback()
+            conn.execute("DELETE FROM doc WHERE url_canon = ANY(%s)", (urls,))
+            conn.commit()
@@ -0,0 +1,77 @@
+import asyncio
+from datetime import datetime, timezone
+
+
+def test_canonicalize_url_drops_trackers_and_fragment():
+    from ingest.normalize import canonicalize_url
+
+    u = "https://example.com/a?id=1&utm_source=x&gclid=y&mc_cid=z#frag"
+    assert canonicalize_url(u) == "https://example.com/a?id=1"
+
+
+def test_to_utc_accepts_all_source_formats():
+    from ingest.normalize import to_utc
+
+    want = datetime(2025, 8, 20, 3, 12, 34, tzinfo=timezone.utc)
+    assert to_utc("Wed, 20 Aug 2025 12:12:34 +0900") == want   # RSS
+    assert to_utc("2025-08-20T03:12:34Z") == want                # NewsAPI / Atom
+    assert to_utc(int(want.timestamp())) == want                 # HN epoch
+    assert to_utc(datetime(2025, 8, 20, 3, 12, 34)) == want      # naive -> UTC
+    assert to_utc(None).tzinfo is not None
+
+
+def test_make_row_requires_title_and_url():
+    from ingest.normalize import hash_body, make_row
+
+    assert make_row(source="s", url="", title="t") is None
+    assert make_row(source="s", url="https://x", title="  ") is None
+    row = make_row(source="s", url="https://x/?utm_medium=m", title=" T ", summary="")
+    assert row["url_canon"] == "https://x/"
+    assert row["title_raw"] == "T" and row["text_raw"] == "T"
+    assert row["hash_body"] == hash_body("T")
+
+
+class _FakeWriter:
+    written = []
+
+    def __init__(self, conn, batch_size=500):
+        self.failed = set()
+
+    def write(self, rows):
+        _FakeWriter.written.append([r["url_canon"] for r in rows])
+        return {r["url_canon"]: i for i, r in enumerate(rows, 1)}
+
+
+class _FakeConn:
+    def commit(self):
+        pass
+
+
+def test_pipeline_streams_source_into_sink(monkeypatch):
+    import ingest.pipeline as pl
+    from ingest.normalize import make_row
+
+    monkeypatch.setattr(pl, "BulkWriter", _FakeWriter)
+    _FakeWriter.written = []
+    confirmed = []
+
+    class ListSource(pl.Source):
+        name = "test"
+
+        async def fetch(self, client):
+            yield {"key": "u0", "unchanged": True}
+            yield {"key": "e0", "error": "boom"}
+            for i in range(5):
+                await asyncio.sleep(0)
+                yield {"key": f"p{i}", "data": [i, i + 100], "on_written": lambda i=i: confirmed.append(i)}
+
+        def normalize(self, parsed, payload):
+            for n in parsed:
+                yield make_row(source="test", url=f"https://t/{n}", title=f"t{n}")
+
+    stats = asyncio.run(pl.run_pipeline(ListSource(), _FakeConn(), client=object(), parse_workers=2, batch_size=4))
+    assert stats["unchanged"] == 1 and stats["errors"] == 1
+    assert stats["rows"] == 10 and stats["written"] == 10 and stats["failed"] == 0
+    assert sorted(confirmed) == [0, 1, 2, 3, 4]
+    # batches are cut at payload boundaries once batch_size is reached
+    assert all(len(b) >= 4 or b is _FakeWriter.written[-1] for b in _FakeWriter.written)
@@ -0,0 +1,115 @@
+import asyncio
+import contextlib
+from datetime import datetime, timedelta, timezone
+
+FEEDS = [{"name": "fast", "url": "https://f.test/fast.xml"}, {"name": "slow", "url": "https://f.test/slow.xml"}]
+NOW = 1_760_000_000.0
+
+
+def _scheduler(tmp_path, **kw):
+    from ingest.scheduler import FeedScheduler
+
+    return FeedScheduler(FEEDS, path=str(tmp_path / "sched.json"), jitter=0.0, clock=lambda: NOW, **kw)
+
+
+def _ago(minutes):
+    return datetime.fromtimestamp(NOW, tz=timezone.utc) - timedelta(minutes=minutes)
+
+
+def test_interval_follows_publish_rate(tmp_path):
+    s = _scheduler(tmp_path, min_interval=60, max_interval=6 * 3600)
+    assert {f["name"] for f in s.due(NOW + 10)} == {"fast", "slow"}
+
+    # 30 items in the last 90 minutes vs. 10 items over ~70 days
+    fast = s.observe(FEEDS[0]["url"], started=NOW, published=[_ago(3 * i) for i in range(30)], new=5)
+    slow = s.observe(FEEDS[1]["url"], started=NOW, published=[_ago(10_000 * i) for i in range(10)], new=1)
+    assert 60 <= fast["interval"] <= 240
+    assert slow["interval"] == 6 * 3600
+    assert s.due(NOW + 300) == [FEEDS[0]]
+
+
+def test_empty_polls_back_off_and_state_persists(tmp_path):
+    s = _scheduler(tmp_path, min_interval=60, max_interval=3600, default_interval=600)
+    url = FEEDS[0]["url"]
+    first = s.observe(url, started=NOW, published=[_ago(10 * i) for i in range(6)], new=6)["interval"]
+    second = s.observe(url, started=NOW + first, unchanged=True)["interval"]
+    assert second == min(3600, first * 1.5)
+    s.save()
+    again = _scheduler(tmp_path)
+    assert again.state[url]["interval"] == second and again.state[url]["misses"] == 1
+
+
+def test_run_daemon_polls_due_feeds_once(tmp_path, monkeypatch):
+    import ingest.pipeline as pl
+    from ingest.scheduler import run_daemon
+
+    s = _scheduler(tmp_path)
+    polled = []
+
+    class Src:
+        def __init__(self, feeds):
+            self.feeds = feeds
+            self.feed_stats = {f["url"]: {"published": [_ago(5)], "new": 1} for f in feeds}
+
+    async def fake_run(source, conn, **kw):
+        polled.append([f["name"] for f in source.feeds])
+        stop.set()
+        return pl.new_stats()
+
+    class Pool:
+        @contextlib.contextmanager
+        def connection(self):
+            yield object()
+
+    monkeypatch.setattr(pl, "run_pipeline", fake_run)
+    stop = asyncio.Event()
+
+    async def run():
+        await asyncio.wait_for(run_daemon(s, Pool(), make_source=Src, client=object(), stop=stop), 5)
+
+    s.state[FEEDS[0]["url"]]["next_due"] = NOW - 30
+    s.state[FEEDS[1]["url"]]["next_due"] = NOW + 3600
+    asyncio.run(run())
+    assert polled == [["fast"]]
+    st = s.state[FEEDS[0]["url"]]
+    assert st["lag"] == 30 and st["next_due"] > NOW
+
+
+def test_rss_source_reports_feed_stats(monkeypatch):
+    import httpx
+    import ingest.pipeline as pl
+    from ingest.http_cache import ValidatorCache
+    from ingest.sources import RssSource
+
+    rss = b"""<?xml version="1.0"?><rss version="2.0"><channel><title>T</title>
+<item><title>A</title><link>https://f.test/a</link><pubDate>Mon, 01 Sep 2025 10:00:00 GMT</pubDate></item>
+<item><title>B</title><link>https://f.test/b</link></item>
+</channel></rss>"""
+
+    class Writer:
+        def __init__(self, conn, batch_size=500):
+            self.failed = set()
+
+        def write(self, rows):
+            return {r["url_canon"]: 1 for r in rows}
+
+    class Conn:
+        def commit(self):
+            pass
+
+    async def handler(request):
+        return httpx.Response(200, content=rss)
+
+    monkeypatch.setattr(pl, "BulkWriter", Writer)
+    cache = ValidatorCache(path="/dev/null/never-written.json")
+    monkeypatch.setattr(cache, "save", lambda: None)
+    src = RssSource([FEEDS[0]], cache=cache)
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as c:
+            return await pl.run_pipeline(src, Conn(), client=c, parse_workers=1)
+
+    stats = asyncio.run(run())
+    fs = src.feed_stats[FEEDS[0]["url"]]
+    assert stats["written"] == 2 and fs["new"] == 2 and not fs["unchanged"] and not fs["error"]
+    assert fs["published"] == [datetime(2025, 9, 1, 10, tzinfo=timezone.utc)]
@@ -0,0 +1,49 @@
+import threading
+
+import pytest
+
+
+def test_get_does_not_block_while_loading():
+    from embedding.loader import BackgroundLoader
+
+    release = threading.Event()
+    done = []
+
+    def factory():
+        release.wait(5)
+        return "model"
+
+    loader = BackgroundLoader(factory, on_done=lambda l: done.append(l.ready))
+    assert loader.get() is None and not loader.done  # starts loading, returns at once
+    assert loader.get(timeout=0.05) is None  # bounded wait, still loading
+    release.set()
+    assert loader.get(timeout=5) == "model"
+    assert loader.ready and done == [True] and loader.load_s is not None
+    loader.start()  # idempotent: the factory ran once
+    assert loader.wait(0) and loader.get() == "model"
+
+
+def test_failed_or_empty_load_is_not_ready():
+    from embedding.loader import BackgroundLoader
+
+    def boom():
+        raise RuntimeError("no torch")
+
+    failed = BackgroundLoader(boom)
+    assert failed.wait(5) and failed.get() is None
+    assert not failed.ready and isinstance(failed.error, RuntimeError)
+    empty = BackgroundLoader(lambda: None)
+    assert empty.wait(5) and not empty.ready and empty.error is None
+
+
+def test_readiness_gauge():
+    prom = pytest.importorskip("prometheus_client")
+    from embedding.loader import BackgroundLoader
+    from mcp_news.metrics import set_embedding_model_ready
+
+    loader = BackgroundLoader(lambda: object(), on_done=lambda l: set_embedding_model_ready(l.ready, l.load_s))
+    set_embedding_model_ready(False)
+    assert prom.REGISTRY.get_sample_value("embedding_model_ready") == 0.0
+    loader.wait(5)
+    assert prom.REGISTRY.get_sample_value("embedding_model_ready") == 1.0
+    assert prom.REGISTRY.get_sample_value("embedding_model_load_seconds") >= 0.0
@@ -0,0 +1,70 @@
+import pytest
+
+
+class CountingModel:
+    def __init__(self):
+        self.calls = []
+
+    def encode(self, texts, normalize_embeddings=True):
+        import numpy as np
+
+        self.calls.extend(texts)
+        return np.array([[float(len(t)), 1.0] for t in texts], dtype=np.float32)
+
+
+def test_repeated_queries_skip_the_model():
+    pytest.importorskip("numpy")
+    from embedding.query_cache import QueryEmbeddingCache
+
+    cache = QueryEmbeddingCache(maxsize=8)
+    model = CountingModel()
+    a = cache.encode(model, "日銀  金融政策")
+    b = cache.encode(model, " 日銀 金融政策\n")
+    assert model.calls == ["日銀 金融政策"] and a is b
+    assert not a.flags.writeable
+    other = CountingModel()
+    other.model_name = "other-model"
+    cache.encode(other, "日銀 金融政策")  # other model: separate entry
+    assert other.calls == ["日銀 金融政策"] and (cache.hits, cache.misses) == (1, 2)
+    assert len(cache) == 2
+
+
+def test_lru_eviction_and_ttl():
+    pytest.importorskip("numpy")
+    from embedding.query_cache import QueryEmbeddingCache
+
+    now = [0.0]
+    cache = QueryEmbeddingCache(maxsize=2, ttl=60, clock=lambda: now[0])
+    model = CountingModel()
+    for q in ("a", "b", "a", "c"):  # "b" is least recently used when "c" arrives
+        cache.encode(model, q)
+    assert model.calls == ["a", "b", "c"]
+    cache.encode(model, "a")
+    cache.encode(model, "b")
+    assert model.calls == ["a", "b", "c", "b"]
+    now[0] = 61.0
+    cache.encode(model, "b")
+    assert model.calls[-1] == "b" and len(model.calls) == 5
+    assert QueryEmbeddingCache(maxsize=0).get(("m", "a")) is None
+
+
+def test_cache_records_metrics():
+    pytest.importorskip("numpy")
+    prom = pytest.importorskip("prometheus_client")
+    from embedding.query_cache import QueryEmbeddingCache
+
+    def sample(name, **labels):
+        return prom.REGISTRY.get_sample_value(name, labels) or 0.0
+
+    before = (
+        sample("query_embed_cache_total", result="hit"),
+        sample("query_embed_cache_total", result="miss"),
+        sample("embed_latency_seconds_count"),
+    )
+    cache = QueryEmbeddingCache()
+    model = CountingModel()
+    cache.encode(model, "metrics query")
+    cache.encode(model, "metrics query")
+    assert sample("query_embed_cache_total", result="hit") == before[0] + 1
+    assert sample("query_embed_cache_total", result="miss") == before[1] + 1
+    assert sample("embed_latency_seconds_count") == before[2] + 1
@@ -0,0 +1,60 @@
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+
+def _config(**kw):
+    from search.ranker import RankingConfig
+
+    base = dict(
+        alpha=0.6, beta=0.2, gamma=0.1, delta=0.1, half_life_hours=24,
+        source_trust={"nhk.or.jp": 0.2, "apnews.com": 0.1}, source_default=0.0,
+        language_trust={"ja": 0.9, "en": 0.8}, language_default=0.3,
+    )
+    base.update(kw)
+    return RankingConfig(**base)
+
+
+def _rows(n, seed=1):
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    rows = []
+    for i in range(n):
+        published = None if i % 97 == 0 else now - timedelta(minutes=rng.randint(0, 20000))
+        dist = None if i % 53 == 0 else rng.choice([0.2, 0.4, rng.uniform(-0.1, 1.2)])  # ties + out-of-range
+        rows.append((i, published, rng.choice(["nhk.or.jp", "apnews.com", "x", None]), rng.choice(["ja", "en", "fr", None]), dist))
+    return rows
+
+
+@pytest.mark.parametrize("limit", [1, 10, 500, 1000])
+def test_vectorized_order_matches_loop(limit):
+    from search.ranker import rerank_candidates_loop, score_candidates, top_k_indices
+
+    rows = _rows(500)
+    cfg = _config()
+    now = datetime.now(timezone.utc)
+    kw = dict(dist_index=4, published_index=1, source_index=2, language_index=3)
+    expected = rerank_candidates_loop(rows, limit=limit, config=cfg, now=now, **kw)
+    scores = score_candidates(rows, config=cfg, now=now, **kw)
+    assert [rows[i] for i in top_k_indices(scores, limit)] == expected
+
+
+def test_top_k_keeps_input_order_on_ties():
+    from search.ranker import top_k_indices
+
+    scores = np.array([0.5, 0.9, 0.5, 0.5, 0.1, 0.9])
+    assert top_k_indices(scores, 3).tolist() == [1, 5, 0]
+    assert top_k_indices(scores, 4).tolist() == [1, 5, 0, 2]
+    assert top_k_indices(scores, 0).tolist() == [] and len(top_k_indices(np.zeros(0), 5)) == 0
+
+
+def test_rerank_candidates_accepts_iterables_and_no_language():
+    from search.ranker import rerank_candidates, rerank_candidates_loop
+
+    rows = _rows(50)
+    cfg = _config(half_life_hours=0)
+    kw = dict(dist_index=4, published_index=1, source_index=2, limit=7, config=cfg)
+    assert rerank_candidates(iter(rows), **kw) == rerank_candidates_loop(rows, **kw)
@@ -1,3 +1,6 @@
+import pytest
+
+
 def test_ranking_yaml_loads_and_weights_sum_to_1():
     from search.ranker import load_ranking_config
     c = load_ranking_config()
@@ -63,3 +66,82 @@ def test_ranking_toml_overrides_and_recency_monotonic(monkeypatch):
     ranked = rerank_candidates(rows, dist_index=7, published_index=2, source_index=5, language_index=6, limit=2)
     # Newer should come first when recency weight > 0
     assert ranked[0][0] == 1
+
+
+def _write_yaml(path, cosine):
+    path.write_text(
+        "score_weights:\n"
+        f"  cosine: {cosine}\n  recency: 0.2\n  source_trust: 0.1\n  language: 0.0\n"
+        "recency_half_life_hours: 12\n"
+        "source_trust:\n  default: 0.0\n  nhk.or.jp: 0.3\n",
+        encoding="utf-8",
+    )
+
+
+def test_compiled_config_is_cached_and_tracks_env(monkeypatch):
+    from search import ranker
+
+    for k in ranker.CONFIG_ENV:
+        monkeypatch.delenv(k, raising=False)
+    cache = ranker._ConfigCache(check_interval=60)
+    monkeypatch.setattr(ranker, "_CACHE", cache)
+    c1 = ranker.get_ranking_config()
+    assert ranker.get_ranking_config() is c1 and cache.loads == 1
+    assert abs(c1.alpha + c1.beta + c1.gamma + c1.delta - 1.0) < 1e-9
+    # env overrides are resolved at load; changing them recompiles
+    monkeypatch.setenv("RANK_ALPHA", "0")
+    monkeypatch.setenv("RANK_BETA", "1")
+    monkeypatch.setenv("RANK_GAMMA", "0")
+    c2 = ranker.get_ranking_config()
+    assert c2 is not c1 and c2.beta == 1.0 and cache.loads == 2
+
+
+def test_config_reloads_on_mtime_change_and_signal(monkeypatch, tmp_path):
+    pytest.importorskip("yaml")
+    import os
+    import signal
+
+    from search import ranker
+
+    for k in ranker.CONFIG_ENV:
+        monkeypatch.delenv(k, raising=False)
+    monkeypatch.setattr(ranker, "CONFIG_DIR", tmp_path)
+    cache = ranker._ConfigCache(check_interval=0)
+    monkeypatch.setattr(ranker, "_CACHE", cache)
+    yml = tmp_path / "ranking.yaml"
+    _write_yaml(yml, 0.7)
+    c1 = ranker.get_ranking_config()
+    assert c1.half_life_hours == 12 and c1.source_trust == {"nhk.or.jp": 0.3}
+    assert ranker.get_ranking_config() is c1
+
+    _write_yaml(yml, 0.0)
+    st = yml.stat()
+    os.utime(yml, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    c2 = ranker.get_ranking_config()
+    assert c2 is not c1 and c2.alpha == 0.0
+
+    if not hasattr(signal, "SIGHUP"):
+        return
+    previous = signal.getsignal(signal.SIGHUP)
+    try:
+        assert ranker.install_reload_signal()
+        os.kill(os.getpid(), signal.SIGHUP)
+        c3 = ranker.get_ranking_config()
+        assert c3 is not c2 and cache.loads == 3
+    finally:
+        signal.signal(signal.SIGHUP, previous)
+
+
+def test_rerank_uses_given_config():
+    from datetime import datetime, timezone
+
+    from search.ranker import RankingConfig, rerank_candidates
+
+    now = datetime.now(timezone.utc)
+    rows = [(1, now, "a", 0.1), (2, now, "b", 0.9)]
+    trust_only = RankingConfig(
+        alpha=0, beta=0, gamma=1, delta=0, half_life_hours=24,
+        source_trust={"b": 1.0}, source_default=0.0, language_trust={}, language_default=0.0,
+    )
+    ranked = rerank_candidates(rows, dist_index=3, published_index=1, source_index=2, limit=2, config=trust_only)
+    assert [r[0] for r in ranked] == [2, 1]
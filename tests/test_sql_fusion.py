@@ -0,0 +1,96 @@
+import os
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+
+def _config(**kw):
+    from search.ranker import RankingConfig
+
+    base = dict(
+        alpha=0.6, beta=0.2, gamma=0.1, delta=0.1, half_life_hours=24,
+        source_trust={"fusion-a": 0.5}, source_default=0.0,
+        language_trust={"ja": 0.9}, language_default=0.2,
+    )
+    base.update(kw)
+    return RankingConfig(**base)
+
+
+def test_trust_params_are_parallel_arrays():
+    from search.sql_fusion import trust_params
+
+    cfg = _config(source_trust={"fusion-b": 1, "fusion-a": 0.5})
+    assert trust_params(cfg) == {
+        "source_keys": ["fusion-a", "fusion-b"],
+        "source_trust": [0.5, 1.0],
+        "language_keys": ["ja"],
+        "language_trust": [0.9],
+    }
+
+
+def test_fusion_mode_env(monkeypatch):
+    from search.sql_fusion import fusion_mode
+
+    monkeypatch.delenv("RANK_FUSION_MODE", raising=False)
+    assert fusion_mode() == "python"
+    monkeypatch.setenv("RANK_FUSION_MODE", " SQL ")
+    assert fusion_mode() == "sql"
+
+
+@pytest.mark.skipif(os.getenv("SKIP_DB_TESTS") == "1", reason="DB not available in CI")
+def test_sql_fusion_matches_python_rerank():
+    psycopg = pytest.importorskip("psycopg")
+    np = pytest.importorskip("numpy")
+    from pgvector.psycopg import register_vector
+
+    from embedding.vec_writer import write_vectors
+    from ingest.bulk_writer import write_articles
+    from ingest.normalize import make_row
+    from search import sql_fusion
+    from search.ranker import rerank_candidates
+
+    space = "test-sql-fusion"
+    now = datetime.now(timezone.utc)
+    rows = [
+        make_row(
+            source="fusion-a" if i % 3 == 0 else "fusion-b",
+            url=f"https://fusion.example/{i}",
+            title=f"fusion test {i}",
+            published=(now - timedelta(hours=5 * i)).isoformat(),
+            lang=["ja", "en", None][i % 3],
+        )
+        for i in range(12)
+    ]
+    urls = [r["url_canon"] for r in rows]
+    dsn = os.environ.get("DATABASE_URL", "postgresql://127.0.0.1/newshub")
+    with psycopg.connect(dsn) as conn:
+        register_vector(conn)
+        try:
+            doc_ids = list(write_articles(conn, rows).values())
+            conn.execute("UPDATE doc SET lang = NULL WHERE doc_id = ANY(%s) AND lang = ''", (doc_ids,))
+            conn.commit()
+            ids = [r[0] for r in conn.execute("SELECT chunk_id FROM chunk WHERE doc_id = ANY(%s) ORDER BY chunk_id", (doc_ids,))]
+            embs = np.random.default_rng(3).standard_normal((len(ids), 768)).astype(np.float32)
+            write_vectors(conn, space, ids, embs)
+            qv = embs[0] + 0.5 * embs[1]
+            cfg = _config()
+
+            fused = sql_fusion.fused_search(conn, qv, space, limit=5, cand=len(ids), config=cfg, now=now)
+            cands = conn.execute(
+                """
+                SELECT d.doc_id, d.title_raw, d.published_at,
+                       (SELECT val FROM hint WHERE doc_id=d.doc_id AND key='genre_hint') AS genre_hint,
+                       d.url_canon, d.source, d.lang, (v.emb <=> %s) AS dist
+                FROM chunk_vec v JOIN chunk c USING(chunk_id) JOIN doc d USING(doc_id)
+                WHERE v.embedding_space = %s ORDER BY dist ASC
+                """,
+                (qv, space),
+            ).fetchall()
+            expected = rerank_candidates(cands, dist_index=7, published_index=2, source_index=5, language_index=6, limit=5, config=cfg)
+            assert [r[0] for r in fused] == [r[0] for r in expected]
+            assert fused[0][1:7] == expected[0][1:7]
+        finally:
+            conn.rollback()
+            conn.execute("DELETE FROM chunk_vec WHERE embedding_space = %s", (space,))
+            conn.execute("DELETE FROM doc WHERE url_canon = ANY(%s)", (urls,))
+            conn.commit()
@@ -0,0 +1,59 @@
+import os
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+pytest.importorskip("fastapi")
+from fastapi.testclient import TestClient
+
+from web.app import app, make_cursor, parse_cursor
+
+client = TestClient(app)
+
+
+def test_cursor_round_trip():
+    ts = datetime(2026, 10, 18, 3, 4, 5, 678901, tzinfo=timezone.utc)
+    assert parse_cursor(make_cursor((42, "t", ts))) == (ts, 42)
+    # "+" decoded to a space by a client that did not URL-encode
+    assert parse_cursor("2026-10-18T03:04:05.678901 00:00,42") == (ts, 42)
+    assert parse_cursor("garbage") is None and parse_cursor("2026-10-18,x") is None
+
+
+@pytest.mark.skipif(os.getenv("SKIP_DB_TESTS") == "1", reason="DB not available in CI")
+def test_keyset_pages_cover_all_matches_once():
+    psycopg = pytest.importorskip("psycopg")
+    from ingest.bulk_writer import write_articles
+    from ingest.normalize import make_row
+
+    base = datetime(2026, 10, 1, 12, 0, 0, 250000, tzinfo=timezone.utc)
+    # two docs share a timestamp; sub-second offsets must not be lost between pages
+    stamps = [base, base, base - timedelta(microseconds=500), base - timedelta(hours=1), base - timedelta(days=1)]
+    rows = [
+        make_row(source="keyset-test", url=f"https://keyset.example/{i}", title=f"keysetneedle 100% item {i}", published=ts.isoformat())
+        for i, ts in enumerate(stamps)
+    ]
+    rows.append(make_row(source="keyset-test", url="https://keyset.example/x", title="keysetneedle 1000 item", published=base.isoformat()))
+    urls = [r["url_canon"] for r in rows]
+    dsn = os.environ.get("DATABASE_URL", "postgresql://127.0.0.1/newshub")
+    with psycopg.connect(dsn) as conn:
+        write_articles(conn, rows)
+        conn.commit()
+    try:
+        # "%" is literal: "100%" does not match "1000"
+        full = client.get("/api/search", params={"q": "keysetneedle 100%", "limit": 50}).json()
+        assert len(full) == 5 and all("100%" in r["title"] for r in full)
+        seen, cursor = [], None
+        while True:
+            params = {"q": "keysetneedle 100%", "limit": 2}
+            if cursor:
+                params["cursor"] = cursor
+            page = client.get("/api/search", params=params).json()
+            if not page:
+                break
+            seen.extend(r["doc_id"] for r in page)
+            cursor = page[-1]["cursor"]
+        assert seen == [r["doc_id"] for r in full]
+    finally:
+        with psycopg.connect(dsn) as conn:
+            conn.execute("DELETE FROM doc WHERE url_canon = ANY(%s)", (urls,))
+            conn.commit()
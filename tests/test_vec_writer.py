@@ -0,0 +1,53 @@
+import os
+import struct
+
+import pytest
+
+
+def test_copy_payload_layout():
+    np = pytest.importorskip("numpy")
+    from embedding.vec_writer import copy_payload
+
+    embs = np.array([[1.0, -2.0, 0.5], [0.0, 0.25, 3.0]], dtype=np.float32)
+    data = copy_payload([7, 2**40], embs)
+    assert data.startswith(b"PGCOPY\n\xff\r\n\x00") and data.endswith(struct.pack("!h", -1))
+    body = data[19:-2]
+    row = struct.calcsize("!hiqihh3f")
+    assert len(body) == 2 * row
+    assert struct.unpack("!hiqihh3f", body[:row]) == (2, 8, 7, 16, 3, 0, 1.0, -2.0, 0.5)
+    assert struct.unpack("!hiqihh3f", body[row:])[2] == 2**40
+    with pytest.raises(ValueError):
+        copy_payload([1], embs)
+
+
+@pytest.mark.skipif(os.getenv("SKIP_DB_TESTS") == "1", reason="DB not available in CI")
+def test_write_vectors_copies_and_skips_conflicts():
+    psycopg = pytest.importorskip("psycopg")
+    np = pytest.importorskip("numpy")
+    from embedding.vec_writer import write_vectors
+    from ingest.bulk_writer import write_articles
+    from ingest.normalize import make_row
+
+    space = "test-vec-writer"
+    rows = [make_row(source="vec-test", url=f"https://vec.example/{i}", title=f"vec test {i}") for i in range(3)]
+    urls = [r["url_canon"] for r in rows]
+    dsn = os.environ.get("DATABASE_URL", "postgresql://127.0.0.1/newshub")
+    with psycopg.connect(dsn) as conn:
+        try:
+            doc_ids = list(write_articles(conn, rows).values())
+            conn.commit()
+            ids = [r[0] for r in conn.execute("SELECT chunk_id FROM chunk WHERE doc_id = ANY(%s) ORDER BY chunk_id", (doc_ids,))]
+            embs = np.random.default_rng(0).random((len(ids), 768), dtype=np.float32)
+            assert write_vectors(conn, space, ids[:2], embs[:2]) == 2
+            # Existing vectors are kept, unknown chunk ids are skipped
+            assert write_vectors(conn, space, ids + [-1], np.vstack([embs * 0, embs[:1]])) == len(ids) - 2
+            got = conn.execute(
+                "SELECT dim, emb::text FROM chunk_vec WHERE chunk_id = %s AND embedding_space = %s", (ids[0], space)
+            ).fetchone()
+            assert got[0] == 768
+            assert np.allclose(np.array(got[1].strip("[]").split(","), dtype=np.float32), embs[0], atol=1e-6)
+        finally:
+            conn.rollback()
+            conn.execute("DELETE FROM chunk_vec WHERE embedding_space = %s", (space,))
+            conn.execute("DELETE FROM doc WHERE url_canon = ANY(%s)", (urls,))
+            conn.commit()
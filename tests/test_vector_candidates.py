@@ -0,0 +1,61 @@
+import os
+
+import pytest
+
+
+@pytest.mark.skipif(os.getenv("SKIP_DB_TESTS") == "1", reason="DB not available in CI")
+def test_vector_searches_return_one_row_per_doc():
+    psycopg = pytest.importorskip("psycopg")
+    np = pytest.importorskip("numpy")
+    from pgvector.psycopg import register_vector
+
+    from embedding.vec_writer import write_vectors
+    from ingest.bulk_writer import write_articles
+    from ingest.normalize import make_row
+    from search import sql_fusion
+    from search.candidates import semantic_candidates
+    from search.hybrid import vector_candidates
+
+    space = "test-vector-candidates"
+    rows = [make_row(source="cand-test", url=f"https://cand.example/{i}", title=f"cand test {i}") for i in range(6)]
+    urls = [r["url_canon"] for r in rows]
+    dsn = os.environ.get("DATABASE_URL", "postgresql://127.0.0.1/newshub")
+    with psycopg.connect(dsn) as conn:
+        register_vector(conn)
+        try:
+            ids = write_articles(conn, rows)
+            doc_ids = [ids[u] for u in urls]
+            # doc 0 also has four body chunks, all closer to the query than any other doc
+            with conn.cursor() as cur:
+                cur.executemany(
+                    "INSERT INTO chunk (doc_id, part_ix, text_raw) VALUES (%s, %s, %s)",
+                    [(doc_ids[0], ix, f"body {ix}") for ix in range(1, 5)],
+                )
+            chunk_rows = conn.execute(
+                "SELECT chunk_id, doc_id FROM chunk WHERE doc_id = ANY(%s) ORDER BY chunk_id", (doc_ids,)
+            ).fetchall()
+            rng = np.random.default_rng(11)
+            qv = rng.standard_normal(768).astype(np.float32)
+            embs = np.stack([
+                qv + (0.05 if doc == doc_ids[0] else 1.0) * rng.standard_normal(768).astype(np.float32)
+                for _, doc in chunk_rows
+            ])
+            write_vectors(conn, space, [c for c, _ in chunk_rows], embs)
+
+            cands = semantic_candidates(conn, qv, space, n=4)
+            assert len(cands) == 4 and len({r[0] for r in cands}) == 4
+            assert cands[0][0] == doc_ids[0]
+            # the doc's distance is its best chunk's
+            best = max(float(np.dot(e, qv) / np.linalg.norm(e) / np.linalg.norm(qv)) for e, (_, d) in zip(embs, chunk_rows) if d == doc_ids[0])
+            assert cands[0][7] == pytest.approx(1 - best, abs=1e-5)
+
+            vec = vector_candidates(conn, qv, space, n=4)
+            assert [d for d, _ in vec] == [r[0] for r in cands]
+
+            fused = sql_fusion.fused_search(conn, qv, space, limit=4, cand=4)
+            assert len({r[0] for r in fused}) == len(fused) == 4
+        finally:
+            conn.rollback()
+            conn.execute("DELETE FROM chunk_vec WHERE embedding_space = %s", (space,))
+            conn.execute("DELETE FROM doc WHERE url_canon = ANY(%s)", (urls,))
+            conn.commit()
@@ -1,6 +1,7 @@
 import os
 import json
 import zoneinfo
+from datetime import datetime, timedelta, timezone
 from typing import Optional
 
 # Optional fastapi import; provide stubs so module remains importable without FastAPI
@@ -51,7 +52,23 @@ except Exception:  # pragma: no cover
     def register_vector(conn):  # type: ignore
         return None
 
+# Optional text-query encoding through the host embedding service (EMBEDDING_SERVICE_URL)
+try:
+    from embedding.client import service_client
+    from embedding.query_cache import QueryEmbeddingCache
+    _QUERY_ENCODER = service_client()
+    _QUERY_CACHE = QueryEmbeddingCache(
+        maxsize=int(os.environ.get("QUERY_EMBED_CACHE_SIZE", "1024")),
+        ttl=float(os.environ.get("QUERY_EMBED_CACHE_TTL", "0")) or None,
+    )
+except Exception:  # pragma: no cover
+    _QUERY_ENCODER = None
+    _QUERY_CACHE = None
+
 from search.ranker import rerank_candidates
+from search.sql_fusion import fused_search, fusion_mode
+from search.candidates import semantic_candidates
+from search.hybrid import hybrid_search, like_pattern
 
 # Import common metrics module
 from mcp_news.metrics import (
@@ -97,7 +114,24 @@ def api_latest(limit: int = Query(50, ge=1, le=200)):
     except Exception:
         return []
 
-# シンプルなタイトル検索（ILIKE）。source/期間/offsetを追加。
+def make_cursor(r) -> str:
+    """検索結果行のキーセット位置 `<published_at UTC, マイクロ秒まで>,<doc_id>`。"""
+    return f"{r[2].astimezone(timezone.utc).isoformat()},{r[0]}"
+
+
+def parse_cursor(cursor: str):
+    """make_cursor の値を (datetime, doc_id) に。不正なら None。"""
+    try:
+        ts, doc_id = cursor.rsplit(",", 1)
+        # URL エンコードされずに + が空白になったケースを許容
+        return datetime.fromisoformat(ts.strip().replace(" ", "+")), int(doc_id)
+    except Exception:
+        return None
+
+
+# タイトル検索（ILIKE、pg_trgm の GIN 索引 idx_doc_title_trgm が効く）。source/期間/offset/cursor。
+# 各要素の cursor を次リクエストの cursor に渡すと (published_at, doc_id) のキーセットで続きを返す
+# （OFFSET と違い深いページでも読み飛ばしが発生しない）。
 @app.get("/api/search")
 def api_search(
     q: str,
@@ -105,15 +139,22 @@ def api_search(
     offset: int = Query(0, ge=0),
     source: Optional[str] = None,
     since_days: Optional[int] = Query(None, ge=0),
+    cursor: Optional[str] = None,
 ):
+    # % と _ はワイルドカードにせずリテラルとして扱う
     conds = ["d.title_raw ILIKE %s"]
-    params = [f"%{q}%"]
+    params = [like_pattern(q)]
     if source:
         conds.append("d.source = %s")
         params.append(source)
     if since_days is not None:
         conds.append("d.published_at >= (now() AT TIME ZONE 'UTC') - (%s || ' days')::interval")
         params.append(since_days)
+    after = parse_cursor(cursor) if cursor else None
+    if after is not None:
+        conds.append("(d.published_at, d.doc_id) < (%s, %s)")
+        params.extend(after)
+        offset = 0
     params.extend([limit, offset])
     sql = f"""
       SELECT d.doc_id, d.title_raw, d.published_at,
@@ -121,7 +162,7 @@ def api_search(
              d.url_canon, d.source
       FROM doc d
       WHERE {' AND '.join(conds)}
-      ORDER BY d.published_at DESC
+      ORDER BY d.published_at DESC, d.doc_id DESC
       LIMIT %s OFFSET %s
     """
     try:
@@ -129,7 +170,7 @@ def api_search(
             return []
         with psycopg.connect(DATABASE_URL) as conn:
             rows = conn.execute(sql, tuple(params)).fetchall()
-        return [row_to_dict(r) for r in rows]
+        return [dict(row_to_dict(r), cursor=make_cursor(r)) for r in rows]
     except Exception:
         # DB未接続などの環境では空配列でフォールバック
         return []
@@ -142,10 +183,27 @@ def search(
     offset: int = Query(0, ge=0),
     source: Optional[str] = None,
     since_days: Optional[int] = Query(None, ge=0),
+    cursor: Optional[str] = None,
 ):
-    return api_search(q=q, limit=limit, offset=offset, source=source, since_days=since_days)
+    return api_search(q=q, limit=limit, offset=offset, source=source, since_days=since_days, cursor=cursor)
+
+def _query_vector(q: str):
+    """q を検索ベクトルへ。JSON 数値配列はそのまま、それ以外は埋め込みサービスでエンコード（不可なら None）。"""
+    try:
+        vec = json.loads(q)
+    except Exception:
+        vec = None
+    if isinstance(vec, list) and all(isinstance(x, (int, float)) for x in vec):
+        return vec
+    if _QUERY_ENCODER is None or _QUERY_CACHE is None:
+        return None
+    try:
+        return [float(x) for x in _QUERY_CACHE.encode(_QUERY_ENCODER, q)]
+    except Exception:
+        return None
+
 
-# セマンティック検索（cosine距離 <=>）。q は JSON 数値配列（暫定）。
+# セマンティック検索（cosine距離 <=>）。q は JSON 数値配列、または埋め込みサービス経由のテキスト。
 @app.get("/api/search_sem")
 @app.get("/search_sem")
 def api_search_sem(
@@ -160,26 +218,16 @@ def api_search_sem(
         with psycopg.connect(DATABASE_URL) as conn:
             register_vector(conn)
             if q and Vector is not None:
-                try:
-                    vec = json.loads(q)
-                except Exception:
-                    vec = None
-                if isinstance(vec, list) and all(isinstance(x, (int, float)) for x in vec):
+                vec = _query_vector(q)
+                if vec is not None:
                     # candidate size for fusion re-ranking
                     cand = min(200, max(limit * 3 + 10, limit))
-                    sql = """
-                      SELECT d.doc_id, d.title_raw, d.published_at,
-                             (SELECT val FROM hint WHERE doc_id=d.doc_id AND key='genre_hint') AS genre_hint,
-                             d.url_canon, d.source, d.lang,
-                             (v.emb <=> %s) AS dist
-                      FROM chunk_vec v
-                      JOIN chunk c USING(chunk_id)
-                      JOIN doc d USING(doc_id)
-                      WHERE v.embedding_space = %s
-                      ORDER BY dist ASC
-                      LIMIT %s OFFSET %s
-                    """
-                    rows = conn.execute(sql, (Vector(vec), space, cand, offset)).fetchall()
+                    if fusion_mode() == "sql":
+                        # Postgres scores the candidates and hydrates only the final top-k
+                        fused = fused_search(conn, Vector(vec), space, limit=limit, cand=cand, offset=offset)
+                        return [row_to_dict(r) for r in fused]
+                    # 1 文書 1 行（本文チャンクが複数あっても最も近いチャンクだけ）
+                    rows = semantic_candidates(conn, Vector(vec), space, n=cand, offset=offset)
                     reranked = rerank_candidates(rows, dist_index=7, published_index=2, source_index=5, language_index=6, limit=limit)
                     return [row_to_dict(r) for r in reranked]
             # フォールバック：最新順
@@ -213,6 +261,38 @@ def api_search_sem(
             # 最後まで失敗した場合は空
             return []
 
+def _connect():
+    conn = psycopg.connect(DATABASE_URL)
+    register_vector(conn)
+    return conn
+
+
+# ハイブリッド検索（タイトル一致 + ベクトル近傍を RRF で融合）。ベクトル側は埋め込みサービスがある場合のみ。
+@app.get("/api/search_hybrid")
+@app.get("/search_hybrid")
+def api_search_hybrid(
+    q: str,
+    limit: int = Query(20, ge=1, le=200),
+    space: str = Query(os.environ.get("EMBED_SPACE") or os.environ.get("EMBEDDING_SPACE") or "e5-multilingual"),
+    since_days: Optional[int] = Query(None, ge=0),
+):
+    try:
+        if psycopg is None:
+            return []
+        qv = None
+        if _QUERY_ENCODER is not None and _QUERY_CACHE is not None:
+            try:
+                qv = _QUERY_CACHE.encode(_QUERY_ENCODER, q)
+            except Exception:
+                qv = None  # サービス停止中はタイトル一致のみ
+        since = None
+        if since_days is not None:
+            since = datetime.now(timezone.utc) - timedelta(days=since_days)
+        rows = hybrid_search(_connect, q, qv, space, limit=limit, since=since)
+        return [row_to_dict(r) for r in rows]
+    except Exception:
+        return []
+
 # 最小限のイベント一覧エンドポイント（JSTで時刻を返す）
 @app.get("/api/events")
 def api_events(